@@ -17,6 +17,9 @@ from ScoutSuite.output.html import ScoutReport
 from ScoutSuite.output.utils import get_filename
 from ScoutSuite.providers import get_provider
 from ScoutSuite.providers.base.authentication_strategy_factory import get_authentication_strategy
+from ScoutSuite.providers.utils import clear_response_cache, print_fetch_executor_stats, print_rate_limiter_stats, \
+    print_response_cache_stats, set_fetch_executor, shutdown_fetch_executor, start_loop_blocking_detector, \
+    stop_loop_blocking_detector
 # Dirty workaround for compatibility with Python >= 3.10
 import collections
 collections.Callable = collections.abc.Callable
@@ -39,6 +42,8 @@ def run_from_cli():
                    aws_access_key_id=args.get('aws_access_key_id'),
                    aws_secret_access_key=args.get('aws_secret_access_key'),
                    aws_session_token=args.get('aws_session_token'),
+                   aws_async_backend=args.get('aws_async_backend'),
+                   aws_iam_bulk_fetch=args.get('aws_iam_bulk_fetch'),
                    # Azure
                    cli=args.get('cli'),
                    user_account=args.get('user_account'),
@@ -53,6 +58,8 @@ def run_from_cli():
                    # GCP
                    project_id=args.get('project_id'), folder_id=args.get('folder_id'),
                    organization_id=args.get('organization_id'), all_projects=args.get('all_projects'),
+                   gcp_batch_requests=args.get('gcp_batch_requests'),
+                   gcp_discovery_url=args.get('gcp_discovery_url'),
                    # Aliyun
                    access_key_id=args.get('access_key_id'), access_key_secret=args.get('access_key_secret'),
                    # Kubernetes
@@ -75,6 +82,8 @@ def run_from_cli():
                    host_ip=args.get('host_ip'),
                    host_port=args.get('host_port'),
                    max_workers=args.get('max_workers'),
+                   rule_workers=args.get('rule_workers'),
+                   loop_blocking_threshold=args.get('loop_blocking_threshold'),
                    regions=args.get('regions'),
                    excluded_regions=args.get('excluded_regions'),
                    fetch_local=args.get('fetch_local'), update=args.get('update'),
@@ -98,6 +107,8 @@ def run(provider,
         aws_access_key_id=None,
         aws_secret_access_key=None,
         aws_session_token=None,
+        aws_async_backend=False,
+        aws_iam_bulk_fetch=False,
         # Azure
         user_account=False,
         user_account_browser=False,
@@ -109,6 +120,8 @@ def run(provider,
         # GCP
         service_account=None,
         project_id=None, folder_id=None, organization_id=None, all_projects=False,
+        gcp_batch_requests=False,
+        gcp_discovery_url=None,
         # Aliyun
         access_key_id=None, access_key_secret=None,
         # Kubernetes
@@ -128,6 +141,8 @@ def run(provider,
         result_format='json',
         database_name=None, host_ip='127.0.0.1', host_port=8000,
         max_workers=10,
+        rule_workers=1,
+        loop_blocking_threshold=None,
         regions=[],
         excluded_regions=[],
         fetch_local=False, update=False,
@@ -153,6 +168,8 @@ async def _run(provider,
                aws_access_key_id,
                aws_secret_access_key,
                aws_session_token,
+               aws_async_backend,
+               aws_iam_bulk_fetch,
                # Azure
                cli, user_account, user_account_browser,
                msi, service_principal, file_auth,
@@ -163,6 +180,8 @@ async def _run(provider,
                # GCP
                service_account,
                project_id, folder_id, organization_id, all_projects,
+               gcp_batch_requests,
+               gcp_discovery_url,
                # Aliyun
                access_key_id, access_key_secret,
                # Kubernetes
@@ -181,6 +200,9 @@ async def _run(provider,
                services, skipped_services, list_services,
                result_format,
                database_name, host_ip, host_port,
+               max_workers,
+               rule_workers,
+               loop_blocking_threshold,
                regions,
                excluded_regions,
                fetch_local, update,
@@ -202,6 +224,10 @@ async def _run(provider,
 
     print_info('Launching Scout')
 
+    # Run the providers' blocking API calls in a pool of --max-workers threads
+    set_fetch_executor(max_workers if max_workers else 10)
+    clear_response_cache()
+
     # Configure optional global throttler from --max-rate if provided
     try:
         max_rate_config = kwargs.get('max_rate')
@@ -265,6 +291,8 @@ async def _run(provider,
         cloud_provider = get_provider(provider=provider,
                                       # AWS
                                       profile=profile,
+                                      aws_async_backend=aws_async_backend,
+                                      aws_iam_bulk_fetch=aws_iam_bulk_fetch,
                                       # Azure
                                       subscription_ids=subscription_ids,
                                       all_subscriptions=all_subscriptions,
@@ -273,6 +301,8 @@ async def _run(provider,
                                       folder_id=folder_id,
                                       organization_id=organization_id,
                                       all_projects=all_projects,
+                                      gcp_batch_requests=gcp_batch_requests,
+                                      gcp_discovery_url=gcp_discovery_url,
                                       # Kubernetes
                                       kubernetes_config_file=kubernetes_config_file,
                                       kubernetes_context=kubernetes_context,
@@ -318,7 +348,15 @@ async def _run(provider,
         # Fetch data from provider APIs
         try:
             print_info('Gathering data from APIs')
-            await cloud_provider.fetch(regions=regions, excluded_regions=excluded_regions)
+            if loop_blocking_threshold:
+                start_loop_blocking_detector(loop_blocking_threshold)
+            try:
+                await cloud_provider.fetch(regions=regions, excluded_regions=excluded_regions)
+            finally:
+                stop_loop_blocking_detector()
+            print_fetch_executor_stats()
+            print_rate_limiter_stats()
+            print_response_cache_stats()
         except KeyboardInterrupt:
             print_info('\nCancelled by user')
             return 130
@@ -360,34 +398,45 @@ async def _run(provider,
         print_exception('Failure while running pre-processing engine: {}'.format(e))
         return 105
 
-    # Analyze config
+    # Load the rules, reusing the rules prepared by a previous run when their definitions did not change
+    ruleset_cache_file = get_filename('RULESET_CACHE', report.report_name, report_dir)[0]
     try:
-        print_info('Running rule engine')
+        print_info('Loading rulesets')
         finding_rules = Ruleset(cloud_provider=cloud_provider.provider_code,
                                 environment_name=cloud_provider.environment,
                                 filename=ruleset,
                                 ip_ranges=ip_ranges,
-                                account_id=cloud_provider.account_id)
-        processing_engine = ProcessingEngine(finding_rules)
-        processing_engine.run(cloud_provider)
+                                account_id=cloud_provider.account_id,
+                                cache_file=ruleset_cache_file)
     except Exception as e:
         print_exception('Failure while running rule engine: {}'.format(e))
         return 106
-
-    # Create display filters
     try:
-        print_info('Applying display filters')
         filter_rules = Ruleset(cloud_provider=cloud_provider.provider_code,
                                environment_name=cloud_provider.environment,
                                filename='filters.json',
                                rule_type='filters',
-                               account_id=cloud_provider.account_id)
-        processing_engine = ProcessingEngine(filter_rules)
-        processing_engine.run(cloud_provider)
+                               account_id=cloud_provider.account_id,
+                               cache_file=ruleset_cache_file)
     except Exception as e:
         print_exception('Failure while applying display filters: {}'.format(e))
         return 107
 
+    # Analyze config and create display filters, in a single pass over the data
+    try:
+        print_info('Running rule engine and applying display filters')
+        # When iterating over local data, only re-run the rules whose definition or input data changed
+        rule_cache_file = get_filename('RULE_CACHE', report.report_name, report_dir)[0] if fetch_local else None
+        if rule_workers > 1:
+            # The rule workers are forked, which is only safe once the other threads are stopped
+            stop_loop_blocking_detector()
+            shutdown_fetch_executor()
+        processing_engine = ProcessingEngine(finding_rules, filter_rules)
+        processing_engine.run(cloud_provider, workers=rule_workers, cache_file=rule_cache_file)
+    except Exception as e:
+        print_exception('Failure while running rule engine: {}'.format(e))
+        return 106
+
     # Handle exceptions
     if exceptions:
         print_info('Applying exceptions')
@@ -91,6 +91,18 @@ class ScoutSuiteArgumentParser:
                                            dest='ip_ranges_name_key',
                                            default='name',
                                            help='Name of the key containing the display name of a known CIDR')
+        aws_additional_parser.add_argument('--aws-async-backend',
+                                           dest='aws_async_backend',
+                                           default=False,
+                                           action='store_true',
+                                           help='Fetch paginated resources with asyncio clients (requires aiobotocore) '
+                                                'instead of threads')
+        aws_additional_parser.add_argument('--aws-iam-bulk-fetch',
+                                           dest='aws_iam_bulk_fetch',
+                                           default=False,
+                                           action='store_true',
+                                           help='Fetch IAM users, groups, roles and policies with '
+                                                'GetAccountAuthorizationDetails instead of one by one')
 
     def _init_gcp_parser(self):
         parser = self.subparsers.add_parser("gcp",
@@ -131,6 +143,20 @@ class ScoutSuiteArgumentParser:
                                action='store_true',
                                help='Scan all of the accessible projects')
 
+        gcp_scope.add_argument('--gcp-batch-requests',
+                               dest='gcp_batch_requests',
+                               default=False,
+                               action='store_true',
+                               help='Send the per-zone and per-resource API calls in batches of up to 100 requests')
+
+        gcp_scope.add_argument('--gcp-discovery-url',
+                               dest='gcp_discovery_url',
+                               default=None,
+                               help='URI template of the APIs\' discovery documents, with {api} and {apiVersion} '
+                                    'placeholders, e.g. to run against a local stand-in of the APIs. The documents are '
+                                    'cached for a day. The documents bundled with the client library are used by '
+                                    'default.')
+
     def _init_azure_parser(self):
         parser = self.subparsers.add_parser("azure",
                                             parents=[self.common_providers_args_parser],
@@ -373,7 +399,19 @@ class ScoutSuiteArgumentParser:
                             dest='max_workers',
                             type=int,
                             default=10,
-                            help='Maximum number of threads (workers) used by Scout Suite (default is 10)')
+                            help='Number of threads making API calls, to which the providers\' HTTP connection pools '
+                                 'are sized (default is 10)')
+        parser.add_argument('--rule-workers',
+                            dest='rule_workers',
+                            type=int,
+                            default=1,
+                            help='Number of processes used to run the rule engine (default is 1)')
+        parser.add_argument('--loop-blocking-threshold',
+                            dest='loop_blocking_threshold',
+                            type=int,
+                            default=None,
+                            help='Report where the event loop is blocked for more than this number of milliseconds '
+                                 'while gathering data')
         parser.add_argument('--report-dir',
                             dest='report_dir',
                             default=None,
@@ -1,18 +1,30 @@
+import bisect
 import datetime
 import dateutil.parser
+import itertools
 import json
 import netaddr
 import re
 import ipaddress
 
+from functools import lru_cache
+
 from policyuniverse.expander_minimizer import get_actions_from_statement, _expand_wildcard_action
 
-from ScoutSuite.core.console import print_error, print_exception
+from ScoutSuite.core.console import print_debug, print_error, print_exception
 
 re_get_value_at = re.compile(r'_GET_VALUE_AT_\((.*?)\)')
 re_nested_get_value_at = re.compile(r'_GET_VALUE_AT_\(.*')
 
 
+@lru_cache(maxsize=1024)
+def _get_regex(pattern):
+    """
+    Compile a test's regular expression once, no matter how many items and rules it is tested against
+    """
+    return re.compile(pattern)
+
+
 def pass_conditions(all_info, current_path, conditions, unknown_as_pass_condition=False):
     """
     Check that all conditions are passed for the current path.
@@ -57,6 +69,103 @@ def pass_conditions(all_info, current_path, conditions, unknown_as_pass_conditio
     return not condition_operator == 'or'
 
 
+def compile_conditions(conditions, unknown_as_pass_condition=False):
+    """
+    Compile a condition tree into an evaluator with the same semantics as pass_conditions.
+
+    The tree is walked once: operators become closures over their children and every test case is bound to its
+    implementation and value(s), so evaluating an item neither copies the conditions nor dispatches on the test name.
+
+    :param conditions:      The conditions to compile as defined in the finding file
+    :param unknown_as_pass_condition:   Consider an undetermined condition as passed
+    :return:                A callable taking (all_info, current_path) and returning whether all conditions passed
+    """
+    if len(conditions) == 0:
+        return _pass_all
+    condition_operator = conditions[0]
+    evaluators = []
+    for condition in conditions[1:]:
+        if condition[0] in ['and', 'or']:
+            evaluators.append(compile_conditions(condition, unknown_as_pass_condition))
+        else:
+            evaluators.append(_compile_condition(condition, unknown_as_pass_condition))
+
+    if condition_operator == 'and':
+        def evaluate(all_info, current_path):
+            for evaluator in evaluators:
+                if not evaluator(all_info, current_path):
+                    return False
+            return True
+    elif condition_operator == 'or':
+        def evaluate(all_info, current_path):
+            for evaluator in evaluators:
+                if evaluator(all_info, current_path):
+                    return True
+            return False
+    else:
+        def evaluate(all_info, current_path):
+            for evaluator in evaluators:
+                evaluator(all_info, current_path)
+            return True
+    return evaluate
+
+
+def _pass_all(all_info, current_path):
+    return True
+
+
+def _compile_condition(condition, unknown_as_pass_condition):
+    # Fixes circular dependency
+    from ScoutSuite.providers.base.configs.browser import get_value_at
+
+    # Conditions are formed as "path to value", "type of test", "value(s) for test"
+    path_to_value, test_name, test_values = condition
+    dynamic_path = re_get_value_at.search(path_to_value) is not None
+    dynamic_value = None
+    if type(test_values) != list and type(test_values) != dict:
+        dynamic_value = re_get_value_at.match(test_values)
+    test = condition_tests.get(test_name)
+    if test is None:
+        # Unknown test cases keep failing (and being reported) at evaluation time
+        def test(b, a):
+            return pass_condition(b, test_name, a)
+    bound_test = None
+    if not dynamic_value:
+        bound_test = _bind_test(test_name, test, test_values)
+
+    def evaluate(all_info, current_path):
+        path = fix_path_string(all_info, current_path, path_to_value) if dynamic_path else path_to_value
+        target_obj = get_value_at(all_info, current_path, path)
+        if dynamic_value:
+            values = get_value_at(all_info, current_path, dynamic_value.groups()[0], True)
+        try:
+            if bound_test:
+                return bound_test(target_obj)
+            return test(target_obj, values)
+        except Exception as e:
+            res = True if unknown_as_pass_condition else False
+            print_exception('Unable to process testcase \'%s\' on value \'%s\', interpreted as %s: %s' %
+                            (test_name, str(target_obj), res, e))
+            return res
+    return evaluate
+
+
+def _bind_test(test_name, test, a):
+    """
+    Bind a test to its value(s), preparing them once (e.g. compiling regular expressions) when the test supports it
+    """
+    if test_name in condition_test_compilers:
+        try:
+            return condition_test_compilers[test_name](a)
+        except Exception:
+            # Invalid values keep failing (and being reported) at evaluation time
+            pass
+
+    def bound_test(b):
+        return test(b, a)
+    return bound_test
+
+
 def pass_condition(b, test, a):
     """
     Generic test function used by Scout
@@ -67,241 +176,502 @@ def pass_condition(b, test, a):
 
     :return:                            True of condition is met, False otherwise
     """
+    if test not in condition_tests:
+        print_error('Error: unknown test case %s' % test)
+        raise Exception
+    return condition_tests[test](b, a)
+
+
+# Equality tests
+
+def _equal(b, a):
+    a = str(a)
+    b = str(b)
+    return a == b
+
+
+def _not_equal(b, a):
+    return not _equal(b, a)
+
+
+# More/Less tests
+
+def _less_than(b, a):
+    return int(b) < int(a)
+
+
+def _less_or_equal(b, a):
+    return int(b) <= int(a)
+
+
+def _more_than(b, a):
+    return int(b) > int(a)
+
+
+def _more_or_equal(b, a):
+    return int(b) >= int(a)
+
+
+# Empty tests
+
+def _empty(b, a):
+    return (type(b) == dict and b == {}) or (type(b) == list and b == []) or (type(b) == list and b == [None])
+
+
+def _not_empty(b, a):
+    return not _empty(b, 'a')
+
+
+def _null(b, a):
+    return (b is None) or (type(b) == str and b == 'None')
+
+
+def _not_null(b, a):
+    return not _null(b, a)
+
+
+# Boolean tests
 
-    # Return false by default
-    result = False
+def _true(b, a):
+    return str(b).lower() == 'true'
 
-    # Equality tests
-    if test == 'equal':
+
+def _false(b, a):
+    return str(b).lower() == 'false'
+
+
+# Object length tests
+
+def _length_less_than(b, a):
+    return len(b) < int(a)
+
+
+def _length_more_than(b, a):
+    return len(b) > int(a)
+
+
+def _length_equal(b, a):
+    return len(b) == int(a)
+
+
+# Dictionary keys tests
+
+def _with_key(b, a):
+    return a in b
+
+
+def _without_key(b, a):
+    return a not in b
+
+
+def _with_key_case_insensitive(b, a):
+    return a.lower() in map(str.lower, b)
+
+
+def _without_key_case_insensitive(b, a):
+    return a.lower() not in map(str.lower, b)
+
+
+# String tests
+
+def _contain_string(b, a):
+    if not type(b) == str:
+        b = str(b)
+    if not type(a) == str:
         a = str(a)
+    return a in b
+
+
+def _not_contain_string(b, a):
+    if not type(b) == str:
         b = str(b)
-        result = (a == b)
-    elif test == 'notEqual':
-        result = (not pass_condition(b, 'equal', a))
-
-    # More/Less tests
-    elif test == 'lessThan':
-        result = (int(b) < int(a))
-    elif test == 'lessOrEqual':
-        result = (int(b) <= int(a))
-    elif test == 'moreThan':
-        result = (int(b) > int(a))
-    elif test == 'moreOrEqual':
-        result = (int(b) >= int(a))
-
-    # Empty tests
-    elif test == 'empty':
-        result = ((type(b) == dict and b == {}) or (type(b) == list and b == []) or (type(b) == list and b == [None]))
-    elif test == 'notEmpty':
-        result = (not pass_condition(b, 'empty', 'a'))
-    elif test == 'null':
-        result = ((b is None) or (type(b) == str and b == 'None'))
-    elif test == 'notNull':
-        result = (not pass_condition(b, 'null', a))
-
-    # Boolean tests
-    elif test == 'true':
-        result = (str(b).lower() == 'true')
-    elif test == 'notTrue' or test == 'false':
-        result = (str(b).lower() == 'false')
-
-    # Object length tests
-    elif test == 'lengthLessThan':
-        result = (len(b) < int(a))
-    elif test == 'lengthMoreThan':
-        result = (len(b) > int(a))
-    elif test == 'lengthEqual':
-        result = (len(b) == int(a))
-
-    # Dictionary keys tests
-    elif test == 'withKey':
-        result = a in b
-    elif test == 'withoutKey':
-        result = a not in b
-    elif test == 'withKeyCaseInsensitive':
-        result = a.lower() in map(str.lower, b)
-    elif test == 'withoutKeyCaseInsensitive':
-        result = a.lower() not in map(str.lower, b)
-
-    # String test
-    elif test == 'containString':
-        if not type(b) == str:
-            b = str(b)
-        if not type(a) == str:
-            a = str(a)
-        result = a in b
-    elif test == 'notContainString':
-        if not type(b) == str:
-            b = str(b)
-        if not type(a) == str:
-            a = str(a)
-        result = a not in b
-
-    # List tests
-    elif test == 'containAtLeastOneOf':
-        result = False
-        if not type(b) == list:
-            b = [b]
-        if not type(a) == list:
-            a = [a]
-        for c in b:
-            if type(c) != dict:
-                c = str(c)
-            if c in a:
-                result = True
-                break
-    elif test == 'containAtLeastOneDifferentFrom':
-        result = False
-        if not type(b) == list:
-            b = [b]
-        if not type(a) == list:
-            a = [a]
-        for c in b:
-            if c and c != '' and c not in a:
-                result = True
-                break
-    elif test == 'containNoneOf':
-        result = True
-        if not type(b) == list:
-            b = [b]
-        if not type(a) == list:
-            a = [a]
-        for c in b:
-            if c in a:
-                result = False
-                break
-    elif test == 'containAtLeastOneMatching':
-        result = False
+    if not type(a) == str:
+        a = str(a)
+    return a not in b
+
+
+# List tests
+
+def _contain_at_least_one_of(b, a):
+    if not type(b) == list:
+        b = [b]
+    if not type(a) == list:
+        a = [a]
+    for c in b:
+        if type(c) != dict:
+            c = str(c)
+        if c in a:
+            return True
+    return False
+
+
+def _contain_at_least_one_different_from(b, a):
+    if not type(b) == list:
+        b = [b]
+    if not type(a) == list:
+        a = [a]
+    for c in b:
+        if c and c != '' and c not in a:
+            return True
+    return False
+
+
+def _contain_none_of(b, a):
+    if not type(b) == list:
+        b = [b]
+    if not type(a) == list:
+        a = [a]
+    for c in b:
+        if c in a:
+            return False
+    return True
+
+
+def _contain_at_least_one_matching(b, a):
+    return _compile_contain_at_least_one_matching(a)(b)
+
+
+def _compile_contain_at_least_one_matching(a):
+    regex = _get_regex(a)
+
+    def test(b):
         for item in b:
-            if re.match(a, item):
-                result = True
-                break
-
-    # Regex tests
-    elif test == 'match':
-        if type(a) != list:
-            a = [a]
+            if regex.match(item):
+                return True
+        return False
+    return test
+
+
+# Regex tests
+
+def _match(b, a):
+    return _compile_match(a)(b)
+
+
+def _compile_match(a):
+    if type(a) != list:
+        a = [a]
+    regexes = [_get_regex(c) for c in a]
+
+    def test(b):
         b = str(b)
-        for c in a:
-            if re.match(c, b):
-                result = True
-                break
-    elif test == 'matchInList':
-        if type(a) != list:
-            a = [a]
-        if type(b) !=list:
+        for regex in regexes:
+            if regex.match(b):
+                return True
+        return False
+    return test
+
+
+def _match_in_list(b, a):
+    return _compile_match_in_list(a)(b)
+
+
+def _compile_match_in_list(a):
+    if type(a) != list:
+        a = [a]
+    regexes = [_get_regex(c) for c in a]
+
+    def test(b):
+        if type(b) != list:
             b = [b]
-        for c in a:
+        for regex in regexes:
             for d in b:
-                if re.match(c, d):
-                    result = True
-                    break
-            if result:
-                break
-    elif test == 'notMatch':
-        result = (not pass_condition(b, 'match', a))
-
-    # Date tests
-    elif test == 'priorToDate':
-        b = dateutil.parser.parse(str(b)).replace(tzinfo=None)
-        a = dateutil.parser.parse(str(a)).replace(tzinfo=None)
-        result = (b < a)
-    elif test == 'olderThan':
-        age, threshold = __prepare_age_test(a, b)
-        result = (age > threshold)
-    elif test == 'newerThan':
-        age, threshold = __prepare_age_test(a, b)
-        result = (age < threshold)
-
-    # CIDR tests
-    elif test == 'inSubnets':
-        result = False
-        grant = netaddr.IPNetwork(b)
-        if type(a) != list:
-            a = [a]
-        for c in a:
+                if regex.match(d):
+                    return True
+        return False
+    return test
+
+
+def _not_match(b, a):
+    return not _match(b, a)
+
+
+def _compile_not_match(a):
+    match = _compile_match(a)
+
+    def test(b):
+        return not match(b)
+    return test
+
+
+# Date tests
+
+# Time against which the age of dates is measured, captured once per run
+_run_clock = {'now': None}
+
+re_iso_8601_date = re.compile(r'^\d{4}-\d{2}-\d{2}([T ]\d{2}:\d{2}(:\d{2}(\.\d{1,6})?)?)?(Z|[+-]\d{2}:\d{2})?$')
+
+
+def set_run_clock(now=None):
+    """
+    Set the time against which olderThan and newerThan tests measure ages, so that all the rules of a run agree on it
+
+    :param now:             The time of the run, defaults to the current time
+    """
+    _run_clock['now'] = now if now else datetime.datetime.today()
+
+
+def get_run_clock():
+    return _run_clock['now'] if _run_clock['now'] else datetime.datetime.today()
+
+
+@lru_cache(maxsize=65536)
+def _parse_date(value):
+    """
+    Parse a date as a naive datetime, trying the ISO 8601 formats found in the providers' data before dateutil's
+    slower, more lenient parser
+    """
+    if re_iso_8601_date.match(value):
+        try:
+            if value.endswith('Z'):
+                value = value[:-1] + '+00:00'
+            return datetime.datetime.fromisoformat(value).replace(tzinfo=None)
+        except ValueError:
+            pass
+    return dateutil.parser.parse(value).replace(tzinfo=None)
+
+
+def _prior_to_date(b, a):
+    b = _parse_date(str(b))
+    a = _parse_date(str(a))
+    return b < a
+
+
+def _older_than(b, a):
+    age, threshold = __prepare_age_test(a, b)
+    return age > threshold
+
+
+def _newer_than(b, a):
+    age, threshold = __prepare_age_test(a, b)
+    return age < threshold
+
+
+# CIDR tests
+
+def _in_subnets(b, a):
+    return _compile_in_subnets(a)(b)
+
+
+def _compile_in_subnets(a):
+    if type(a) != list:
+        a = [a]
+    return _get_in_subnets_test(tuple(a))
+
+
+@lru_cache(maxsize=128)
+def _get_in_subnets_test(a):
+    """
+    Index the known subnets by IP version as ranges sorted by first address, along with the highest last address seen
+    so far, so that finding whether one of them contains a network is a binary search. Rules sharing a list of known
+    subnets share its index. Invalid subnets are reported once and left out of the index.
+    """
+    ranges = {4: [], 6: []}
+    invalid_subnets = []
+    for c in a:
+        try:
             known_subnet = netaddr.IPNetwork(c)
-            if grant in known_subnet:
-                result = True
-                break
-    elif test == 'notInSubnets':
-        result = (not pass_condition(b, 'inSubnets', a))
-    elif test == 'isSubnetRange':
-        result = not ipaddress.ip_network(b, strict=False).exploded.endswith("/32")
-    elif test == 'isPrivateSubnet':
-        result = ipaddress.ip_network(b, strict=False).is_private
-    elif test == 'isPublicSubnet':
-        result = not ipaddress.ip_network(b, strict=False).is_private
-
-    # Port/port ranges tests
-    elif test == 'portsInPortList':
-        result = False
-        if not type(b) == list:
-            b = [b]
-        if not type(a) == list:
-            a = [a]
-        for port_range in b:
-            if '-' in port_range:
-                bottom_limit_port = int(port_range.split('-')[0])
-                upper_limit_port = int(port_range.split('-')[1])
-                for port in a:
-                    if type(port) != int:
-                        port = int(port)
-                    if bottom_limit_port <= port <= upper_limit_port:
-                        result = True
-                        break
-            else: #A single port
-                for port in a:
-                    if port == port_range:
-                        result = True
-                        break
-
-    # Policy statement tests
-    elif test == 'containAction':
-        result = False
-        if type(b) != dict:
-            b = json.loads(b)
-        statement_actions = get_actions_from_statement(b)
-        rule_actions = _expand_wildcard_action(a)
-        for action in rule_actions:
-            if action.lower() in statement_actions:
-                result = True
-                break
-    elif test == 'notContainAction':
-        result = (not pass_condition(b, 'containAction', a))
-    elif test == 'containAtLeastOneAction':
-        result = False
-        if type(b) != dict:
-            b = json.loads(b)
-        if type(a) != list:
-            a = [a]
-        actions = get_actions_from_statement(b)
-        for c in a:
-            if c.lower() in actions:
-                result = True
-                break
-
-    # Policy principal tests
-    elif test == 'isCrossAccount':
-        result = False
+        except Exception as e:
+            invalid_subnets.append(f'{c} ({e})')
+            continue
+        ranges[known_subnet.version].append((known_subnet.first, known_subnet.last))
+    if invalid_subnets:
+        print_exception(f'Ignoring the invalid known subnets {", ".join(invalid_subnets)}')
+    index = {}
+    for version in ranges:
+        ranges[version].sort()
+        index[version] = ([first for first, _ in ranges[version]],
+                          list(itertools.accumulate((last for _, last in ranges[version]), max)))
+
+    def test(b):
+        version, first, last = _get_network_range(b)
+        firsts, max_lasts = index[version]
+        position = bisect.bisect_right(firsts, first)
+        return position > 0 and max_lasts[position - 1] >= last
+    return test
+
+
+@lru_cache(maxsize=4096)
+def _get_network_range(b):
+    grant = netaddr.IPNetwork(b)
+    return grant.version, grant.first, grant.last
+
+
+def _not_in_subnets(b, a):
+    return not _in_subnets(b, a)
+
+
+def _compile_not_in_subnets(a):
+    in_subnets = _compile_in_subnets(a)
+
+    def test(b):
+        return not in_subnets(b)
+    return test
+
+
+def _is_subnet_range(b, a):
+    return not ipaddress.ip_network(b, strict=False).exploded.endswith("/32")
+
+
+def _is_private_subnet(b, a):
+    return ipaddress.ip_network(b, strict=False).is_private
+
+
+def _is_public_subnet(b, a):
+    return not ipaddress.ip_network(b, strict=False).is_private
+
+
+# Port/port ranges tests
+
+def _ports_in_port_list(b, a):
+    if not type(b) == list:
+        b = [b]
+    if not type(a) == list:
+        a = [a]
+    for port_range in b:
+        if '-' in port_range:
+            bottom_limit_port = int(port_range.split('-')[0])
+            upper_limit_port = int(port_range.split('-')[1])
+            for port in a:
+                if type(port) != int:
+                    port = int(port)
+                if bottom_limit_port <= port <= upper_limit_port:
+                    return True
+        else:  # A single port
+            for port in a:
+                if port == port_range:
+                    return True
+    return False
+
+
+# Policy statement tests
+
+def _contain_action(b, a):
+    return _compile_contain_action(a)(b)
+
+
+def _compile_contain_action(a):
+    rule_actions = _get_wildcard_actions(json.dumps(a))
+
+    def test(b):
+        return not rule_actions.isdisjoint(_get_statement_actions(b))
+    return test
+
+
+def _not_contain_action(b, a):
+    return not _contain_action(b, a)
+
+
+def _compile_not_contain_action(a):
+    contain_action = _compile_contain_action(a)
+
+    def test(b):
+        return not contain_action(b)
+    return test
+
+
+def _contain_at_least_one_action(b, a):
+    return _compile_contain_at_least_one_action(a)(b)
+
+
+def _compile_contain_at_least_one_action(a):
+    if type(a) != list:
+        a = [a]
+    rule_actions = frozenset(c.lower() for c in a)
+
+    def test(b):
+        return not rule_actions.isdisjoint(_get_statement_actions(b))
+    return test
+
+
+def _get_statement_actions(statement):
+    """
+    Get the lower-cased actions a policy statement allows, expanding its wildcards and NotAction once per distinct
+    Action/NotAction pair no matter how many rules and principals share the statement
+    """
+    if type(statement) != dict:
+        statement = json.loads(statement)
+    return _expand_statement_actions(json.dumps([statement.get('Action', []), statement.get('NotAction', [])],
+                                                sort_keys=True))
+
+
+@lru_cache(maxsize=None)
+def _expand_statement_actions(key):
+    action, not_action = json.loads(key)
+    return frozenset(get_actions_from_statement({'Action': action, 'NotAction': not_action}))
+
+
+@lru_cache(maxsize=None)
+def _get_wildcard_actions(key):
+    return frozenset(_expand_wildcard_action(json.loads(key)))
+
+
+def clear_action_caches():
+    """
+    Forget the policy actions expanded during a previous run
+    """
+    _expand_statement_actions.cache_clear()
+    _get_wildcard_actions.cache_clear()
+
+
+def print_action_cache_stats():
+    """
+    Report how often expanded policy actions were reused, in debug output
+    """
+    for name, cache in [('statement', _expand_statement_actions), ('wildcard', _get_wildcard_actions)]:
+        info = cache.cache_info()
+        lookups = info.hits + info.misses
+        if lookups:
+            print_debug(f'Policy {name} action expansion cache: {info.hits}/{lookups} hits '
+                        f'({100 * info.hits / lookups:.1f}%), {info.currsize} entries')
+
+
+# Policy principal tests
+
+def _is_cross_account(b, a):
+    return _compile_is_cross_account(a)(b)
+
+
+def _compile_is_cross_account(a):
+    account_arn = _get_regex(r'arn:aws:iam:.*?:%s:.*' % a)
+
+    def test(b):
         if type(b) != list:
             b = [b]
         for c in b:
             if type(c) == dict and 'AWS' in c:
                 c = c['AWS']
-            if c != a and not re.match(r'arn:aws:iam:.*?:%s:.*' % a, c):
-                result = True
-                break
-    elif test == 'isSameAccount':
-        result = False
+            if c != a and not account_arn.match(c):
+                return True
+        return False
+    return test
+
+
+def _is_same_account(b, a):
+    return _compile_is_same_account(a)(b)
+
+
+def _compile_is_same_account(a):
+    account_arn = _get_regex(r'arn:aws:iam:.*?:%s:.*' % a)
+
+    def test(b):
         if type(b) != list:
             b = [b]
         for c in b:
-            if c == a or re.match(r'arn:aws:iam:.*?:%s:.*' % a, c):
-                result = True
-                break
-    elif test == 'isAccountRoot':
-        result = False
+            if c == a or account_arn.match(c):
+                return True
+        return False
+    return test
+
+
+def _is_account_root(b, a):
+    return _compile_is_account_root(a)(b)
+
+
+def _compile_is_account_root(a):
+    account_root_arn = _get_regex(r'arn:aws:iam:.*?:%s:root' % a)
+
+    def test(b):
         if type(b) != list:
             b = [b]
         for c in b:
@@ -310,16 +680,75 @@ def pass_condition(b, test, a):
                 if type(c) != list:
                     c = [c]
                 for i in c:
-                    if i == a or re.match(r'arn:aws:iam:.*?:%s:root' % a, i):
-                        result = True
-                        break
-
-    # Unknown test case
-    else:
-        print_error('Error: unknown test case %s' % test)
-        raise Exception
-
-    return result
+                    if i == a or account_root_arn.match(i):
+                        return True
+        return False
+    return test
+
+
+# Test case name -> test function, called as test(value_to_test, value_from_rule)
+condition_tests = {
+    'equal': _equal,
+    'notEqual': _not_equal,
+    'lessThan': _less_than,
+    'lessOrEqual': _less_or_equal,
+    'moreThan': _more_than,
+    'moreOrEqual': _more_or_equal,
+    'empty': _empty,
+    'notEmpty': _not_empty,
+    'null': _null,
+    'notNull': _not_null,
+    'true': _true,
+    'notTrue': _false,
+    'false': _false,
+    'lengthLessThan': _length_less_than,
+    'lengthMoreThan': _length_more_than,
+    'lengthEqual': _length_equal,
+    'withKey': _with_key,
+    'withoutKey': _without_key,
+    'withKeyCaseInsensitive': _with_key_case_insensitive,
+    'withoutKeyCaseInsensitive': _without_key_case_insensitive,
+    'containString': _contain_string,
+    'notContainString': _not_contain_string,
+    'containAtLeastOneOf': _contain_at_least_one_of,
+    'containAtLeastOneDifferentFrom': _contain_at_least_one_different_from,
+    'containNoneOf': _contain_none_of,
+    'containAtLeastOneMatching': _contain_at_least_one_matching,
+    'match': _match,
+    'matchInList': _match_in_list,
+    'notMatch': _not_match,
+    'priorToDate': _prior_to_date,
+    'olderThan': _older_than,
+    'newerThan': _newer_than,
+    'inSubnets': _in_subnets,
+    'notInSubnets': _not_in_subnets,
+    'isSubnetRange': _is_subnet_range,
+    'isPrivateSubnet': _is_private_subnet,
+    'isPublicSubnet': _is_public_subnet,
+    'portsInPortList': _ports_in_port_list,
+    'containAction': _contain_action,
+    'notContainAction': _not_contain_action,
+    'containAtLeastOneAction': _contain_at_least_one_action,
+    'isCrossAccount': _is_cross_account,
+    'isSameAccount': _is_same_account,
+    'isAccountRoot': _is_account_root,
+}
+
+# Test case name -> function preparing the value(s) of a test once and returning the test, called as test(value_to_test)
+condition_test_compilers = {
+    'containAtLeastOneMatching': _compile_contain_at_least_one_matching,
+    'match': _compile_match,
+    'matchInList': _compile_match_in_list,
+    'notMatch': _compile_not_match,
+    'inSubnets': _compile_in_subnets,
+    'notInSubnets': _compile_not_in_subnets,
+    'isCrossAccount': _compile_is_cross_account,
+    'isSameAccount': _compile_is_same_account,
+    'isAccountRoot': _compile_is_account_root,
+    'containAction': _compile_contain_action,
+    'notContainAction': _compile_not_contain_action,
+    'containAtLeastOneAction': _compile_contain_at_least_one_action,
+}
 
 
 def fix_path_string(all_info, current_path, path_to_value):
@@ -357,5 +786,5 @@ def __prepare_age_test(a, b):
     elif unit == 'minutes':
         number *= 60
         unit = 'seconds'
-    age = getattr((datetime.datetime.today() - dateutil.parser.parse(str(b)).replace(tzinfo=None)), unit)
+    age = getattr((get_run_clock() - _parse_date(str(b))), unit)
     return age, number
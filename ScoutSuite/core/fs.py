@@ -27,15 +27,7 @@ def load_data(data_file, key_name=None, local_file=False):
     :param local_file:
     :return:
     """
-    if local_file:
-        if data_file.startswith('/'):
-            src_file = data_file
-        else:
-            src_dir = os.getcwd()
-            src_file = os.path.join(src_dir, data_file)
-    else:
-        src_dir = os.path.join(os.path.dirname(os.path.realpath(__file__)), '../data')
-        src_file = os.path.join(src_dir, data_file)
+    src_file = get_data_file_path(data_file, local_file)
     with open(src_file) as f:
         data = json.load(f)
     if key_name:
@@ -43,6 +35,23 @@ def load_data(data_file, key_name=None, local_file=False):
     return data
 
 
+def get_data_file_path(data_file, local_file=False):
+    """
+    Get the path of a data file, relative to the working directory if it is local and to Scout's data otherwise
+
+    :param data_file:
+    :param local_file:
+    :return:
+    """
+    if local_file:
+        if data_file.startswith('/'):
+            return data_file
+        else:
+            return os.path.join(os.getcwd(), data_file)
+    else:
+        return os.path.join(os.path.dirname(os.path.realpath(__file__)), '../data', data_file)
+
+
 def read_ip_ranges(filename, local_file=True, ip_only=False, conditions=None):
     """
     Returns the list of IP prefixes from an ip-ranges file
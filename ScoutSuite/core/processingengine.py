@@ -1,34 +1,77 @@
-from ScoutSuite.core.console import print_debug, print_exception
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import threading
+
+from ScoutSuite import ERRORS_LIST
+from ScoutSuite.core.conditions import clear_action_caches, get_run_clock, print_action_cache_stats, set_run_clock
+from ScoutSuite.core.console import print_debug, print_exception, print_info, print_warning
 from ScoutSuite.utils import manage_dictionary
 
-from ScoutSuite.core.utils import recurse
+from ScoutSuite.core.utils import RulePathTree, recurse_tree
+
+# Data shared with the rule worker processes, which inherit it when they are forked
+_worker_state = {}
+# Seconds the rule workers may go without returning a result before their remaining rules are processed in-process
+worker_timeout = 900
+
+rule_cache_version = 1
+# Results of rules using these tests depend on the time of the run, they are never reused
+time_dependent_tests = ['olderThan', 'newerThan']
 
 
 class ProcessingEngine:
     """
-
+    Test the rules of one or more rulesets (e.g. findings and filters) against a cloud provider's data, walking the
+    data once for all the rules that share a path prefix.
     """
 
-    def __init__(self, ruleset):
+    def __init__(self, *rulesets):
         # Organize rules by path
-        self.ruleset = ruleset
+        self.rulesets = rulesets
         self.rules = {}
-        for filename in self.ruleset.rules:
-            for rule in self.ruleset.rules[filename]:
-                if not rule.enabled:
-                    continue
-                try:
-                    manage_dictionary(self.rules, rule.path, [])
-                    self.rules[rule.path].append(rule)
-                except Exception as e:
-                    print_exception(f'Failed to create rule {rule.filename}: {e}')
+        for ruleset in self.rulesets:
+            for filename in ruleset.rules:
+                for rule in ruleset.rules[filename]:
+                    if not rule.enabled:
+                        continue
+                    try:
+                        manage_dictionary(self.rules, rule.path, [])
+                        self.rules[rule.path].append(rule)
+                    except Exception as e:
+                        print_exception(f'Failed to create rule {rule.filename}: {e}')
+
+    def run(self, cloud_provider, skip_dashboard=False, workers=1, cache_file=None):
+        """
+        Test the rules against the cloud provider's data and store the results in its services
+
+        :param cloud_provider:          The cloud provider whose data is tested
+        :param skip_dashboard:          Only store the flagged items, without the dashboard attributes
+        :param workers:                 Number of processes the rules are distributed across (1 to run them in-process)
+        :param cache_file:              File where the results of the rules are cached, along with fingerprints of
+                                        their definition and of the services they read. Rules whose fingerprints did
+                                        not change since the previous run reuse their cached results.
+        :return:
+        """
+        set_run_clock()
+        clear_action_caches()
 
-    def run(self, cloud_provider, skip_dashboard=False):
         # Clean up existing findings
-        for service in cloud_provider.services:
-            cloud_provider.services[service][self.ruleset.rule_type] = {}
+        for ruleset in self.rulesets:
+            for service in cloud_provider.services:
+                cloud_provider.services[service][ruleset.rule_type] = {}
 
-        # Process each rule
+        # Plan a single walk of the data for all the rules
+        rules = []
+        evaluated_rules = []
+        tree = RulePathTree()
+        results = {}
+        errors = {}
+        cache = self._load_cache(cache_file) if cache_file else {}
+        cache_entries = {}
+        service_fingerprints = {}
         for finding_path in self._filter_rules(self.rules, cloud_provider.service_list):
             for rule in self.rules[finding_path]:
 
@@ -36,43 +79,214 @@ class ProcessingEngine:
                     continue
 
                 print_debug(f'Processing {rule.service} rule "{rule.description}" ({rule.filename})')
-                finding_path = rule.path
-                path = finding_path.split('.')
-                service = path[0]
-                manage_dictionary(cloud_provider.services[service], self.ruleset.rule_type, {})
-                cloud_provider.services[service][self.ruleset.rule_type][rule.key] = {}
-                cloud_provider.services[service][self.ruleset.rule_type][rule.key]['description'] = rule.description
-                cloud_provider.services[service][self.ruleset.rule_type][rule.key]['path'] = rule.path
-                for attr in ['level', 'id_suffix', 'class_suffix', 'display_path']:
-                    if hasattr(rule, attr):
-                        cloud_provider.services[service][self.ruleset.rule_type][rule.key][attr] = getattr(rule, attr)
-                try:
-                    setattr(rule, 'checked_items', 0)
-                    cloud_provider.services[service][self.ruleset.rule_type][rule.key]['items'] = recurse(
-                        cloud_provider.services, cloud_provider.services, path, [], rule, True)
-                    if skip_dashboard:
+                setattr(rule, 'checked_items', 0)
+                rules.append(rule)
+                if cache_file and self._is_cacheable(rule):
+                    fingerprint = rule.get_fingerprint()
+                    inputs = self._get_input_fingerprints(rule, cloud_provider.services, service_fingerprints)
+                    cache_entries[rule] = (fingerprint, inputs)
+                    if fingerprint in cache and cache[fingerprint]['inputs'] == inputs:
+                        results[rule] = cache[fingerprint]['items']
+                        setattr(rule, 'checked_items', cache[fingerprint]['checked_items'])
                         continue
-                    cloud_provider.services[service][self.ruleset.rule_type][rule.key]['dashboard_name'] = \
-                        rule.dashboard_name
-                    cloud_provider.services[service][self.ruleset.rule_type][rule.key]['checked_items'] = \
-                        rule.checked_items
-                    cloud_provider.services[service][self.ruleset.rule_type][rule.key]['flagged_items'] = \
-                        len(cloud_provider.services[service][self.ruleset.rule_type][rule.key]['items'])
-                    cloud_provider.services[service][self.ruleset.rule_type][rule.key]['service'] = rule.service
-                    cloud_provider.services[service][self.ruleset.rule_type][rule.key]['rationale'] = \
-                        rule.rationale if hasattr(rule, 'rationale') else None
-                    cloud_provider.services[service][self.ruleset.rule_type][rule.key]['remediation'] = \
-                        rule.remediation if hasattr(rule, 'remediation') else None
-                    cloud_provider.services[service][self.ruleset.rule_type][rule.key]['compliance'] = \
-                        rule.compliance if hasattr(rule, 'compliance') else None
-                    cloud_provider.services[service][self.ruleset.rule_type][rule.key]['references'] = \
-                        rule.references if hasattr(rule, 'references') else None
-                except Exception as e:
-                    print_exception(f'Failed to process rule defined in {rule.filename}: {e}')
-                    # Fallback if process rule failed to ensure report creation and data dump still happen
-                    cloud_provider.services[service][self.ruleset.rule_type][rule.key]['checked_items'] = 0
-                    cloud_provider.services[service][self.ruleset.rule_type][rule.key]['flagged_items'] = 0
+                evaluated_rules.append(rule)
+                tree.add_rule(rule)
+                results[rule] = []
+        if cache_file:
+            print_info(f'Reusing cached results for {len(rules) - len(evaluated_rules)} of {len(rules)} rules')
+
+        # Process each rule
+        if workers > 1 and len(evaluated_rules) > 1:
+            if 'fork' not in multiprocessing.get_all_start_methods():
+                print_warning('Rule workers require the fork start method, processing rules in a single process')
+                recurse_tree(cloud_provider.services, cloud_provider.services, tree, [], results, errors, True)
+            elif threading.active_count() > 1:
+                # A forked process could inherit locks held by the other threads
+                print_warning(f'{threading.active_count() - 1} other threads are running, processing rules in a single '
+                              f'process')
+                recurse_tree(cloud_provider.services, cloud_provider.services, tree, [], results, errors, True)
+            else:
+                self._run_in_workers(cloud_provider.services, evaluated_rules, results, errors, workers)
+        else:
+            recurse_tree(cloud_provider.services, cloud_provider.services, tree, [], results, errors, True)
+        print_action_cache_stats()
+
+        # Store the results
+        for rule in rules:
+            path = rule.path.split('.')
+            service = path[0]
+            manage_dictionary(cloud_provider.services[service], rule.rule_type, {})
+            cloud_provider.services[service][rule.rule_type][rule.key] = {}
+            finding = cloud_provider.services[service][rule.rule_type][rule.key]
+            finding['description'] = rule.description
+            finding['path'] = rule.path
+            for attr in ['level', 'id_suffix', 'class_suffix', 'display_path']:
+                if hasattr(rule, attr):
+                    finding[attr] = getattr(rule, attr)
+            try:
+                if rule in errors:
+                    raise errors[rule]
+                finding['items'] = results[rule]
+                if skip_dashboard:
+                    continue
+                finding['dashboard_name'] = rule.dashboard_name
+                finding['checked_items'] = rule.checked_items
+                finding['flagged_items'] = len(finding['items'])
+                finding['service'] = rule.service
+                finding['rationale'] = rule.rationale if hasattr(rule, 'rationale') else None
+                finding['remediation'] = rule.remediation if hasattr(rule, 'remediation') else None
+                finding['compliance'] = rule.compliance if hasattr(rule, 'compliance') else None
+                finding['references'] = rule.references if hasattr(rule, 'references') else None
+            except Exception as e:
+                print_exception(f'Failed to process rule defined in {rule.filename}: {e}')
+                # Fallback if process rule failed to ensure report creation and data dump still happen
+                finding['checked_items'] = 0
+                finding['flagged_items'] = 0
+
+        if cache_file:
+            self._save_cache(cache_file, results, cache_entries)
+
+    @staticmethod
+    def _is_cacheable(rule):
+        conditions = json.dumps(rule.conditions)
+        return not any('"%s"' % test in conditions for test in time_dependent_tests)
+
+    @staticmethod
+    def _get_input_fingerprints(rule, services, service_fingerprints):
+        """
+        Fingerprint the services a rule reads: the service in its path and any service its conditions refer to
+        """
+        definition = json.dumps([rule.path, rule.conditions,
+                                 getattr(rule, 'id_suffix', None), getattr(rule, 'class_suffix', None)])
+        inputs = {}
+        for service in services:
+            if service == rule.path.split('.')[0] or re.search(r'\b%s\.' % re.escape(service), definition):
+                if service not in service_fingerprints:
+                    service_data = json.dumps(services[service], default=str)
+                    service_fingerprints[service] = hashlib.sha256(service_data.encode()).hexdigest()
+                inputs[service] = service_fingerprints[service]
+        return inputs
+
+    @staticmethod
+    def _load_cache(cache_file):
+        if not os.path.isfile(cache_file):
+            return {}
+        try:
+            with open(cache_file) as f:
+                cache = json.load(f)
+            if cache.get('version') != rule_cache_version:
+                return {}
+            return cache['rules']
+        except Exception as e:
+            print_debug(f'Ignoring invalid rule cache {cache_file}: {e}')
+            return {}
+
+    @staticmethod
+    def _save_cache(cache_file, results, cache_entries):
+        cached_rules = {}
+        for rule, (fingerprint, inputs) in cache_entries.items():
+            if rule in results:
+                cached_rules[fingerprint] = {'inputs': inputs,
+                                             'items': results[rule],
+                                             'checked_items': rule.checked_items}
+        try:
+            os.makedirs(os.path.dirname(cache_file) or '.', exist_ok=True)
+            with open(cache_file, 'w') as f:
+                json.dump({'version': rule_cache_version, 'rules': cached_rules}, f)
+        except Exception as e:
+            print_exception(f'Failed to save rule cache {cache_file}: {e}')
+
+    def _run_in_workers(self, services, rules, results, errors, workers):
+        """
+        Process shards of the rules in forked worker processes, which inherit the services' data copy-on-write and
+        only send back the results of their rules. The shards of workers that stop responding are processed in-process.
+        """
+        shards = self._shard_rules(rules, workers)
+        context = multiprocessing.get_context('fork')
+        shard_results = {}
+        try:
+            with context.Pool(len(shards), initializer=_init_worker,
+                              initargs=(services, shards, get_run_clock())) as pool:
+                shard_iterator = pool.imap_unordered(_process_shard, range(len(shards)))
+                for _ in shards:
+                    shard_index, shard_result = shard_iterator.next(timeout=worker_timeout)
+                    shard_results[shard_index] = shard_result
+        except multiprocessing.TimeoutError:
+            print_warning(f'The rule workers returned no result for {worker_timeout} seconds, processing their '
+                          f'remaining rules in a single process')
+
+        for shard_index, shard in enumerate(shards):
+            if shard_index in shard_results:
+                shard_items, shard_errors, shard_checked_items, shard_errors_list = shard_results[shard_index]
+                ERRORS_LIST.extend(shard_errors_list)
+            else:
+                _init_worker(services, shards, get_run_clock())
+                try:
+                    # The errors are reported to this process' errors list directly
+                    _, (shard_items, shard_errors, shard_checked_items, _) = _process_shard(shard_index)
+                finally:
+                    _worker_state.clear()
+            for rule, items, error, checked_items in zip(shard, shard_items, shard_errors, shard_checked_items):
+                setattr(rule, 'checked_items', checked_items)
+                if error is None:
+                    results[rule] = items
+                else:
+                    del results[rule]
+                    errors[rule] = Exception(error)
+
+    @staticmethod
+    def _shard_rules(rules, count):
+        """
+        Split the rules into at most `count` shards of similar size, keeping rules with the same path (and, as far as
+        possible, the same path prefix) in the same shard so that their data is only walked once
+        """
+        rules_by_path = {}
+        for rule in rules:
+            manage_dictionary(rules_by_path, rule.path, [])
+            rules_by_path[rule.path].append(rule)
+        shard_size = -(-len(rules) // count)
+        shards = [[]]
+        for path in sorted(rules_by_path):
+            if len(shards[-1]) >= shard_size:
+                shards.append([])
+            shards[-1] += rules_by_path[path]
+        return shards
 
     @staticmethod
     def _filter_rules(rules, services):
         return {rule_name: rule for rule_name, rule in rules.items() if rule_name.split('.')[0] in services}
+
+
+def _init_worker(services, shards, run_clock):
+    """
+    Share the services' data and the rules with a worker process, without copying them as the worker is forked, and
+    the time of the run so that its date tests agree with the other workers'
+    """
+    _worker_state['services'] = services
+    _worker_state['shards'] = shards
+    set_run_clock(run_clock)
+
+
+def _process_shard(shard_index):
+    """
+    Process one shard of rules in a worker process
+
+    :param shard_index:                 Index of the shard in the shared worker state
+    :return:                            The index of the shard, and the flagged items, error message and checked items
+                                        count of each rule in the shard and the errors reported while processing them
+    """
+    services = _worker_state['services']
+    rules = _worker_state['shards'][shard_index]
+    first_error = len(ERRORS_LIST)
+    tree = RulePathTree()
+    results = {}
+    errors = {}
+    for rule in rules:
+        tree.add_rule(rule)
+        results[rule] = []
+    recurse_tree(services, services, tree, [], results, errors, True)
+    print_action_cache_stats()
+    return shard_index, ([results.get(rule) for rule in rules],
+                         [str(errors[rule]) if rule in errors else None for rule in rules],
+                         [rule.checked_items for rule in rules],
+                         ERRORS_LIST[first_error:])
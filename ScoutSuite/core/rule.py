@@ -1,6 +1,8 @@
+import hashlib
 import json
 import re
 
+from ScoutSuite.core.conditions import compile_conditions
 from ScoutSuite.core.fs import read_ip_ranges
 from ScoutSuite.core.console import print_exception
 
@@ -43,6 +45,7 @@ class Rule:
         self.args = self.get_attribute('args', rule, [])
         self.conditions = self.get_attribute('conditions', rule, [])
         self.key_suffix = self.get_attribute('key_suffix', rule, None)
+        self.condition_evaluator = None
 
     @staticmethod
     def get_attribute(name, rule, default_value):
@@ -142,3 +145,46 @@ class Rule:
                 setattr(self, 'key', f'{self.key}-{self.key_suffix}')
         except Exception as e:
             print_exception(f'Failed to set definition {self.filename}: {e}')
+        self.compile_conditions()
+
+    def to_dict(self):
+        """
+        Get the rule's prepared definition as a JSON-serializable dictionary, from which it can be restored
+
+        :return:                        Dictionary of the rule's attributes
+        """
+        return {attr: value for attr, value in vars(self).items()
+                if attr not in ['checked_items', 'condition_evaluator']}
+
+    @classmethod
+    def from_dict(cls, attributes):
+        """
+        Restore a rule from its prepared definition, without loading and preparing its definition again
+
+        :param attributes:              Dictionary of the rule's attributes, as returned by to_dict()
+        :return:                        Rule
+        """
+        rule = cls.__new__(cls)
+        rule.__dict__.update(attributes)
+        rule.compile_conditions()
+        return rule
+
+    def get_fingerprint(self):
+        """
+        Hash the rule's prepared definition, i.e. after arguments, includes and special values have been resolved
+
+        :return:                        Hex digest of the definition
+        """
+        definition = self.to_dict()
+        return hashlib.sha256(json.dumps(definition, sort_keys=True, default=str).encode()).hexdigest()
+
+    def compile_conditions(self):
+        """
+        Compile the rule's conditions into an evaluator, leaving it unset (interpreted evaluation) if they are malformed
+
+        :return:
+        """
+        try:
+            self.condition_evaluator = compile_conditions(self.conditions)
+        except Exception:
+            self.condition_evaluator = None
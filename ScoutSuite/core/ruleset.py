@@ -1,8 +1,12 @@
+import hashlib
 import json
 import os
+import re
 import tempfile
 
+from ScoutSuite import __version__ as scout_version
 from ScoutSuite.core.console import print_debug, print_error, prompt_yes_no, print_exception
+from ScoutSuite.core.fs import get_data_file_path
 
 from ScoutSuite.core.rule import Rule
 from ScoutSuite.core.rule_definition import RuleDefinition
@@ -10,6 +14,10 @@ from ScoutSuite.core.rule_definition import RuleDefinition
 aws_ip_ranges_filename = 'ip-ranges.json'
 ip_ranges_from_args = 'ip-ranges-from-args'
 
+ruleset_cache_version = 1
+re_include = re.compile(r'_INCLUDE_\((.*?)\)')
+re_ip_ranges_file = re.compile(r'_IP_RANGES_FROM_(LOCAL_)?FILE_\((.*?),')
+
 
 class Ruleset:
     """
@@ -29,7 +37,8 @@ class Ruleset:
                  rule_type='findings',
                  ip_ranges=None,
                  account_id=None,
-                 ruleset_generator=False):
+                 ruleset_generator=False,
+                 cache_file=None):
         rules_dir = [] if rules_dir is None else rules_dir
         ip_ranges = [] if ip_ranges is None else ip_ranges
 
@@ -44,8 +53,16 @@ class Ruleset:
             self.search_ruleset(environment_name)
         print_debug('Loading ruleset %s' % self.filename)
         self.name = os.path.basename(self.filename).replace('.json', '') if not name else name
+        # Reuse the rules prepared by a previous run if none of the files they were built from changed
+        cache_key = None
+        if cache_file and not ruleset_generator:
+            cache_key = self._get_cache_key(cloud_provider, rules_dir, ip_ranges, account_id)
+            if cache_key and self._load_cache(cache_file, cache_key):
+                return
         self.load(self.rule_type)
         self.shared_init(ruleset_generator, rules_dir, account_id, ip_ranges)
+        if cache_key:
+            self._save_cache(cache_file, cache_key, rules_dir, ip_ranges)
 
     def to_string(self):
         return str(vars(self))
@@ -163,6 +180,124 @@ class Ruleset:
                     self.rule_definitions[os.path.basename(rule_filename)] = RuleDefinition(self.rules_data_path,
                                                                                             rule_filename)
 
+    def _get_cache_key(self, cloud_provider, rule_dirs, ip_ranges, account_id):
+        """
+        Identify the ruleset and the parameters its rules are prepared with
+
+        :return:                        Dictionary of the ruleset's content hash and parameters, None if the ruleset
+                                        cannot be read
+        """
+        try:
+            with open(self.filename, 'rb') as f:
+                ruleset_hash = hashlib.sha256(f.read()).hexdigest()
+        except Exception:
+            return None
+        return {'version': ruleset_cache_version,
+                'scout_version': scout_version,
+                'cloud_provider': cloud_provider,
+                'ruleset': ruleset_hash,
+                'rule_type': self.rule_type,
+                'rule_dirs': [os.path.abspath(rule_dir) for rule_dir in rule_dirs],
+                'ip_ranges': [get_data_file_path(filename, local_file=True) for filename in ip_ranges],
+                'account_id': account_id,
+                'working_directory': os.getcwd()}
+
+    def _get_dependencies(self, rule_dirs, ip_ranges):
+        """
+        List the files the rules were prepared from (ruleset, rule definitions, included conditions and IP ranges)
+        along with their modification time
+
+        :return:                        Dictionary of modification times by path, None for missing files
+        """
+        paths = [self.filename] + [os.path.abspath(rule_dir) for rule_dir in rule_dirs]
+        definitions = []
+        with open(self.filename) as f:
+            definitions.append(f.read())
+        for rule_definition in self.rule_definitions.values():
+            if hasattr(rule_definition, 'file_path'):
+                paths.append(rule_definition.file_path)
+            definitions.append(getattr(rule_definition, 'string_definition', ''))
+        while definitions:
+            definition = definitions.pop()
+            for include in re_include.findall(definition):
+                path = f'{self.rules_data_path}/{include}'
+                if path in paths:
+                    continue
+                paths.append(path)
+                if os.path.isfile(path):
+                    with open(path) as f:
+                        definitions.append(f.read())
+            for local, filename in re_ip_ranges_file.findall(definition):
+                if filename == ip_ranges_from_args:
+                    files = [(filename, True) for filename in ip_ranges]
+                else:
+                    files = [(filename, bool(local))]
+                for filename, local_file in files:
+                    path = get_data_file_path(filename, local_file)
+                    if path in paths:
+                        continue
+                    paths.append(path)
+                    # Filtered IP ranges are read from another file
+                    try:
+                        with open(path) as f:
+                            data = json.load(f)
+                        if 'source' in data:
+                            paths.append(get_data_file_path(data['source'], data.get('local_file', False)))
+                    except Exception:
+                        pass
+        return {path: self._get_mtime(path) for path in paths}
+
+    @staticmethod
+    def _get_mtime(path):
+        try:
+            return os.path.getmtime(path)
+        except OSError:
+            return None
+
+    def _load_cache(self, cache_file, cache_key):
+        try:
+            if not os.path.isfile(cache_file):
+                return False
+            with open(cache_file) as f:
+                cache = json.load(f)['rulesets'][self.rule_type]
+            if cache['key'] != cache_key:
+                return False
+            for path, mtime in cache['dependencies'].items():
+                if self._get_mtime(path) != mtime:
+                    return False
+            self.about = cache['about']
+            self.rules = {filename: [Rule.from_dict(rule) for rule in rules]
+                          for filename, rules in cache['rules'].items()}
+        except Exception as e:
+            print_debug(f'Ignoring invalid ruleset cache {cache_file}: {e}')
+            return False
+        print_debug(f'Loaded the prepared rules of {self.filename} from {cache_file}')
+        return True
+
+    def _save_cache(self, cache_file, cache_key, rule_dirs, ip_ranges):
+        if type(self.rules) != dict:
+            return
+        try:
+            cache = {'version': ruleset_cache_version, 'rulesets': {}}
+            if os.path.isfile(cache_file):
+                try:
+                    with open(cache_file) as f:
+                        cache['rulesets'] = json.load(f)['rulesets']
+                except Exception:
+                    pass
+            cache['rulesets'][self.rule_type] = {
+                'key': cache_key,
+                'dependencies': self._get_dependencies(rule_dirs, ip_ranges),
+                'about': self.about,
+                'rules': {filename: [rule.to_dict() for rule in rules] for filename, rules in self.rules.items()}
+            }
+            data = json.dumps(cache)
+            os.makedirs(os.path.dirname(cache_file) or '.', exist_ok=True)
+            with open(cache_file, 'w') as f:
+                f.write(data)
+        except Exception as e:
+            print_exception(f'Failed to save ruleset cache {cache_file}: {e}')
+
     def search_ruleset(self, environment_name, no_prompt=False):
         """
 
@@ -31,57 +31,162 @@ def recurse(all_info, current_info, target_path, current_path, config, add_suffi
     :return:
     """
     results = []
-    if len(target_path) == 0:
-        # Dashboard: count the number of processed resources here
-        setattr(config, 'checked_items', getattr(config, 'checked_items') + 1)
-        # Test for conditions...
-        if pass_conditions(all_info, current_path, copy.deepcopy(config.conditions)):
-            # id_suffix
-            if add_suffix and hasattr(config, 'id_suffix'):
-                suffix = fix_path_string(all_info, current_path, config.id_suffix)
-                current_path.append(suffix)
-            # class_suffix
-            if add_suffix and hasattr(config, 'class_suffix'):
-                suffix = fix_path_string(all_info, current_path, config.class_suffix)
-                current_path.append(suffix)
-            results.append('.'.join(current_path))
-        # Return the flagged items...
-        return results
-    target_path = copy.deepcopy(target_path)
-    dbg_target_path = copy.deepcopy(target_path)
-    current_path = copy.deepcopy(current_path)
-    attribute = target_path.pop(0)
+    _recurse(all_info, current_info, target_path, 0, list(current_path), config, add_suffix, results)
+    return results
+
+
+def _recurse(all_info, current_info, target_path, index, current_path, config, add_suffix, results):
+    # current_path is a stack shared by the whole walk: elements are pushed before and popped after each descent
+    if index == len(target_path):
+        item = _test_rule(all_info, current_path, config, add_suffix)
+        if item is not None:
+            results.append(item)
+        return
+    attribute = target_path[index]
     if type(current_info) == dict:
         if attribute in current_info:
-            split_path = copy.deepcopy(current_path)
-            split_path.append(attribute)
-            results = results + recurse(all_info, current_info[attribute], target_path, split_path, config, add_suffix)
+            current_path.append(attribute)
+            _recurse(all_info, current_info[attribute], target_path, index + 1, current_path, config, add_suffix,
+                     results)
+            current_path.pop()
         elif attribute == 'id':
             for key in current_info:
-                split_target_path = copy.deepcopy(target_path)
-                split_current_path = copy.deepcopy(current_path)
-                split_current_path.append(key)
-                split_current_info = current_info[key]
-                results = results + recurse(all_info, split_current_info, split_target_path, split_current_path,
-                                            config, add_suffix)
+                current_path.append(key)
+                _recurse(all_info, current_info[key], target_path, index + 1, current_path, config, add_suffix,
+                         results)
+                current_path.pop()
     # To handle lists properly, I would have to make sure the list is properly ordered and I can use the index to
     # consistently access an object... Investigate (or do not use lists)
     elif type(current_info) == list:
-        for index, split_current_info in enumerate(current_info):
-            split_current_path = copy.deepcopy(current_path)
-            split_current_path.append(str(index))
-            results = results + recurse(all_info, split_current_info, copy.deepcopy(target_path), split_current_path,
-                                        config, add_suffix)
+        for split_index, split_current_info in enumerate(current_info):
+            current_path.append(str(split_index))
+            _recurse(all_info, split_current_info, target_path, index + 1, current_path, config, add_suffix, results)
+            current_path.pop()
     # Python 2-3 compatible way to check for string type
     elif isinstance(current_info, str):
-        split_current_path = copy.deepcopy(current_path)
-        results = results + recurse(all_info, current_info, [], split_current_path,
-                                    config, add_suffix)
+        _recurse(all_info, current_info, target_path, len(target_path), current_path, config, add_suffix, results)
     else:
         print_exception('Unable to recursively test condition for path {}: '
                         'unhandled case for \"{}\" type'.format(current_path,
                                                                 type(current_info)),
-                        additional_details={'current_path': current_path,
+                        additional_details={'current_path': list(current_path),
                                             'current_info': current_info,
-                                            'dbg_target_path': dbg_target_path})
-    return results
+                                            'dbg_target_path': list(target_path[index:])})
+
+
+def _test_rule(all_info, current_path, config, add_suffix):
+    """
+    Test a rule's conditions on the item at `current_path`
+
+    :return:                The flagged item's path, or None if the conditions are not met
+    """
+    # Dashboard: count the number of processed resources here
+    setattr(config, 'checked_items', getattr(config, 'checked_items') + 1)
+    # Test for conditions...
+    condition_evaluator = getattr(config, 'condition_evaluator', None)
+    if condition_evaluator:
+        passed = condition_evaluator(all_info, current_path)
+    else:
+        passed = pass_conditions(all_info, current_path, copy.deepcopy(config.conditions))
+    if not passed:
+        return None
+    if add_suffix and (hasattr(config, 'id_suffix') or hasattr(config, 'class_suffix')):
+        flagged_path = list(current_path)
+        # id_suffix
+        if hasattr(config, 'id_suffix'):
+            flagged_path.append(fix_path_string(all_info, flagged_path, config.id_suffix))
+        # class_suffix
+        if hasattr(config, 'class_suffix'):
+            flagged_path.append(fix_path_string(all_info, flagged_path, config.class_suffix))
+        return '.'.join(flagged_path)
+    return '.'.join(current_path)
+
+
+class RulePathTree:
+    """
+    Prefix tree of rule paths, used to test all the rules sharing a path prefix during a single walk of the data.
+
+    :ivar depth:            Number of path elements leading to this node
+    :ivar children:         Sub-trees, indexed by the next path element
+    :ivar rules:            Rules whose path ends at this node
+    """
+
+    def __init__(self, depth=0):
+        self.depth = depth
+        self.children = {}
+        self.rules = []
+
+    def add_rule(self, rule):
+        node = self
+        for attribute in rule.path.split('.'):
+            if attribute not in node.children:
+                node.children[attribute] = RulePathTree(node.depth + 1)
+            node = node.children[attribute]
+        node.rules.append(rule)
+
+    def all_rules(self):
+        """
+        List the rules whose path ends at this node or at any of its descendants
+        """
+        rules = list(self.rules)
+        for child in self.children.values():
+            rules += child.all_rules()
+        return rules
+
+
+def recurse_tree(all_info, current_info, tree, current_path, results, errors, add_suffix=False):
+    """
+    Test the conditions of all the rules in a RulePathTree, walking each path prefix once.
+
+    Every rule gets the same flagged items, in the same order, as a separate call to `recurse` would return.
+
+    :param all_info:        All of the services' data
+    :param current_info:    The data located at `current_path`
+    :param tree:            The RulePathTree node matching `current_path`
+    :param current_path:    The path that has been walked so far, used as a stack and restored before returning
+    :param results:         Flagged items, indexed by rule; rules that raise an exception are removed
+    :param errors:          Exceptions raised while testing a rule, indexed by rule
+    :param add_suffix:      Whether to append the rules' id_suffix and class_suffix to the flagged items
+    :return:
+    """
+    if tree.rules:
+        _test_rules(all_info, current_path, tree.rules, results, errors, add_suffix)
+    for attribute, subtree in tree.children.items():
+        if type(current_info) == dict:
+            if attribute in current_info:
+                current_path.append(attribute)
+                recurse_tree(all_info, current_info[attribute], subtree, current_path, results, errors, add_suffix)
+                current_path.pop()
+            elif attribute == 'id':
+                for key in current_info:
+                    current_path.append(key)
+                    recurse_tree(all_info, current_info[key], subtree, current_path, results, errors, add_suffix)
+                    current_path.pop()
+        elif type(current_info) == list:
+            for index, split_current_info in enumerate(current_info):
+                current_path.append(str(index))
+                recurse_tree(all_info, split_current_info, subtree, current_path, results, errors, add_suffix)
+                current_path.pop()
+        elif isinstance(current_info, str):
+            _test_rules(all_info, current_path, subtree.all_rules(), results, errors, add_suffix)
+        else:
+            for rule in subtree.all_rules():
+                print_exception('Unable to recursively test condition for path {}: '
+                                'unhandled case for \"{}\" type'.format(current_path,
+                                                                        type(current_info)),
+                                additional_details={'current_path': list(current_path),
+                                                    'current_info': current_info,
+                                                    'dbg_target_path': rule.path.split('.')[tree.depth:]})
+
+
+def _test_rules(all_info, current_path, rules, results, errors, add_suffix):
+    for rule in rules:
+        if rule not in results:
+            continue
+        try:
+            item = _test_rule(all_info, current_path, rule, add_suffix)
+            if item is not None:
+                results[rule].append(item)
+        except Exception as e:
+            del results[rule]
+            errors[rule] = e
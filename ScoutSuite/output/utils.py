@@ -5,6 +5,14 @@ import sys
 from ScoutSuite import DEFAULT_REPORT_DIRECTORY, DEFAULT_REPORT_RESULTS_DIRECTORY
 from ScoutSuite.core.console import print_error
 
+# Files kept in the results directory to be reused by later runs, by file type: (name, extension)
+cache_files = {
+    'RULE_CACHE': ('scoutsuite_rule_cache', 'json'),
+    'RULESET_CACHE': ('scoutsuite_ruleset_cache', 'json'),
+    'REGION_CATALOG': ('scoutsuite_region_catalog', 'json'),
+    'DISCOVERY_CACHE': ('scoutsuite_discovery_cache', 'json'),
+}
+
 
 def prompt_for_yes_no(question):
     """
@@ -61,6 +69,14 @@ def get_filename(file_type, file_name=None, file_dir=None, relative_path=False,
             directory = DEFAULT_REPORT_RESULTS_DIRECTORY
         extension = 'js'
         first_line = 'exceptions ='
+    elif file_type in cache_files:
+        cache_name, extension = cache_files[file_type]
+        name = f'{cache_name}_{file_name}' if file_name else cache_name
+        if not relative_path:
+            directory = os.path.join(file_dir if file_dir else DEFAULT_REPORT_DIRECTORY, DEFAULT_REPORT_RESULTS_DIRECTORY)
+        else:
+            directory = DEFAULT_REPORT_RESULTS_DIRECTORY
+        first_line = None
     elif file_type == 'ERRORS':
         name = f'scoutsuite_errors_{file_name}' if file_name else 'scoutsuite_errors'
         if not relative_path:
@@ -10,10 +10,13 @@ from ScoutSuite.providers.aliyun.facade.ram import RAMFacade
 from ScoutSuite.providers.aliyun.facade.rds import RDSFacade
 from ScoutSuite.providers.aliyun.facade.vpc import VPCFacade
 from ScoutSuite.providers.aliyun.facade.oss import OSSFacade
-from ScoutSuite.providers.utils import run_concurrently
+from ScoutSuite.providers.utils import RateLimitedFacade
 
 
-class AliyunFacade:
+class AliyunFacade(RateLimitedFacade):
+    provider = 'aliyun'
+    service = 'location'
+
     def __init__(self, credentials: AliyunCredentials):
         self._credentials = credentials
         self._instantiate_facades()
@@ -38,7 +41,7 @@ class AliyunFacade:
         # if service not in available_services:
         #     raise Exception('Service ' + service + ' is not available.')
 
-        regions = await run_concurrently(
+        regions = await self._run_concurrently(
             lambda: self._resolver.get_valid_region_ids_by_product(product_code=service))
 
         if chosen_regions:
@@ -1,9 +1,13 @@
 from ScoutSuite.providers.aliyun.authentication_strategy import AliyunCredentials
 
 from ScoutSuite.providers.aliyun.utils import get_oss_client
+from ScoutSuite.providers.utils import RateLimitedFacade
 
 
-class OSSFacade:
+class OSSFacade(RateLimitedFacade):
+    provider = 'aliyun'
+    service = 'oss'
+
     def __init__(self, credentials: AliyunCredentials):
         self._credentials = credentials
 
@@ -14,7 +18,7 @@ class OSSFacade:
         :return: a list of all instances
         """
         client = get_oss_client(credentials=self._credentials)
-        response = client.list_buckets()  # TODO this doesn't follow standards
+        response = await self._run_concurrently(client.list_buckets)  # TODO this doesn't follow standards
         if response:
             return response.buckets
         else:
@@ -0,0 +1,154 @@
+import asyncio
+
+import boto3
+
+from ScoutSuite.providers.aws.utils import get_paginator_args
+from ScoutSuite.providers.utils import get_max_workers, get_rate_limiter, is_throttled, run_function_concurrently, \
+    wait_before_retry
+
+try:
+    from aiobotocore.config import AioConfig
+    from aiobotocore.session import get_session
+except ImportError:
+    AioConfig = None
+    get_session = None
+
+
+class SessionCredentials:
+    """
+    Credentials of a boto3 session for aiobotocore clients. Temporary credentials (assumed roles, SSO, ...) are
+    refreshed by botocore as they expire, in the fetch thread pool as refreshing them makes blocking calls.
+    """
+    method = 'boto3-session'
+
+    def __init__(self, credentials):
+        self._credentials = credentials
+
+    async def get_frozen_credentials(self):
+        refresh_needed = getattr(self._credentials, 'refresh_needed', None)
+        if refresh_needed and refresh_needed():
+            return await run_function_concurrently(self._credentials.get_frozen_credentials)
+        return self._credentials.get_frozen_credentials()
+
+    async def get_account_id(self):
+        return getattr(await self.get_frozen_credentials(), 'account_id', None)
+
+    def __getattr__(self, name):
+        # Other attributes are those of the botocore credentials, e.g. get_deferred_property
+        return getattr(self._credentials, name)
+
+
+class SessionCredentialProvider:
+    """
+    First provider of the aiobotocore sessions' credential chains, resolving the credentials of a boto3 session
+    """
+    METHOD = 'boto3-session'
+    CANONICAL_NAME = None
+
+    def __init__(self, session: boto3.session.Session):
+        self._session = session
+
+    async def load(self):
+        return SessionCredentials(self._session.get_credentials())
+
+
+class AsyncClients:
+    """
+    aiobotocore clients, created once per session, service and region on the running event loop and sharing the boto3
+    session's credentials
+    """
+    max_attempts = 5
+
+    def __init__(self):
+        self._clients = {}
+        self._lock = None
+        self._loop = None
+
+    @staticmethod
+    def is_available():
+        return get_session is not None
+
+    async def get_client(self, service: str, session: boto3.session.Session, region: str = None):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Clients and their connection pools are bound to the loop they were created on
+            self._clients = {}
+            self._lock = asyncio.Lock()
+            self._loop = loop
+        key = (session, service, region)
+        if key not in self._clients:
+            async with self._lock:
+                if key not in self._clients:
+                    aio_session = get_session()
+                    aio_session.get_component('credential_provider').providers.insert(
+                        0, SessionCredentialProvider(session))
+                    context = aio_session.create_client(
+                        service,
+                        region_name=region if region else session.region_name,
+                        config=AioConfig(max_pool_connections=get_max_workers()))
+                    self._clients[key] = (context, await context.__aenter__())
+        return self._clients[key][1]
+
+    async def get_multiple_entities_from_all_pages(self, service: str, region: str, session: boto3.session.Session,
+                                                   paginator_name: str, entities: list, **paginator_args):
+        """
+        Gets all the entities from an aiobotocore paginator given multiple entity keys, fetching the pages on the event
+        loop instead of in a thread
+
+        :return: A dictionary with the entity keys as keys, and the fetched entities lists as values.
+        """
+        resources = {entity: [] for entity in entities}
+        async for page in self.get_pages(service, region, session, paginator_name, **paginator_args):
+            for entity in entities:
+                resources[entity].extend(page[entity])
+        return resources
+
+    async def get_pages(self, service: str, region: str, session: boto3.session.Session, paginator_name: str,
+                        **paginator_args):
+        """
+        Yields the pages of an aiobotocore paginator as they are fetched
+
+        :return: An asynchronous iterator over the pages.
+        """
+        client = await self.get_client(service, session, region)
+        paginator = client.get_paginator(paginator_name)
+        rate_limiter = get_rate_limiter(('aws', service, region))
+        state = {}
+        while True:
+            page = await self._get_next_page(paginator, paginator_args, state, rate_limiter,
+                                             f'{service} {paginator_name} paginator')
+            if page is None:
+                return
+            yield page
+
+    async def _get_next_page(self, paginator, paginator_args: dict, state: dict, rate_limiter, location: str):
+        """
+        Fetches the next page of a paginator, retrying throttled requests as run_concurrently does. A failed request
+        ends the page iterator, so the pages are then fetched by a new iterator starting from the last page's token.
+        """
+        attempt = 0
+        while True:
+            if state.get('pages') is None:
+                state['page_iterator'] = paginator.paginate(
+                    **get_paginator_args(paginator_args, state.get('next_token')))
+                state['pages'] = state['page_iterator'].__aiter__()
+            await rate_limiter.acquire()
+            try:
+                page = await state['pages'].__anext__()
+            except StopAsyncIteration:
+                return None
+            except Exception as e:
+                state['pages'] = None
+                attempt += 1
+                if attempt >= self.max_attempts or not is_throttled(e):
+                    raise
+                await wait_before_retry(rate_limiter, attempt, location)
+                continue
+            rate_limiter.on_success()
+            state['next_token'] = state['page_iterator']._get_next_token(page)
+            return page
+
+    async def close(self):
+        clients, self._clients = self._clients, {}
+        for context, _ in clients.values():
+            await context.__aexit__(None, None, None)
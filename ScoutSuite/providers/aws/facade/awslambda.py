@@ -6,6 +6,8 @@ from ScoutSuite.providers.aws.facade.utils import AWSFacadeUtils
 
 
 class LambdaFacade(AWSBaseFacade):
+    service = 'lambda'
+
     async def get_functions(self, region):
         try:
             return await AWSFacadeUtils.get_all_pages('lambda', region, self.session, 'list_functions', 'Functions')
@@ -14,9 +16,9 @@ class LambdaFacade(AWSBaseFacade):
             return []
 
     async def get_access_policy(self, function_name, region):
-        client = AWSFacadeUtils.get_client('lambda', self.session, region)
+        client = await AWSFacadeUtils.get_client_concurrently('lambda', self.session, region)
         try:
-            policy = client.get_policy(FunctionName=function_name)
+            policy = await self._run_concurrently(lambda: client.get_policy(FunctionName=function_name), region)
             if policy is not None and 'Policy' in policy:
                 return json.loads(policy['Policy'])
         except Exception as e:
@@ -26,15 +28,21 @@ class LambdaFacade(AWSBaseFacade):
             return None
 
     async def get_role_with_managed_policies(self, role_name):
-        client = AWSFacadeUtils.get_client('iam', self.session)
+        # Functions commonly share roles and policies, so their responses are shared with the other functions and the
+        # IAM facade
         try:
-            role = client.get_role(RoleName=role_name)['Role']
-            managed_policies = client.list_attached_role_policies(RoleName=role_name)['AttachedPolicies']
+            role = (await AWSFacadeUtils.get_cached_response(
+                'iam', None, self.session, 'get_role', RoleName=role_name))['Role']
+            managed_policies = (await AWSFacadeUtils.get_cached_response(
+                'iam', None, self.session, 'list_attached_role_policies', RoleName=role_name))['AttachedPolicies']
             for policy in managed_policies:
-                policy_version = client.get_policy(PolicyArn=policy['PolicyArn'])
+                policy_version = await AWSFacadeUtils.get_cached_response(
+                    'iam', None, self.session, 'get_policy', PolicyArn=policy['PolicyArn'])
                 if 'Policy' in policy_version and 'DefaultVersionId' in policy_version['Policy']:
                     policy_version = policy_version['Policy']['DefaultVersionId']
-                    document = client.get_policy_version(PolicyArn=policy['PolicyArn'], VersionId=policy_version)
+                    document = await AWSFacadeUtils.get_cached_response(
+                        'iam', None, self.session, 'get_policy_version', PolicyArn=policy['PolicyArn'],
+                        VersionId=policy_version)
                     if 'PolicyVersion' in document and 'Document' in document['PolicyVersion']:
                         policy['Document'] = document['PolicyVersion']['Document']
             role['policies'] = managed_policies
@@ -47,9 +55,10 @@ class LambdaFacade(AWSBaseFacade):
             return None
 
     async def get_env_variables(self, function_name, region):
-        client = AWSFacadeUtils.get_client('lambda', self.session, region)
+        client = await AWSFacadeUtils.get_client_concurrently('lambda', self.session, region)
         try:
-            function_configuration = client.get_function_configuration(FunctionName=function_name)
+            function_configuration = await self._run_concurrently(
+                lambda: client.get_function_configuration(FunctionName=function_name), region)
             if "Environment" in function_configuration and "Variables" in function_configuration["Environment"]:
                 return function_configuration["Environment"]["Variables"]
         except Exception as e:
@@ -1,4 +1,4 @@
-from boto3.session import Session
+import asyncio
 
 from ScoutSuite.providers.aws.facade.acm import AcmFacade
 from ScoutSuite.providers.aws.facade.awslambda import LambdaFacade
@@ -27,8 +27,9 @@ from ScoutSuite.providers.aws.facade.ses import SESFacade
 from ScoutSuite.providers.aws.facade.sns import SNSFacade
 from ScoutSuite.providers.aws.facade.sqs import SQSFacade
 from ScoutSuite.providers.aws.facade.secretsmanager import SecretsManagerFacade
-from ScoutSuite.providers.aws.utils import get_aws_account_id, get_partition_name
-from ScoutSuite.providers.utils import run_concurrently
+from ScoutSuite.providers.aws.utils import get_available_regions, get_available_services, get_aws_account_id, \
+    get_partition_name
+from ScoutSuite.providers.utils import run_function_concurrently
 
 from ScoutSuite.core.conditions import print_error
 
@@ -64,33 +65,38 @@ except ImportError:
 
 
 class AWSFacade(AWSBaseFacade):
-    def __init__(self, credentials=None):
+    service = 'ec2'
+
+    def __init__(self, credentials=None, iam_bulk_fetch=False):
         super().__init__()
         self.owner_id = get_aws_account_id(credentials.session)
         self.partition = get_partition_name(credentials.session)
         self.session = credentials.session
+        self.iam_bulk_fetch = iam_bulk_fetch
+        self._not_opted_in_regions = None
+        self._not_opted_in_regions_lock = None
         self._instantiate_facades()
 
     async def build_region_list(self, service: str, chosen_regions=None, excluded_regions=None, partition_name='aws'):
 
         available_services = None
         try:
-            available_services = await run_concurrently(
-                lambda: Session(region_name='us-east-1').get_available_services())
+            available_services = await run_function_concurrently(
+                lambda: get_available_services('us-east-1'))
         except Exception as e:
             # see https://github.com/nccgroup/ScoutSuite/issues/548
             # If failed with the us-east-1 region, we'll try to use the region from the profile
             try:
-                available_services = await run_concurrently(
-                    lambda: Session(region_name=self.session.region_name).get_available_services())
+                available_services = await run_function_concurrently(
+                    lambda: get_available_services(self.session.region_name))
             except Exception as e:
                 # see https://github.com/nccgroup/ScoutSuite/issues/685
                 # If above failed, and regions were explicitly specified, will try with those until one works
                 if chosen_regions:
                     for region in chosen_regions:
                         try:
-                            available_services = await run_concurrently(
-                                lambda: Session(region_name=region).get_available_services())
+                            available_services = await run_function_concurrently(
+                                lambda: get_available_services(region))
                             break
                         except Exception as e:
                             exception = e
@@ -113,16 +119,13 @@ class AWSFacade(AWSBaseFacade):
         try:
             # the cognito service is a composition of two boto3 services
             if service != "cognito":
-                regions = await run_concurrently(
-                    lambda: Session(region_name='us-east-1').get_available_regions(service,
-                                                                                   partition_name))
+                regions = await run_function_concurrently(
+                    lambda: get_available_regions(service, partition_name, 'us-east-1'))
             else:
-                idp_regions = await run_concurrently(
-                    lambda: Session(region_name='us-east-1').get_available_regions("cognito-idp",
-                                                                                   partition_name))
-                identity_regions = await run_concurrently(
-                    lambda: Session(region_name='us-east-1').get_available_regions("cognito-identity",
-                                                                                   partition_name))
+                idp_regions = await run_function_concurrently(
+                    lambda: get_available_regions("cognito-idp", partition_name, 'us-east-1'))
+                identity_regions = await run_function_concurrently(
+                    lambda: get_available_regions("cognito-identity", partition_name, 'us-east-1'))
                 regions = [value for value in idp_regions if value in identity_regions]
         except Exception as e:
             # see https://github.com/nccgroup/ScoutSuite/issues/548
@@ -130,16 +133,13 @@ class AWSFacade(AWSBaseFacade):
             try:
                 # the cognito service is a composition of two boto3 services
                 if service != "cognito":
-                    regions = await run_concurrently(
-                        lambda: Session(region_name=self.session.region_name).get_available_regions(service,
-                                                                                                    partition_name))
+                    regions = await run_function_concurrently(
+                        lambda: get_available_regions(service, partition_name, self.session.region_name))
                 else:
-                    idp_regions = await run_concurrently(
-                        lambda: Session(region_name=self.session.region_name).get_available_regions("cognito-idp",
-                                                                                                    partition_name))
-                    identity_regions = await run_concurrently(
-                        lambda: Session(region_name=self.session.region_name).get_available_regions("cognito-identity",
-                                                                                                    partition_name))
+                    idp_regions = await run_function_concurrently(
+                        lambda: get_available_regions("cognito-idp", partition_name, self.session.region_name))
+                    identity_regions = await run_function_concurrently(
+                        lambda: get_available_regions("cognito-identity", partition_name, self.session.region_name))
                     regions = [value for value in idp_regions if value in identity_regions]
             except Exception as e:
                 # see https://github.com/nccgroup/ScoutSuite/issues/685
@@ -149,18 +149,13 @@ class AWSFacade(AWSBaseFacade):
                         try:
                             # the cognito service is a composition of two boto3 services
                             if service != "cognito":
-                                regions = await run_concurrently(
-                                    lambda: Session(region_name=region).get_available_regions(service,
-                                                                                              partition_name))
+                                regions = await run_function_concurrently(
+                                    lambda: get_available_regions(service, partition_name, region))
                             else:
-                                idp_regions = await run_concurrently(
-                                    lambda: Session(region_name=region).get_available_regions(
-                                        "cognito-idp",
-                                        partition_name))
-                                identity_regions = await run_concurrently(
-                                    lambda: Session(region_name=region).get_available_regions(
-                                        "cognito-identity",
-                                        partition_name))
+                                idp_regions = await run_function_concurrently(
+                                    lambda: get_available_regions("cognito-idp", partition_name, region))
+                                identity_regions = await run_function_concurrently(
+                                    lambda: get_available_regions("cognito-identity", partition_name, region))
                                 regions = [value for value in idp_regions if value in identity_regions]
                             break
                         except Exception as e:
@@ -195,43 +190,45 @@ class AWSFacade(AWSBaseFacade):
                 print_error('"get_available_regions" returned an empty array for service "{}", '
                             'something is wrong'.format(service))
 
-        # identify regions that are not opted-in
-        ec2_not_opted_in_regions = None
-        try:
-            ec2_not_opted_in_regions = self.session.client('ec2', 'us-east-1') \
-                .describe_regions(AllRegions=True, Filters=[{'Name': 'opt-in-status', 'Values': ['not-opted-in']}])
-        except Exception as e:
-            # see https://github.com/nccgroup/ScoutSuite/issues/548
-            # If failed with the us-east-1 region, we'll try to use the region from the profile
-            try:
-                ec2_not_opted_in_regions = \
-                    self.session.client('ec2', self.session.region_name). \
-                        describe_regions(AllRegions=True,
-                                         Filters=[{'Name': 'opt-in-status',
-                                                   'Values': ['not-opted-in']}])
-            except Exception as e:
-                # see https://github.com/nccgroup/ScoutSuite/issues/685
-                # If above failed, and regions were explicitly specified, will try with those until
-                # one works
-                if chosen_regions:
-                    for region in chosen_regions:
-                        try:
-                            ec2_not_opted_in_regions = self.session.client('ec2', region).describe_regions(
-                                AllRegions=True,
-                                Filters=[{'Name': 'opt-in-status',
-                                          'Values': ['not-opted-in']}])
-                            break
-                        except Exception as e:
-                            exception = e
-                    if not ec2_not_opted_in_regions:
-                        raise exception
-                else:
-                    raise e
+        # identify regions that are not opted-in, once for all the services
+        if self._not_opted_in_regions_lock is None:
+            self._not_opted_in_regions_lock = asyncio.Lock()
+        async with self._not_opted_in_regions_lock:
+            if self._not_opted_in_regions is None:
+                ec2_not_opted_in_regions = None
+                try:
+                    ec2_not_opted_in_regions = await self._run_concurrently(
+                        lambda: self._describe_not_opted_in_regions('us-east-1'), 'us-east-1')
+                except Exception as e:
+                    # see https://github.com/nccgroup/ScoutSuite/issues/548
+                    # If failed with the us-east-1 region, we'll try to use the region from the profile
+                    try:
+                        ec2_not_opted_in_regions = await self._run_concurrently(
+                            lambda: self._describe_not_opted_in_regions(self.session.region_name),
+                            self.session.region_name)
+                    except Exception as e:
+                        # see https://github.com/nccgroup/ScoutSuite/issues/685
+                        # If above failed, and regions were explicitly specified, will try with those until
+                        # one works
+                        if chosen_regions:
+                            for region in chosen_regions:
+                                try:
+                                    ec2_not_opted_in_regions = await self._run_concurrently(
+                                        lambda: self._describe_not_opted_in_regions(region), region)
+                                    break
+                                except Exception as e:
+                                    exception = e
+                            if not ec2_not_opted_in_regions:
+                                raise exception
+                        else:
+                            raise e
 
-        not_opted_in_regions = []
-        if ec2_not_opted_in_regions['Regions']:
-            for r in ec2_not_opted_in_regions['Regions']:
-                not_opted_in_regions.append(r['RegionName'])
+                not_opted_in_regions = []
+                if ec2_not_opted_in_regions['Regions']:
+                    for r in ec2_not_opted_in_regions['Regions']:
+                        not_opted_in_regions.append(r['RegionName'])
+                self._not_opted_in_regions = not_opted_in_regions
+        not_opted_in_regions = self._not_opted_in_regions
 
         # include specific regions
         if chosen_regions:
@@ -245,6 +242,10 @@ class AWSFacade(AWSBaseFacade):
 
         return regions
 
+    def _describe_not_opted_in_regions(self, region):
+        return self.session.client('ec2', region).describe_regions(
+            AllRegions=True, Filters=[{'Name': 'opt-in-status', 'Values': ['not-opted-in']}])
+
     def _instantiate_facades(self):
         self.ec2 = EC2Facade(self.session, self.owner_id)
         self.acm = AcmFacade(self.session)
@@ -262,7 +263,7 @@ class AWSFacade(AWSBaseFacade):
         self.codebuild = CodeBuild(self.session)
         self.elb = ELBFacade(self.session)
         self.elbv2 = ELBv2Facade(self.session)
-        self.iam = IAMFacade(self.session)
+        self.iam = IAMFacade(self.session, self.iam_bulk_fetch)
         self.kms = KMSFacade(self.session)
         self.rds = RDSFacade(self.session)
         self.redshift = RedshiftFacade(self.session)
@@ -1,6 +1,10 @@
 import boto3
 
+from ScoutSuite.providers.utils import RateLimitedFacade
+
+
+class AWSBaseFacade(RateLimitedFacade):
+    provider = 'aws'
 
-class AWSBaseFacade:
     def __init__(self, session: boto3.session.Session = None):
         self.session = session
@@ -8,6 +8,7 @@ from ScoutSuite.providers.utils import run_concurrently
 
 
 class CloudFormation(AWSBaseFacade):
+    service = 'cloudformation'
 
     async def get_stacks(self, region: str):
         try:
@@ -27,8 +28,8 @@ class CloudFormation(AWSBaseFacade):
     async def _get_and_set_description(self, stack: {}, region: str):
         client = AWSFacadeUtils.get_client('cloudformation', self.session, region)
         try:
-            stack_description = await run_concurrently(
-                lambda: client.describe_stacks(StackName=stack['StackName'])['Stacks'][0])
+            stack_description = await self._run_concurrently(
+                lambda: client.describe_stacks(StackName=stack['StackName'])['Stacks'][0], region)
         except Exception as e:
             if 'does not exist' in str(e):
                 print_warning(f'Failed to describe CloudFormation stack: {e}')
@@ -40,8 +41,8 @@ class CloudFormation(AWSBaseFacade):
     async def _get_and_set_template(self, stack: {}, region: str):
         client = AWSFacadeUtils.get_client('cloudformation', self.session, region)
         try:
-            stack['template'] = await run_concurrently(
-                lambda: client.get_template(StackName=stack['StackName'])['TemplateBody'])
+            stack['template'] = await self._run_concurrently(
+                lambda: client.get_template(StackName=stack['StackName'])['TemplateBody'], region)
         except Exception as e:
             if 'is not ready' not in str(e):
                 print_exception(f'Failed to get CloudFormation template: {e}')
@@ -50,8 +51,8 @@ class CloudFormation(AWSBaseFacade):
     async def _get_and_set_policy(self, stack: {}, region: str):
         client = AWSFacadeUtils.get_client('cloudformation', self.session, region)
         try:
-            stack_policy = await run_concurrently(
-                lambda: client.get_stack_policy(StackName=stack['StackName']))
+            stack_policy = await self._run_concurrently(
+                lambda: client.get_stack_policy(StackName=stack['StackName']), region)
         except Exception as e:
             print_exception(f'Failed to get CloudFormation stack policy: {e}')
         else:
@@ -61,8 +62,8 @@ class CloudFormation(AWSBaseFacade):
     async def _get_stack_notifications(self, stack: {}, region: str):
         client = AWSFacadeUtils.get_client('cloudformation', self.session, region)
         try:
-            stack_notifications = await run_concurrently(
-                lambda: client.describe_stacks(StackName=stack['StackName'])['Stacks'])
+            stack_notifications = await self._run_concurrently(
+                lambda: client.describe_stacks(StackName=stack['StackName'])['Stacks'], region)
         except Exception as e:
             print_exception(f'Failed to describe CloudFormation stack: {e}')
         else:
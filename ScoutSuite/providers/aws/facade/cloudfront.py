@@ -3,9 +3,9 @@ import asyncio
 from ScoutSuite.core.console import print_exception
 from ScoutSuite.providers.aws.facade.basefacade import AWSBaseFacade
 from ScoutSuite.providers.aws.facade.utils import AWSFacadeUtils
-from ScoutSuite.providers.utils import run_concurrently
 
 class CloudFront(AWSBaseFacade):
+    service = 'cloudfront'
 
     async def get_distributions(self):
         client = AWSFacadeUtils.get_client('cloudfront',self.session)
@@ -15,7 +15,7 @@ class CloudFront(AWSBaseFacade):
         aws_cloudfront_api_called, n_attempts = False, 3
         try:
             while not aws_cloudfront_api_called and n_attempts > 0:
-                response = await run_concurrently(client.list_distributions)
+                response = await self._run_concurrently(client.list_distributions)
                 if 'ResponseMetadata' in response:
                     aws_cloudfront_api_called = True
                 else:
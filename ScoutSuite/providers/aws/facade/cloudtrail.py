@@ -6,11 +6,13 @@ from ScoutSuite.providers.utils import run_concurrently
 
 
 class CloudTrailFacade(AWSBaseFacade):
+    service = 'cloudtrail'
+
     async def get_trails(self, region):
         client = AWSFacadeUtils.get_client('cloudtrail', self.session, region)
         try:
-            trails = await run_concurrently(
-                lambda: client.describe_trails()['trailList'])
+            trails = await self._run_concurrently(
+                lambda: client.describe_trails()['trailList'], region)
         except Exception as e:
             print_exception(f'Failed to describe CloudTrail trail: {e}')
             trails = []
@@ -23,8 +25,8 @@ class CloudTrailFacade(AWSBaseFacade):
     async def _get_and_set_status(self, trail: {}, region: str):
         client = AWSFacadeUtils.get_client('cloudtrail', self.session, region)
         try:
-            trail_status = await run_concurrently(
-                lambda: client.get_trail_status(Name=trail['TrailARN']))
+            trail_status = await self._run_concurrently(
+                lambda: client.get_trail_status(Name=trail['TrailARN']), region)
             trail.update(trail_status)
         except Exception as e:
             print_exception(f'Failed to get CloudTrail trail status: {e}')
@@ -33,7 +35,7 @@ class CloudTrailFacade(AWSBaseFacade):
         client = AWSFacadeUtils.get_client('cloudtrail', self.session, region)
         try:
             # this call will fail for organization trails stored in another account
-            trail['EventSelectors'] = await run_concurrently(
-                lambda: client.get_event_selectors(TrailName=trail['TrailARN']).get('EventSelectors', []))
+            trail['EventSelectors'] = await self._run_concurrently(
+                lambda: client.get_event_selectors(TrailName=trail['TrailARN']).get('EventSelectors', []), region)
         except Exception as e:
             print_exception(f'Failed to get CloudTrail event selectors: {e}')
@@ -14,10 +14,13 @@ class CloudWatch(AWSBaseFacade):
             return []
 
     async def get_metric_filters(self, region):
+        """
+        Yields the metric filters page by page
+        """
         try:
-            return await AWSFacadeUtils.get_all_pages('logs', region, self.session, 'describe_metric_filters',
-                                                      'metricFilters')
+            async for metric_filters in AWSFacadeUtils.get_pages('logs', region, self.session,
+                                                                 'describe_metric_filters', 'metricFilters'):
+                yield metric_filters
         except Exception as e:
             print_exception('Failed to get CloudWatch metric filters: {}'.format(e))
-            return []
 
@@ -1,14 +1,16 @@
 from ScoutSuite.core.console import print_exception
 from ScoutSuite.providers.aws.facade.basefacade import AWSBaseFacade
 from ScoutSuite.providers.aws.facade.utils import AWSFacadeUtils
-from ScoutSuite.providers.utils import run_concurrently, map_concurrently
+from ScoutSuite.providers.utils import map_concurrently
 
 
 class CodeBuild(AWSBaseFacade):
+    service = 'codebuild'
+
     async def get_projects(self, region: str):
         codebuild_client = AWSFacadeUtils.get_client('codebuild', self.session, region)
         try:
-            projects = await run_concurrently(lambda: codebuild_client.list_projects()['projects'])
+            projects = await self._run_concurrently(lambda: codebuild_client.list_projects()['projects'], region)
         except Exception as e:
             print_exception(f'Failed to get CodeBuild projects: {e}')
             return []
@@ -20,7 +22,8 @@ class CodeBuild(AWSBaseFacade):
     async def _get_project_details(self, project: str, region: str):
         codebuild_client = AWSFacadeUtils.get_client('codebuild', self.session, region)
         try:
-            project_details = await run_concurrently(lambda: codebuild_client.batch_get_projects(names=[project]))
+            project_details = await self._run_concurrently(lambda: codebuild_client.batch_get_projects(names=[project]),
+                                                           region)
         except Exception as e:
             print_exception(f'Failed to get CodeBuild project details: {e}')
             return {}
@@ -1,10 +1,10 @@
 from ScoutSuite.core.console import print_exception
 from ScoutSuite.providers.aws.facade.utils import AWSFacadeUtils
 from ScoutSuite.providers.aws.facade.basefacade import AWSBaseFacade
-from ScoutSuite.providers.utils import run_concurrently
 
 
 class ConfigFacade(AWSBaseFacade):
+    service = 'config'
 
     async def get_rules(self, region):
         try:
@@ -17,14 +17,16 @@ class ConfigFacade(AWSBaseFacade):
         client = AWSFacadeUtils.get_client('config', self.session, region)
 
         try:
-            recorders = (await run_concurrently(client.describe_configuration_recorders))['ConfigurationRecorders']
+            recorders = (await self._run_concurrently(client.describe_configuration_recorders,
+                                                      region))['ConfigurationRecorders']
         except Exception as e:
             print_exception(f'Failed to get Config recorders: {e}')
             recorders = []
 
         try:
             recorder_statuses_list = \
-                (await run_concurrently(client.describe_configuration_recorder_status))['ConfigurationRecordersStatus']
+                (await self._run_concurrently(client.describe_configuration_recorder_status,
+                                              region))['ConfigurationRecordersStatus']
         except Exception as e:
             print_exception(f'Failed to get Config recorder statuses: {e}')
         else:
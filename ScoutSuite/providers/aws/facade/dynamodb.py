@@ -1,10 +1,12 @@
 from ScoutSuite.core.console import print_exception, print_warning
 from ScoutSuite.providers.aws.facade.base import AWSBaseFacade
 from ScoutSuite.providers.aws.facade.utils import AWSFacadeUtils
-from ScoutSuite.providers.utils import run_concurrently, get_and_set_concurrently, map_concurrently
+from ScoutSuite.providers.utils import get_and_set_concurrently, map_concurrently
 
 
 class DynamoDBFacade(AWSBaseFacade):
+    service = 'dynamodb'
+
     _GET_TABLES_BATCH_SIZE = 100
 
     async def get_tables(self, region):
@@ -20,7 +22,7 @@ class DynamoDBFacade(AWSBaseFacade):
         client = AWSFacadeUtils.get_client('dynamodb', self.session, region)
 
         try:
-            table = await run_concurrently(lambda: client.describe_table(TableName=table_name)['Table'])
+            table = await self._run_concurrently(lambda: client.describe_table(TableName=table_name)['Table'], region)
         except Exception as e:
             if 'ResourceNotFoundException' in str(e):
                 print_warning('Failed to get DynamoDB table: {}'.format(e))
@@ -38,7 +40,7 @@ class DynamoDBFacade(AWSBaseFacade):
         client = AWSFacadeUtils.get_client('dynamodb', self.session, region)
 
         try:
-            summaries = await run_concurrently(lambda: client.list_backups(TableName=table['TableName']))
+            summaries = await self._run_concurrently(lambda: client.list_backups(TableName=table['TableName']), region)
             table['BackupSummaries'] = summaries.get('BackupSummaries')
         except Exception as e:
             if 'ResourceNotFoundException' in str(e):
@@ -50,8 +52,8 @@ class DynamoDBFacade(AWSBaseFacade):
         client = AWSFacadeUtils.get_client('dynamodb', self.session, region)
 
         try:
-            description = await run_concurrently(
-                lambda: client.describe_continuous_backups(TableName=table['TableName']))
+            description = await self._run_concurrently(
+                lambda: client.describe_continuous_backups(TableName=table['TableName']), region)
             table['ContinuousBackups'] = description.get('ContinuousBackupsDescription')
         except Exception as e:
             if 'ResourceNotFoundException' in str(e):
@@ -63,8 +65,8 @@ class DynamoDBFacade(AWSBaseFacade):
         client = AWSFacadeUtils.get_client('dynamodb', self.session, region)
 
         try:
-            tags = await run_concurrently(
-                lambda: client.list_tags_of_resource(ResourceArn=table['TableArn']))
+            tags = await self._run_concurrently(
+                lambda: client.list_tags_of_resource(ResourceArn=table['TableArn']), region)
             table['tags'] = tags.get('Tags')
         except Exception as e:
             if 'ResourceNotFoundException' in str(e):
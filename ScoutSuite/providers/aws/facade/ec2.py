@@ -11,19 +11,23 @@ from ScoutSuite.providers.utils import run_concurrently
 
 
 class EC2Facade(AWSBaseFacade):
+    service = 'ec2'
+
     regional_flow_logs_cache_locks = {}
     flow_logs_cache = {}
 
     def __init__(self, session: boto3.session.Session, owner_id: str):
         self.owner_id = owner_id
+        # Fetches of the resources of all the VPCs of a region, by (region, resource type)
+        self._vpc_resources_tasks = {}
 
         super().__init__(session)
 
     async def get_instance_user_data(self, region: str, instance_id: str):
         ec2_client = AWSFacadeUtils.get_client('ec2', self.session, region)
         try:
-            user_data_response = await run_concurrently(
-                lambda: ec2_client.describe_instance_attribute(Attribute='userData', InstanceId=instance_id))
+            user_data_response = await self._run_concurrently(
+                lambda: ec2_client.describe_instance_attribute(Attribute='userData', InstanceId=instance_id), region)
         except Exception as e:
             print_exception(
                 f'Failed to describe EC2 instance attributes: {e}')
@@ -57,29 +61,31 @@ class EC2Facade(AWSBaseFacade):
                 return value.decode('latin-1')
 
     async def get_instances(self, region: str, vpc: str):
-        filters = [{'Name': 'vpc-id', 'Values': [vpc]}]
         try:
-            reservations = \
-                await AWSFacadeUtils.get_all_pages(
-                    'ec2', region, self.session, 'describe_instances', 'Reservations', Filters=filters)
-
-            instances = []
-            for reservation in reservations:
-                for instance in reservation['Instances']:
-                    instance['ReservationId'] = reservation['ReservationId']
-                    instance['OwnerId'] = reservation['OwnerId']
-                    instances.append(instance)
-
-            return instances
+            return await self.get_vpc_resources(region, vpc, 'instances', self._get_all_instances)
         except Exception as e:
             print_exception(f'Failed to describe EC2 instances: {e}')
             return []
 
+    async def _get_all_instances(self, region: str):
+        reservations = \
+            await AWSFacadeUtils.get_all_pages('ec2', region, self.session, 'describe_instances', 'Reservations')
+
+        instances = []
+        for reservation in reservations:
+            for instance in reservation['Instances']:
+                instance['ReservationId'] = reservation['ReservationId']
+                instance['OwnerId'] = reservation['OwnerId']
+                instances.append(instance)
+
+        return instances
+
     async def get_security_groups(self, region: str, vpc: str):
-        filters = [{'Name': 'vpc-id', 'Values': [vpc]}]
         try:
-            return await AWSFacadeUtils.get_all_pages(
-                'ec2', region, self.session, 'describe_security_groups', 'SecurityGroups', Filters=filters)
+            return await self.get_vpc_resources(
+                region, vpc, 'security_groups',
+                lambda region: AWSFacadeUtils.get_all_pages(
+                    'ec2', region, self.session, 'describe_security_groups', 'SecurityGroups'))
         except Exception as e:
             print_exception(f'Failed to describe EC2 security groups: {e}')
             return []
@@ -87,7 +93,7 @@ class EC2Facade(AWSBaseFacade):
     async def get_vpcs(self, region: str):
         ec2_client = AWSFacadeUtils.get_client('ec2', self.session, region)
         try:
-            return await run_concurrently(lambda: ec2_client.describe_vpcs()['Vpcs'])
+            return await self._run_concurrently(lambda: ec2_client.describe_vpcs()['Vpcs'], region)
         except Exception as e:
             print_exception(f'Failed to describe EC2 VPC: {e}')
             return []
@@ -96,16 +102,17 @@ class EC2Facade(AWSBaseFacade):
         filters = [{'Name': 'owner-id', 'Values': [self.owner_id]}]
         client = AWSFacadeUtils.get_client('ec2', self.session, region)
         try:
-            return await run_concurrently(lambda: client.describe_images(Filters=filters)['Images'])
+            return await self._run_concurrently(lambda: client.describe_images(Filters=filters)['Images'], region)
         except Exception as e:
             print_exception(f'Failed to get EC2 images: {e}')
             return []
 
     async def get_network_interfaces(self, region: str, vpc: str):
-        filters = [{'Name': 'vpc-id', 'Values': [vpc]}]
         try:
-            return await AWSFacadeUtils.get_all_pages(
-                'ec2', region, self.session, 'describe_network_interfaces', 'NetworkInterfaces', Filters=filters)
+            return await self.get_vpc_resources(
+                region, vpc, 'network_interfaces',
+                lambda region: AWSFacadeUtils.get_all_pages(
+                    'ec2', region, self.session, 'describe_network_interfaces', 'NetworkInterfaces'))
         except Exception as e:
             print_exception(f'Failed to get EC2 network interfaces: {e}')
             return []
@@ -124,8 +131,8 @@ class EC2Facade(AWSBaseFacade):
         if 'KmsKeyId' in volume:
             key_id = volume['KmsKeyId']
             try:
-                volume['KeyManager'] = await run_concurrently(
-                    lambda: kms_client.describe_key(KeyId=key_id)['KeyMetadata']['KeyManager'])
+                volume['KeyManager'] = await self._run_concurrently(
+                    lambda: kms_client.describe_key(KeyId=key_id)['KeyMetadata']['KeyManager'], region, service='kms')
             except Exception as e:
                 if 'NotFoundException' in e:
                     print_warning(f'Failed to describe KMS key: {e}')
@@ -136,25 +143,27 @@ class EC2Facade(AWSBaseFacade):
             volume['KeyManager'] = None
 
     async def get_snapshots(self, region: str):
+        """
+        Yields the snapshots page by page, each page being enriched with the snapshots' attributes as soon as it is
+        fetched
+        """
         filters = [{'Name': 'owner-id', 'Values': [self.owner_id]}]
 
         try:
-            snapshots = await AWSFacadeUtils.get_all_pages(
-                'ec2', region, self.session, 'describe_snapshots', 'Snapshots', Filters=filters)
+            async for snapshots in AWSFacadeUtils.get_pages(
+                    'ec2', region, self.session, 'describe_snapshots', 'Snapshots', Filters=filters):
+                await get_and_set_concurrently([self._get_and_set_snapshot_attributes], snapshots, region=region)
+                yield snapshots
         except Exception as e:
             print_exception(f'Failed to get snapshots: {e}')
-            snapshots = []
-        else:
-            await get_and_set_concurrently([self._get_and_set_snapshot_attributes], snapshots, region=region)
-        finally:
-            return snapshots
 
     async def _get_and_set_snapshot_attributes(self, snapshot: {}, region: str):
         ec2_client = AWSFacadeUtils.get_client('ec2', self.session, region)
         try:
-            snapshot['CreateVolumePermissions'] = await run_concurrently(lambda: ec2_client.describe_snapshot_attribute(
-                Attribute='createVolumePermission',
-                SnapshotId=snapshot['SnapshotId'])['CreateVolumePermissions'])
+            snapshot['CreateVolumePermissions'] = await self._run_concurrently(
+                lambda: ec2_client.describe_snapshot_attribute(
+                    Attribute='createVolumePermission', SnapshotId=snapshot['SnapshotId'])['CreateVolumePermissions'],
+                region)
         except Exception as e:
             if 'NotFound' in e:
                 print_warning(f'Failed to describe EC2 snapshot attributes: {e}')
@@ -162,10 +171,11 @@ class EC2Facade(AWSBaseFacade):
                 print_exception(f'Failed to describe EC2 snapshot attributes: {e}')
 
     async def get_network_acls(self, region: str, vpc: str):
-        filters = [{'Name': 'vpc-id', 'Values': [vpc]}]
         try:
-            return await AWSFacadeUtils.get_all_pages(
-                'ec2', region, self.session, 'describe_network_acls', 'NetworkAcls', Filters=filters)
+            return await self.get_vpc_resources(
+                region, vpc, 'network_acls',
+                lambda region: AWSFacadeUtils.get_all_pages(
+                    'ec2', region, self.session, 'describe_network_acls', 'NetworkAcls'))
         except Exception as e:
             print_exception(f'Failed to get EC2 network ACLs: {e}')
             return []
@@ -186,11 +196,44 @@ class EC2Facade(AWSBaseFacade):
             self.flow_logs_cache[region] = \
                 await AWSFacadeUtils.get_all_pages('ec2', region, self.session, 'describe_flow_logs', 'FlowLogs')
 
+    async def get_vpc_resources(self, region: str, vpc: str, resource_type: str, fetch):
+        """
+        Get the resources of a VPC, out of all the resources of that type in the region, which are fetched once and
+        partitioned by VPC rather than with a filtered call per VPC
+
+        :param region: Region of the VPC
+        :param vpc: ID of the VPC
+        :param resource_type: Type of the resources, used as cache key
+        :param fetch: Coroutine function fetching all the resources of that type in a region
+
+        :return: The resources of the VPC
+        """
+        key = (region, resource_type)
+        if key not in self._vpc_resources_tasks:
+            self._vpc_resources_tasks[key] = asyncio.ensure_future(self._fetch_vpc_resources(region, fetch))
+        task = self._vpc_resources_tasks[key]
+        try:
+            # The fetch is shared with the other VPCs of the region, it isn't cancelled along with one of them
+            resources = await asyncio.shield(task)
+        except Exception:
+            # Failures aren't cached, the next calls fetch the resources again
+            if self._vpc_resources_tasks.get(key) is task:
+                del self._vpc_resources_tasks[key]
+            raise
+        return resources.get(vpc, [])
+
+    @staticmethod
+    async def _fetch_vpc_resources(region: str, fetch):
+        vpc_resources = {}
+        for resource in await fetch(region):
+            vpc_resources.setdefault(resource.get('VpcId'), []).append(resource)
+        return vpc_resources
+
     async def get_subnets(self, region: str, vpc: str):
-        ec2_client = AWSFacadeUtils.get_client('ec2', self.session, region)
-        filters = [{'Name': 'vpc-id', 'Values': [vpc]}]
         try:
-            subnets = await run_concurrently(lambda: ec2_client.describe_subnets(Filters=filters)['Subnets'])
+            subnets = await self.get_vpc_resources(
+                region, vpc, 'subnets',
+                lambda region: AWSFacadeUtils.get_all_pages('ec2', region, self.session, 'describe_subnets', 'Subnets'))
         except Exception as e:
             print_exception(f'Failed to describe EC2 subnets: {e}')
             return None
@@ -223,7 +266,8 @@ class EC2Facade(AWSBaseFacade):
     async def get_ebs_encryption(self, region):
         ec2_client = AWSFacadeUtils.get_client('ec2', self.session, region)
         try:
-            encryption_settings = await run_concurrently(lambda: ec2_client.get_ebs_encryption_by_default())
+            encryption_settings = await self._run_concurrently(lambda: ec2_client.get_ebs_encryption_by_default(),
+                                                               region)
             return encryption_settings
         except Exception as e:
             print_exception(f'Failed to retrieve EBS encryption settings: {e}')
@@ -231,7 +275,7 @@ class EC2Facade(AWSBaseFacade):
     async def get_ebs_default_encryption_key(self, region):
         ec2_client = AWSFacadeUtils.get_client('ec2', self.session, region)
         try:
-            encryption_key = await run_concurrently(lambda: ec2_client.get_ebs_default_kms_key_id())
+            encryption_key = await self._run_concurrently(lambda: ec2_client.get_ebs_default_kms_key_id(), region)
             return encryption_key
         except Exception as e:
             print_exception(f'Failed to retrieve EBS encryption key ID: {e}')
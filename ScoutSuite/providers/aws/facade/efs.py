@@ -1,10 +1,12 @@
 from ScoutSuite.core.console import print_exception
 from ScoutSuite.providers.aws.facade.basefacade import AWSBaseFacade
 from ScoutSuite.providers.aws.facade.utils import AWSFacadeUtils
-from ScoutSuite.providers.utils import run_concurrently, get_and_set_concurrently
+from ScoutSuite.providers.utils import get_and_set_concurrently
 
 
 class EFSFacade(AWSBaseFacade):
+    service = 'efs'
+
     async def get_file_systems(self, region: str):
 
         try:
@@ -22,8 +24,8 @@ class EFSFacade(AWSBaseFacade):
     async def _get_and_set_tags(self, file_system: {}, region: str):
         client = AWSFacadeUtils.get_client('efs', self.session, region)
         try:
-            file_system['Tags'] = await run_concurrently(
-                lambda: client.describe_tags(FileSystemId=file_system['FileSystemId'])['Tags'])
+            file_system['Tags'] = await self._run_concurrently(
+                lambda: client.describe_tags(FileSystemId=file_system['FileSystemId'])['Tags'], region)
         except Exception as e:
             print_exception(f'Failed to describe EFS tags: {e}')
 
@@ -51,7 +53,7 @@ class EFSFacade(AWSBaseFacade):
         client = AWSFacadeUtils.get_client('efs', self.session, region)
         try:
             mount_target['SecurityGroups'] = \
-                await run_concurrently(lambda: client.describe_mount_target_security_groups(
-                    MountTargetId=mount_target['MountTargetId'])['SecurityGroups'])
+                await self._run_concurrently(lambda: client.describe_mount_target_security_groups(
+                    MountTargetId=mount_target['MountTargetId'])['SecurityGroups'], region)
         except Exception as e:
             print_exception(f'Failed to describe EFS mount target security groups: {e}')
@@ -4,11 +4,13 @@ from ScoutSuite.core.console import print_exception
 from ScoutSuite.providers.aws.facade.basefacade import AWSBaseFacade
 from ScoutSuite.providers.aws.facade.utils import AWSFacadeUtils
 from ScoutSuite.providers.aws.utils import ec2_classic
-from ScoutSuite.providers.utils import run_concurrently, get_and_set_concurrently, map_concurrently
+from ScoutSuite.providers.utils import get_and_set_concurrently, map_concurrently
 from ScoutSuite.providers.utils import get_non_provider_id
 
 
 class ELBFacade(AWSBaseFacade):
+    service = 'elb'
+
     regional_load_balancers_cache_locks = {}
     load_balancers_cache = {}
     policies_cache = set()
@@ -43,9 +45,10 @@ class ELBFacade(AWSBaseFacade):
     async def _get_and_set_load_balancer_attributes(self, load_balancer: {}, region: str):
         elb_client = AWSFacadeUtils.get_client('elb', self.session, region)
         try:
-            load_balancer['attributes'] = await run_concurrently(
+            load_balancer['attributes'] = await self._run_concurrently(
                 lambda: elb_client.describe_load_balancer_attributes(
-                    LoadBalancerName=load_balancer['LoadBalancerName'])['LoadBalancerAttributes']
+                    LoadBalancerName=load_balancer['LoadBalancerName'])['LoadBalancerAttributes'],
+                region
             )
         except Exception as e:
             print_exception(f'Failed to describe ELB load balancer attributes: {e}')
@@ -53,9 +56,10 @@ class ELBFacade(AWSBaseFacade):
     async def _get_and_set_load_balancer_tags(self, load_balancer: {}, region: str):
         elb_client = AWSFacadeUtils.get_client('elb', self.session, region)
         try:
-            load_balancer['Tags'] = await run_concurrently(
+            load_balancer['Tags'] = await self._run_concurrently(
                 lambda: elb_client.describe_tags(
-                    LoadBalancerNames=[load_balancer['LoadBalancerName']])['TagDescriptions'][0]['Tags']
+                    LoadBalancerNames=[load_balancer['LoadBalancerName']])['TagDescriptions'][0]['Tags'],
+                region
             )
         except Exception as e:
             print_exception(f'Failed to describe ELB load balancer tags: {e}')
@@ -85,9 +89,10 @@ class ELBFacade(AWSBaseFacade):
 
             elb_client = AWSFacadeUtils.get_client('elb', self.session, region)
             try:
-                return await run_concurrently(lambda: elb_client.describe_load_balancer_policies(
+                return await self._run_concurrently(lambda: elb_client.describe_load_balancer_policies(
                     LoadBalancerName=load_balancer['LoadBalancerName'],
-                    PolicyNames=load_balancer['policy_names'])['PolicyDescriptions']
+                    PolicyNames=load_balancer['policy_names'])['PolicyDescriptions'],
+                    region
                 )
             except Exception as e:
                 print_exception(f'Failed to retrieve load balancer policies: {e}')
@@ -4,10 +4,12 @@ from ScoutSuite.core.console import print_exception, print_warning
 from ScoutSuite.providers.aws.facade.basefacade import AWSBaseFacade
 from ScoutSuite.providers.aws.facade.utils import AWSFacadeUtils
 from ScoutSuite.providers.aws.utils import ec2_classic
-from ScoutSuite.providers.utils import run_concurrently, get_and_set_concurrently
+from ScoutSuite.providers.utils import get_and_set_concurrently
 
 
 class ELBv2Facade(AWSBaseFacade):
+    service = 'elbv2'
+
     regional_load_balancers_cache_locks = {}
     load_balancers_cache = {}
 
@@ -41,9 +43,10 @@ class ELBv2Facade(AWSBaseFacade):
     async def _get_and_set_load_balancer_attributes(self, load_balancer: dict, region: str):
         elbv2_client = AWSFacadeUtils.get_client('elbv2', self.session, region)
         try:
-            load_balancer['attributes'] = await run_concurrently(
+            load_balancer['attributes'] = await self._run_concurrently(
                 lambda: elbv2_client.describe_load_balancer_attributes(
-                    LoadBalancerArn=load_balancer['LoadBalancerArn'])['Attributes']
+                    LoadBalancerArn=load_balancer['LoadBalancerArn'])['Attributes'],
+                region
             )
         except Exception as e:
             print_exception(f'Failed to describe ELBv2 attributes: {e}')
@@ -51,9 +54,10 @@ class ELBv2Facade(AWSBaseFacade):
     async def _get_and_set_load_balancer_tags(self, load_balancer: dict, region: str):
         elbv2_client = AWSFacadeUtils.get_client('elbv2', self.session, region)
         try:
-            load_balancer['Tags'] = await run_concurrently(
+            load_balancer['Tags'] = await self._run_concurrently(
                 lambda: elbv2_client.describe_tags(
-                    ResourceArns=[load_balancer['LoadBalancerArn']])['TagDescriptions'][0]['Tags']
+                    ResourceArns=[load_balancer['LoadBalancerArn']])['TagDescriptions'][0]['Tags'],
+                region
             )
         except Exception as e:
             if 'LoadBalancerNotFound' in e:
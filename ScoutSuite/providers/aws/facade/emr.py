@@ -1,10 +1,12 @@
 from ScoutSuite.core.console import print_exception
 from ScoutSuite.providers.aws.facade.basefacade import AWSBaseFacade
 from ScoutSuite.providers.aws.facade.utils import AWSFacadeUtils
-from ScoutSuite.providers.utils import map_concurrently, run_concurrently
+from ScoutSuite.providers.utils import map_concurrently
 
 
 class EMRFacade(AWSBaseFacade):
+    service = 'emr'
+
     async def get_clusters(self, region):
 
         try:
@@ -19,7 +21,8 @@ class EMRFacade(AWSBaseFacade):
     async def _get_cluster(self, cluster_id: str, region: str):
         client = AWSFacadeUtils.get_client('emr', self.session, region)
         try:
-            return await run_concurrently(lambda: client.describe_cluster(ClusterId=cluster_id)['Cluster'])
+            return await self._run_concurrently(lambda: client.describe_cluster(ClusterId=cluster_id)['Cluster'],
+                                                region)
         except Exception as e:
             print_exception(f'Failed to describe EMR cluster: {e}')
             raise
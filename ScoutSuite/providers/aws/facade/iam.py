@@ -1,15 +1,25 @@
 import asyncio
 import functools
 
+import boto3
 from botocore.exceptions import ClientError
 
 from ScoutSuite.core.console import print_exception, print_warning
 from ScoutSuite.providers.aws.facade.basefacade import AWSBaseFacade
 from ScoutSuite.providers.aws.facade.utils import AWSFacadeUtils
-from ScoutSuite.providers.utils import get_non_provider_id, run_concurrently, get_and_set_concurrently
+from ScoutSuite.providers.utils import get_non_provider_id, get_and_set_concurrently
 
 
 class IAMFacade(AWSBaseFacade):
+    service = 'iam'
+
+    def __init__(self, session: boto3.session.Session = None, bulk_fetch: bool = False):
+        self.bulk_fetch = bulk_fetch
+        self._authorization_details = None
+        self._authorization_details_lock = None
+
+        super().__init__(session)
+
     async def get_credential_reports(self):
         client = AWSFacadeUtils.get_client('iam', self.session)
         # When no credential report exists, we first need to initiate the creation of a new report by calling
@@ -17,7 +27,7 @@ class IAMFacade(AWSBaseFacade):
         report_generated, n_attempts = False, 3
         try:
             while not report_generated and n_attempts > 0:
-                response = await run_concurrently(client.generate_credential_report)
+                response = await self._run_concurrently(client.generate_credential_report)
                 if response['State'] == 'COMPLETE':
                     report_generated = True
                 else:
@@ -32,7 +42,7 @@ class IAMFacade(AWSBaseFacade):
                 return []
 
         try:
-            report = await run_concurrently(lambda: client.get_credential_report()['Content'])
+            report = await self._run_concurrently(lambda: client.get_credential_report()['Content'])
 
             # The report is a CSV string. The first row contains the name of each column. The next rows
             # each represent an individual account. This algorithm provides a simple initial parsing.
@@ -56,24 +66,107 @@ class IAMFacade(AWSBaseFacade):
                 print_exception(f'Failed to download credential report: {e}')
             return []
 
+    async def get_authorization_details(self):
+        """
+        Fetches the users, groups, roles and managed policies of the account, with their inline policies, managed policy
+        documents and attachments, in a few get_account_authorization_details pages shared by all the IAM resources
+
+        :return: The details indexed by entity type and ID, or None when not in bulk mode or if they can't be fetched
+        """
+        if not self.bulk_fetch:
+            return None
+
+        if self._authorization_details_lock is None:
+            self._authorization_details_lock = asyncio.Lock()
+        async with self._authorization_details_lock:
+            if self._authorization_details is None:
+                try:
+                    details = await AWSFacadeUtils.get_multiple_entities_from_all_pages(
+                        'iam', None, self.session, 'get_account_authorization_details',
+                        ['UserDetailList', 'GroupDetailList', 'RoleDetailList', 'Policies'])
+                except Exception as e:
+                    print_exception(f'Failed to get account authorization details: {e}')
+                    details = None
+                if not details:
+                    print_warning('Falling back to fetching IAM resources one by one')
+                    self.bulk_fetch = False
+                    return None
+
+                self._authorization_details = {
+                    'users': {user['UserId']: user for user in details['UserDetailList']},
+                    'groups': details['GroupDetailList'],
+                    'roles': {role['RoleId']: role for role in details['RoleDetailList']},
+                    'policies': details['Policies']
+                }
+        return self._authorization_details
+
     async def get_groups(self):
+        details = await self.get_authorization_details()
+        if details:
+            return self._get_groups_from_authorization_details(details)
+
         groups = await AWSFacadeUtils.get_all_pages('iam', None, self.session, 'list_groups', 'Groups')
         await get_and_set_concurrently(
             [self._get_and_set_group_users,
              functools.partial(self._get_and_set_inline_policies, iam_resource_type='group')], groups)
         return groups
 
+    def _get_groups_from_authorization_details(self, details):
+        group_users = {}
+        for user in details['users'].values():
+            for group_name in user['GroupList']:
+                group_users.setdefault(group_name, []).append(user['UserId'])
+
+        groups = []
+        for detail in details['groups']:
+            group = {key: detail[key] for key in ['Path', 'GroupName', 'GroupId', 'Arn', 'CreateDate']}
+            group['Users'] = group_users.get(group['GroupName'], [])
+            self._set_inline_policies(group, detail['GroupPolicyList'])
+            groups.append(group)
+        return groups
+
     async def get_policies(self):
-        policies = await AWSFacadeUtils.get_all_pages(
-            'iam', None, self.session, 'list_policies', 'Policies', OnlyAttached=True)
-        await get_and_set_concurrently([self._get_and_set_policy_details], policies)
+        """
+        Yields the attached policies page by page, each page being enriched as soon as it is fetched
+        """
+        details = await self.get_authorization_details()
+        if details:
+            yield self._get_policies_from_authorization_details(details)
+            return
+
+        async for policies in AWSFacadeUtils.get_pages(
+                'iam', None, self.session, 'list_policies', 'Policies', OnlyAttached=True):
+            await get_and_set_concurrently([self._get_and_set_policy_details], policies)
+            yield policies
+
+    def _get_policies_from_authorization_details(self, details):
+        attachments = {}
+        for entity_type, name_field, id_field, entities in [
+                ('groups', 'GroupName', 'GroupId', details['groups']),
+                ('roles', 'RoleName', 'RoleId', details['roles'].values()),
+                ('users', 'UserName', 'UserId', details['users'].values())]:
+            for entity in entities:
+                for attached_policy in entity['AttachedManagedPolicies']:
+                    attachments.setdefault(attached_policy['PolicyArn'], {}).setdefault(entity_type, []).append(
+                        {'name': entity[name_field], 'id': entity[id_field]})
+
+        policies = []
+        for detail in details['policies']:
+            # Only keep attached policies, as list_policies(OnlyAttached=True) does
+            if not detail['AttachmentCount']:
+                continue
+            policy = {key: value for key, value in detail.items() if key not in ['Description', 'PolicyVersionList']}
+            policy['PolicyDocument'] = next(version['Document'] for version in detail['PolicyVersionList']
+                                            if version['IsDefaultVersion'])
+            policy['attached_to'] = attachments.get(policy['Arn'], {})
+            policies.append(policy)
         return policies
 
     async def _get_and_set_policy_details(self, policy):
-        client = AWSFacadeUtils.get_client('iam', self.session)
         try:
-            policy_version = await run_concurrently(
-                lambda: client.get_policy_version(PolicyArn=policy['Arn'], VersionId=policy['DefaultVersionId']))
+            policy_version = await AWSFacadeUtils.get_cached_response(
+                'iam', None, self.session, 'get_policy_version', PolicyArn=policy['Arn'],
+                VersionId=policy['DefaultVersionId'])
             policy['PolicyDocument'] = policy_version['PolicyVersion']['Document']
         except Exception as e:
             print_exception(f'Failed to get policy version: {e}')
@@ -98,21 +191,36 @@ class IAMFacade(AWSBaseFacade):
                         {'name': resource_name, 'id': resource_id})
 
     async def get_users(self):
-        users = await AWSFacadeUtils.get_all_pages('iam', None, self.session, 'list_users', 'Users')
-        await get_and_set_concurrently(
-            [functools.partial(self._get_and_set_inline_policies, iam_resource_type='user'),
-             self._get_and_set_user_groups,
-             self._get_and_set_user_tags,
-             self._get_and_set_user_login_profile,
-             self._get_and_set_user_access_keys,
-             self._get_and_set_user_mfa_devices],
-            users)
-        return users
+        """
+        Yields the users page by page, each page being enriched as soon as it is fetched
+        """
+        details = await self.get_authorization_details()
+        async for users in AWSFacadeUtils.get_pages('iam', None, self.session, 'list_users', 'Users'):
+            # Users created after the authorization details were fetched are enriched one by one
+            missing_users = [user for user in users if not details or user['UserId'] not in details['users']]
+            for user in users:
+                if details and user['UserId'] in details['users']:
+                    detail = details['users'][user['UserId']]
+                    self._set_inline_policies(user, detail['UserPolicyList'])
+                    user['groups'] = detail['GroupList']
+                    user['tags'] = {'Tags': detail.get('Tags', []), 'IsTruncated': False}
+            await get_and_set_concurrently(
+                [functools.partial(self._get_and_set_inline_policies, iam_resource_type='user'),
+                 self._get_and_set_user_groups,
+                 self._get_and_set_user_tags],
+                missing_users)
+            # The login profile, access keys and MFA devices aren't part of the authorization details
+            await get_and_set_concurrently(
+                [self._get_and_set_user_login_profile,
+                 self._get_and_set_user_access_keys,
+                 self._get_and_set_user_mfa_devices],
+                users)
+            yield users
 
     async def _get_and_set_user_login_profile(self, user: {}):
         client = AWSFacadeUtils.get_client('iam', self.session)
         try:
-            user['LoginProfile'] = await run_concurrently(
+            user['LoginProfile'] = await self._run_concurrently(
                 lambda: client.get_login_profile(UserName=user['UserName'])['LoginProfile'])
         except ClientError as e:
             if e.response["Error"]["Code"] == "NoSuchEntity":
@@ -130,31 +238,44 @@ class IAMFacade(AWSBaseFacade):
 
     async def _get_and_set_user_tags(self, user: {}):
         client = AWSFacadeUtils.get_client('iam', self.session)
-        user['tags'] = client.list_user_tags(UserName=user['UserName'])
+        user['tags'] = await self._run_concurrently(lambda: client.list_user_tags(UserName=user['UserName']))
 
     async def get_roles(self):
-        roles = await AWSFacadeUtils.get_all_pages('iam', None, self.session, 'list_roles', 'Roles')
-        for role in roles:
-            role['instances_count'] = 'N/A'
-            # Get trust relationship
-            role['assume_role_policy'] = {}
-            role['assume_role_policy']['PolicyDocument'] = role.pop(
-                'AssumeRolePolicyDocument')
-        await get_and_set_concurrently(
-            [functools.partial(self._get_and_set_inline_policies, iam_resource_type='role'),
-             self._get_and_set_role_profiles,
-             self._get_and_set_role_tags], roles)
-
-        return roles
+        """
+        Yields the roles page by page, each page being enriched as soon as it is fetched
+        """
+        details = await self.get_authorization_details()
+        async for roles in AWSFacadeUtils.get_pages('iam', None, self.session, 'list_roles', 'Roles'):
+            for role in roles:
+                role['instances_count'] = 'N/A'
+                # Get trust relationship
+                role['assume_role_policy'] = {}
+                role['assume_role_policy']['PolicyDocument'] = role.pop(
+                    'AssumeRolePolicyDocument')
+                if details and role['RoleId'] in details['roles']:
+                    detail = details['roles'][role['RoleId']]
+                    self._set_inline_policies(role, detail['RolePolicyList'])
+                    self._set_role_profiles(role, detail['InstanceProfileList'])
+                    role['tags'] = {'Tags': detail.get('Tags', []), 'IsTruncated': False}
+            # Roles created after the authorization details were fetched are enriched one by one
+            await get_and_set_concurrently(
+                [functools.partial(self._get_and_set_inline_policies, iam_resource_type='role'),
+                 self._get_and_set_role_profiles,
+                 self._get_and_set_role_tags],
+                [role for role in roles if not details or role['RoleId'] not in details['roles']])
+            yield roles
 
     async def _get_and_set_role_tags(self, role: {}):
         client = AWSFacadeUtils.get_client('iam', self.session)
-        role['tags'] = client.list_role_tags(RoleName=role['RoleName'])
+        role['tags'] = await self._run_concurrently(lambda: client.list_role_tags(RoleName=role['RoleName']))
 
     async def _get_and_set_role_profiles(self, role: {}):
         profiles = await AWSFacadeUtils.get_all_pages(
             'iam', None, self.session, 'list_instance_profiles_for_role', 'InstanceProfiles',
             RoleName=role['RoleName'])
+        self._set_role_profiles(role, profiles)
+
+    def _set_role_profiles(self, role: {}, profiles: list):
         role.setdefault('instance_profiles', {})
         for profile in profiles:
             profile_id = profile['InstanceProfileId']
@@ -167,7 +288,7 @@ class IAMFacade(AWSBaseFacade):
     async def get_password_policy(self):
         client = AWSFacadeUtils.get_client('iam', self.session)
         try:
-            return (await run_concurrently(client.get_account_password_policy))['PasswordPolicy']
+            return (await self._run_concurrently(client.get_account_password_policy))['PasswordPolicy']
         except ClientError as e:
             if e.response['Error']['Code'] != 'NoSuchEntity':
                 print_exception(f'Failed to get account password policy: {e}')
@@ -176,7 +297,7 @@ class IAMFacade(AWSBaseFacade):
     async def _get_and_set_user_access_keys(self, user: {}):
         client = AWSFacadeUtils.get_client('iam', self.session)
         try:
-            user['AccessKeys'] = await run_concurrently(
+            user['AccessKeys'] = await self._run_concurrently(
                 lambda: client.list_access_keys(UserName=user['UserName'])['AccessKeyMetadata'])
         except Exception as e:
             print_exception(f'Failed to list access keys: {e}')
@@ -187,7 +308,7 @@ class IAMFacade(AWSBaseFacade):
     async def get_user_mfa_devices(self, username: str):
         client = AWSFacadeUtils.get_client('iam', self.session)
         try:
-            return await run_concurrently(
+            return await self._run_concurrently(
                 lambda: client.list_mfa_devices(UserName=username)['MFADevices'])
         except Exception as e:
             print_exception(f'Failed to list MFA devices for user: {e}')
@@ -195,7 +316,7 @@ class IAMFacade(AWSBaseFacade):
     async def get_virtual_mfa_devices(self):
         client = AWSFacadeUtils.get_client('iam', self.session)
         try:
-            return await run_concurrently(
+            return await self._run_concurrently(
                 lambda: client.list_virtual_mfa_devices().get('VirtualMFADevices', []))
         except Exception as e:
             print_exception(f'Failed to list virtual MFA devices: {e}')
@@ -204,7 +325,7 @@ class IAMFacade(AWSBaseFacade):
     async def _get_and_set_group_users(self, group: {}):
         client = AWSFacadeUtils.get_client('iam', self.session)
         try:
-            users = await run_concurrently(lambda: client.get_group(GroupName=group['GroupName'])['Users'])
+            users = await self._run_concurrently(lambda: client.get_group(GroupName=group['GroupName'])['Users'])
             group['Users'] = [user['UserId'] for user in users]
         except Exception as e:
             print_exception('Failed to get IAM group {}: {}'.format(group['GroupName'], e))
@@ -218,7 +339,7 @@ class IAMFacade(AWSBaseFacade):
         resource['inline_policies'] = {}
 
         try:
-            policy_names = await run_concurrently(lambda: list_policy_method(**args)['PolicyNames'])
+            policy_names = await self._run_concurrently(lambda: list_policy_method(**args)['PolicyNames'])
             if len(policy_names) == 0:
                 resource['inline_policies_count'] = 0
         except Exception as e:
@@ -228,8 +349,8 @@ class IAMFacade(AWSBaseFacade):
             try:
                 tasks = {
                     asyncio.ensure_future(
-                        run_concurrently(lambda policy_name=policy_name:
-                                         get_policy_method(**dict(args, PolicyName=policy_name)))
+                        self._run_concurrently(lambda policy_name=policy_name:
+                                               get_policy_method(**dict(args, PolicyName=policy_name)))
                     ) for policy_name in policy_names
                 }
             except Exception as e:
@@ -247,6 +368,16 @@ class IAMFacade(AWSBaseFacade):
                     resource['inline_policies'][policy_id]['name'] = policy_name
                 resource['inline_policies_count'] = len(resource['inline_policies'])
 
+    def _set_inline_policies(self, resource, policies: list):
+        resource['inline_policies'] = {}
+        for policy in policies:
+            policy_id = get_non_provider_id(policy['PolicyName'])
+            resource['inline_policies'][policy_id] = {}
+            resource['inline_policies'][policy_id]['PolicyDocument'] = self._normalize_statements(
+                policy['PolicyDocument'])
+            resource['inline_policies'][policy_id]['name'] = policy['PolicyName']
+        resource['inline_policies_count'] = len(resource['inline_policies'])
+
     def _normalize_statements(self, policy_document):
         if policy_document:
             if type(policy_document['Statement']) == list:
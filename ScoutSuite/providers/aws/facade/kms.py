@@ -1,12 +1,13 @@
 from ScoutSuite.core.console import print_exception
 from ScoutSuite.providers.aws.facade.basefacade import AWSBaseFacade
 from ScoutSuite.providers.aws.facade.utils import AWSFacadeUtils
-from ScoutSuite.providers.utils import run_concurrently, get_and_set_concurrently
+from ScoutSuite.providers.utils import get_and_set_concurrently
 import json
 
 
 
 class KMSFacade(AWSBaseFacade):
+    service = 'kms'
 
     async def get_keys(self, region: str):
 
@@ -26,9 +27,9 @@ class KMSFacade(AWSBaseFacade):
     async def _get_and_set_key_policy(self, key: {}, region: str):
         client = AWSFacadeUtils.get_client('kms', self.session, region)
         try:
-            response = await run_concurrently(
+            response = await self._run_concurrently(
                 lambda: client.get_key_policy(KeyId=key['KeyId'],
-                                              PolicyName='default'))
+                                                    PolicyName='default'), region)
             key['policy'] = json.loads(response.get('Policy'))
         except Exception as e:
             print_exception(f'Failed to get KMS key policy: {e}')
@@ -36,15 +37,16 @@ class KMSFacade(AWSBaseFacade):
     async def _get_and_set_key_metadata(self, key: {}, region: str):
         client = AWSFacadeUtils.get_client('kms', self.session, region)
         try:
-            key['metadata'] = await run_concurrently(lambda: client.describe_key(KeyId=key['KeyId']))
+            key['metadata'] = await self._run_concurrently(lambda: client.describe_key(KeyId=key['KeyId']), region)
         except Exception as e:
             print_exception(f'Failed to describe KMS key: {e}')
 
     async def _get_and_set_key_aliases(self, key: {}, region: str):
         client = AWSFacadeUtils.get_client('kms', self.session, region)
         try:
-            response = await run_concurrently(
-                lambda: client.list_aliases(KeyId=key['KeyId'])
+            response = await self._run_concurrently(
+                lambda: client.list_aliases(KeyId=key['KeyId']),
+                region
             )
             key['aliases'] = response.get('Aliases')
         except Exception as e:
@@ -61,7 +63,7 @@ class KMSFacade(AWSBaseFacade):
     async def get_key_rotation_status(self, region: str, key_id: str):
         client = AWSFacadeUtils.get_client('kms', self.session, region)
         try:
-            return await run_concurrently(
-                lambda: client.get_key_rotation_status(KeyId=key_id))
+            return await self._run_concurrently(
+                lambda: client.get_key_rotation_status(KeyId=key_id), region)
         except Exception as e:
             print_exception(f'Failed to get KMS key rotation: {e}')
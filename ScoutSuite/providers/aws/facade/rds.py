@@ -6,10 +6,12 @@ from ScoutSuite.providers.aws.facade.utils import AWSFacadeUtils
 from ScoutSuite.providers.aws.utils import get_aws_account_id
 from ScoutSuite.providers.aws.facade.basefacade import AWSBaseFacade
 from ScoutSuite.providers.aws.utils import ec2_classic
-from ScoutSuite.providers.utils import run_concurrently, get_and_set_concurrently
+from ScoutSuite.providers.utils import get_and_set_concurrently
 
 
 class RDSFacade(AWSBaseFacade):
+    service = 'rds'
+
     _regional_instances_cache_locks = {}
     _instances_cache = {}
     _regional_snapshots_cache_locks = {}
@@ -47,8 +49,8 @@ class RDSFacade(AWSBaseFacade):
         client = AWSFacadeUtils.get_client('rds', self.session, region)
         account_id = get_aws_account_id(self.session)
         try:
-            instance_tagset = await run_concurrently(lambda: client.list_tags_for_resource(
-                ResourceName=instance['DBInstanceArn']))
+            instance_tagset = await self._run_concurrently(lambda: client.list_tags_for_resource(
+                ResourceName=instance['DBInstanceArn']), region)
             instance['Tags'] = {x['Key']: x['Value'] for x in instance_tagset['TagList']}
         except ClientError as e:
             if e.response['Error']['Code'] != 'NoSuchTagSet':
@@ -65,8 +67,8 @@ class RDSFacade(AWSBaseFacade):
         if 'DBClusterIdentifier' in instance:
             cluster_id = instance['DBClusterIdentifier']
             try:
-                clusters = await run_concurrently(
-                    lambda: client.describe_db_clusters(DBClusterIdentifier=cluster_id))
+                clusters = await self._run_concurrently(
+                    lambda: client.describe_db_clusters(DBClusterIdentifier=cluster_id), region)
                 cluster = clusters['DBClusters'][0]
                 instance['MultiAZ'] = cluster['MultiAZ']
             except Exception as e:
@@ -110,9 +112,9 @@ class RDSFacade(AWSBaseFacade):
     async def _get_and_set_snapshot_attributes(self, snapshot: {}, region: str):
         client = AWSFacadeUtils.get_client('rds', self.session, region)
         try:
-            attributes = await run_concurrently(
+            attributes = await self._run_concurrently(
                 lambda: client.describe_db_snapshot_attributes(
-                    DBSnapshotIdentifier=snapshot['DBSnapshotIdentifier'])['DBSnapshotAttributesResult'])
+                    DBSnapshotIdentifier=snapshot['DBSnapshotIdentifier'])['DBSnapshotAttributesResult'], region)
             snapshot['Attributes'] =\
                 attributes['DBSnapshotAttributes'] if 'DBSnapshotAttributes' in attributes else {}
         except Exception as e:
@@ -125,9 +127,10 @@ class RDSFacade(AWSBaseFacade):
     async def _get_and_set_cluster_snapshot_attributes(self, snapshot: {}, region: str):
         client = AWSFacadeUtils.get_client('rds', self.session, region)
         try:
-            attributes = await run_concurrently(
+            attributes = await self._run_concurrently(
                 lambda: client.describe_db_cluster_snapshot_attributes(
-                    DBClusterSnapshotIdentifier=snapshot['DBClusterSnapshotIdentifier'])['DBClusterSnapshotAttributesResult'])
+                    DBClusterSnapshotIdentifier=snapshot['DBClusterSnapshotIdentifier'])['DBClusterSnapshotAttributesResult'],
+                region)
             snapshot['Attributes'] =\
                 attributes['DBClusterSnapshotAttributes'] if 'DBClusterSnapshotAttributes' in attributes else {}
         except Exception as e:
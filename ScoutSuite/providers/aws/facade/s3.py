@@ -5,10 +5,12 @@ from botocore.exceptions import ClientError
 from ScoutSuite.core.console import print_exception, print_debug, print_warning
 from ScoutSuite.providers.aws.facade.basefacade import AWSBaseFacade
 from ScoutSuite.providers.aws.facade.utils import AWSFacadeUtils
-from ScoutSuite.providers.utils import run_concurrently, get_and_set_concurrently
+from ScoutSuite.providers.utils import get_and_set_concurrently, run_function_concurrently
 
 
 class S3Facade(AWSBaseFacade):
+    service = 's3'
+
     async def get_buckets(self):
         try:
             # If there are regions specified, try for each of them until one works.
@@ -17,11 +19,12 @@ class S3Facade(AWSBaseFacade):
             # as per https://github.com/nccgroup/ScoutSuite/issues/727
             buckets = []
             exception = None
-            region_list = self.regions if self.regions else await run_concurrently(lambda: self.session.get_available_regions('s3'))
+            region_list = self.regions if self.regions else await run_function_concurrently(
+                lambda: self.session.get_available_regions('s3'))
             for region in region_list:
                 try:
                     client = AWSFacadeUtils.get_client('s3', self.session, region)
-                    buckets = await run_concurrently(lambda: client.list_buckets()['Buckets'])
+                    buckets = await self._run_concurrently(lambda: client.list_buckets()['Buckets'], region)
                 except Exception as e:
                     exception = e
                 else:
@@ -54,14 +57,14 @@ class S3Facade(AWSBaseFacade):
             for bucket in buckets:
                 self._set_s3_bucket_secure_transport(bucket)
             # Try to update CreationDate of all buckets with the correct values from 'us-east-1'
-            self._get_and_set_s3_bucket_creationdate(buckets)
+            await self._get_and_set_s3_bucket_creationdate(buckets)
 
             return buckets
 
     async def _get_and_set_s3_bucket_location(self, bucket: {}, region=None):
         client = AWSFacadeUtils.get_client('s3', self.session, region)
         try:
-            location = await run_concurrently(lambda: client.get_bucket_location(Bucket=bucket['Name']))
+            location = await self._run_concurrently(lambda: client.get_bucket_location(Bucket=bucket['Name']), region)
         except Exception as e:
             if 'NoSuchBucket' in str(e) or 'InvalidToken' in str(e):
                 print_warning('Failed to get bucket location for {}: {}'.format(bucket['Name'], e))
@@ -83,7 +86,8 @@ class S3Facade(AWSBaseFacade):
     async def _get_and_set_s3_bucket_logging(self, bucket: {}):
         client = AWSFacadeUtils.get_client('s3', self.session, bucket['region'], )
         try:
-            logging = await run_concurrently(lambda: client.get_bucket_logging(Bucket=bucket['Name']))
+            logging = await self._run_concurrently(lambda: client.get_bucket_logging(Bucket=bucket['Name']),
+                                                   bucket['region'])
         except Exception as e:
             if 'NoSuchBucket' in str(e) or 'InvalidToken' in str(e):
                 print_warning('Failed to get logging configuration for {}: {}'.format(bucket['Name'], e))
@@ -100,7 +104,8 @@ class S3Facade(AWSBaseFacade):
     async def _get_and_set_s3_bucket_versioning(self, bucket: {}):
         client = AWSFacadeUtils.get_client('s3', self.session, bucket['region'])
         try:
-            versioning = await run_concurrently(lambda: client.get_bucket_versioning(Bucket=bucket['Name']))
+            versioning = await self._run_concurrently(lambda: client.get_bucket_versioning(Bucket=bucket['Name']),
+                                                      bucket['region'])
             bucket['versioning_status_enabled'] = self._status_to_bool(versioning.get('Status'))
             bucket['version_mfa_delete_enabled'] = self._status_to_bool(versioning.get('MFADelete'))
         except Exception as e:
@@ -114,7 +119,8 @@ class S3Facade(AWSBaseFacade):
     async def _get_and_set_s3_bucket_webhosting(self, bucket: {}):
         client = AWSFacadeUtils.get_client('s3', self.session, bucket['region'])
         try:
-            result = await run_concurrently(lambda: client.get_bucket_website(Bucket=bucket['Name']))
+            result = await self._run_concurrently(lambda: client.get_bucket_website(Bucket=bucket['Name']),
+                                                  bucket['region'])
             bucket['web_hosting_enabled'] = 'IndexDocument' in result
         except Exception as e:
             if "NoSuchWebsiteConfiguration" in str(e):
@@ -129,7 +135,8 @@ class S3Facade(AWSBaseFacade):
         bucket_name = bucket['Name']
         client = AWSFacadeUtils.get_client('s3', self.session, bucket['region'])
         try:
-            config = await run_concurrently(lambda: client.get_bucket_encryption(Bucket=bucket['Name']))
+            config = await self._run_concurrently(lambda: client.get_bucket_encryption(Bucket=bucket['Name']),
+                                                  bucket['region'])
             bucket['default_encryption_enabled'] = True
             bucket['default_encryption_algorithm'] = config.get('ServerSideEncryptionConfiguration', {})\
                 .get('Rules', [{}])[0].get('ApplyServerSideEncryptionByDefault', {}).get('SSEAlgorithm')
@@ -163,9 +170,11 @@ class S3Facade(AWSBaseFacade):
         try:
             grantees = {}
             if key_name:
-                grants = await run_concurrently(lambda: client.get_object_acl(Bucket=bucket_name, Key=key_name))
+                grants = await self._run_concurrently(lambda: client.get_object_acl(Bucket=bucket_name, Key=key_name),
+                                                      bucket['region'])
             else:
-                grants = await run_concurrently(lambda: client.get_bucket_acl(Bucket=bucket_name))
+                grants = await self._run_concurrently(lambda: client.get_bucket_acl(Bucket=bucket_name),
+                                                      bucket['region'])
             for grant in grants['Grants']:
                 if 'ID' in grant['Grantee']:
                     grantee = grant['Grantee']['ID']
@@ -194,7 +203,8 @@ class S3Facade(AWSBaseFacade):
     async def _get_and_set_s3_bucket_policy(self, bucket: {}):
         client = AWSFacadeUtils.get_client('s3', self.session, bucket['region'])
         try:
-            bucket_policy = await run_concurrently(lambda: client.get_bucket_policy(Bucket=bucket['Name']))
+            bucket_policy = await self._run_concurrently(lambda: client.get_bucket_policy(Bucket=bucket['Name']),
+                                                         bucket['region'])
             bucket['policy'] = json.loads(bucket_policy['Policy'])
         except ClientError as e:
             if e.response['Error']['Code'] != 'NoSuchBucketPolicy':
@@ -212,7 +222,8 @@ class S3Facade(AWSBaseFacade):
     async def _get_and_set_s3_bucket_tags(self, bucket: {}):
         client = AWSFacadeUtils.get_client('s3', self.session, bucket['region'])
         try:
-            bucket_tagset = await run_concurrently(lambda: client.get_bucket_tagging(Bucket=bucket['Name']))
+            bucket_tagset = await self._run_concurrently(lambda: client.get_bucket_tagging(Bucket=bucket['Name']),
+                                                         bucket['region'])
             bucket['tags'] = {x['Key']: x['Value'] for x in bucket_tagset['TagSet']}
         except ClientError as e:
             if e.response['Error']['Code'] != 'NoSuchTagSet':
@@ -230,7 +241,8 @@ class S3Facade(AWSBaseFacade):
     async def _get_and_set_s3_bucket_block_public_access(self, bucket: {}):
         client = AWSFacadeUtils.get_client('s3', self.session, bucket['region'])
         try:
-            bucket_public_access_block_conf = await run_concurrently(lambda: client.get_public_access_block(Bucket=bucket['Name']))
+            bucket_public_access_block_conf = await self._run_concurrently(
+                lambda: client.get_public_access_block(Bucket=bucket['Name']), bucket['region'])
             bucket['public_access_block_configuration'] = bucket_public_access_block_conf['PublicAccessBlockConfiguration']
         except ClientError as e:
             # No such configuration found for the bucket, nothing to be done
@@ -241,14 +253,14 @@ class S3Facade(AWSBaseFacade):
             else:
                 print_exception('Failed to get the public access block configuration for {}: {}'.format(bucket['Name'], e))
 
-    def _get_and_set_s3_bucket_creationdate(self, buckets):
+    async def _get_and_set_s3_bucket_creationdate(self, buckets):
         # When using region other than 'us-east-1', the 'CreationDate' is the last modified time according to bucket's
         # last replication in the respective region
         # Source: https://github.com/aws/aws-cli/issues/3597#issuecomment-424167129
         # Fixes issue https://github.com/nccgroup/ScoutSuite/issues/858
-        client = AWSFacadeUtils.get_client('s3', self.session, 'us-east-1')
+        client = await AWSFacadeUtils.get_client_concurrently('s3', self.session, 'us-east-1')
         try:
-            buckets_useast1 = client.list_buckets()['Buckets']
+            buckets_useast1 = (await self._run_concurrently(client.list_buckets, 'us-east-1'))['Buckets']
             for bucket in buckets:
                 # Find the bucket with the same name and update 'CreationDate' from the 'us-east-1' region data,
                 # if doesn't exist keep the original value
@@ -292,13 +304,14 @@ class S3Facade(AWSBaseFacade):
                 print_exception('Failed to evaluate bucket policy for {}: {}'.format(bucket['Name'], e))
             bucket['secure_transport'] = None
 
-    def get_s3_public_access_block(self, account_id):
+    async def get_s3_public_access_block(self, account_id):
         # We need a region to generate the client
         # However, the settings are global, so they are not region-dependent
         region = 'us-east-1'
-        client = AWSFacadeUtils.get_client('s3control', self.session, region)
+        client = await AWSFacadeUtils.get_client_concurrently('s3control', self.session, region)
         try:
-            s3_public_access_block = client.get_public_access_block(AccountId=account_id)
+            s3_public_access_block = await self._run_concurrently(
+                lambda: client.get_public_access_block(AccountId=account_id), region, service='s3control')
             return s3_public_access_block['PublicAccessBlockConfiguration']
         except ClientError:
             # No public access block configuration at the S3 level, returning the default
@@ -3,10 +3,12 @@ import json
 from ScoutSuite.core.console import print_exception
 from ScoutSuite.providers.aws.facade.basefacade import AWSBaseFacade
 from ScoutSuite.providers.aws.facade.utils import AWSFacadeUtils
-from ScoutSuite.providers.utils import map_concurrently, run_concurrently, get_and_set_concurrently
+from ScoutSuite.providers.utils import map_concurrently, get_and_set_concurrently
 
 
 class SecretsManagerFacade(AWSBaseFacade):
+    service = 'secretsmanager'
+
     async def get_secrets(self, region):
         try:
             secrets_list = await AWSFacadeUtils.get_all_pages('secretsmanager', region, self.session,
@@ -30,7 +32,8 @@ class SecretsManagerFacade(AWSBaseFacade):
         client = AWSFacadeUtils.get_client('secretsmanager', self.session, region)
 
         try:
-            secret_description = await run_concurrently(lambda: client.describe_secret(SecretId=secret.get('ARN')))
+            secret_description = await self._run_concurrently(
+                lambda: client.describe_secret(SecretId=secret.get('ARN')), region)
         except Exception as e:
             print_exception('Failed to get Secrets Manager secret details: {}'.format(e))
             return secret
@@ -42,7 +45,8 @@ class SecretsManagerFacade(AWSBaseFacade):
         client = AWSFacadeUtils.get_client('secretsmanager', self.session, region)
 
         try:
-            policy = await run_concurrently(lambda: client.get_resource_policy(SecretId=secret.get('ARN')))
+            policy = await self._run_concurrently(lambda: client.get_resource_policy(SecretId=secret.get('ARN')),
+                                                  region)
             policy_json = policy.get('ResourcePolicy')
             if policy_json:
                 secret['policy'] = json.loads(policy_json)
@@ -6,6 +6,8 @@ from ScoutSuite.providers.utils import run_concurrently
 
 
 class SESFacade(AWSBaseFacade):
+    service = 'ses'
+
     async def get_identities(self, region: str):
         try:
             identity_names = await AWSFacadeUtils.get_all_pages(
@@ -19,9 +21,10 @@ class SESFacade(AWSBaseFacade):
     async def _get_identity_dkim_attributes(self, identity_name: str, region: str):
         ses_client = AWSFacadeUtils.get_client('ses', self.session, region)
         try:
-            dkim_attributes = await run_concurrently(
+            dkim_attributes = await self._run_concurrently(
                 lambda: ses_client.get_identity_dkim_attributes(Identities=[identity_name])['DkimAttributes'][
-                    identity_name]
+                    identity_name],
+                region
             )
         except Exception as e:
             print_exception(f'Failed to get SES DKIM attributes: {e}')
@@ -31,8 +34,9 @@ class SESFacade(AWSBaseFacade):
     async def get_identity_policies(self, region: str, identity_name: str):
         ses_client = AWSFacadeUtils.get_client('ses', self.session, region)
         try:
-            policy_names = await run_concurrently(
-                lambda: ses_client.list_identity_policies(Identity=identity_name)['PolicyNames']
+            policy_names = await self._run_concurrently(
+                lambda: ses_client.list_identity_policies(Identity=identity_name)['PolicyNames'],
+                region
             )
         except Exception as e:
             print_exception(f'Failed to list SES policies: {e}')
@@ -42,8 +46,9 @@ class SESFacade(AWSBaseFacade):
             return {}
 
         try:
-            return await run_concurrently(
-                lambda: ses_client.get_identity_policies(Identity=identity_name, PolicyNames=policy_names)['Policies']
+            return await self._run_concurrently(
+                lambda: ses_client.get_identity_policies(Identity=identity_name, PolicyNames=policy_names)['Policies'],
+                region
             )
         except Exception as e:
             print_exception(f'Failed to get SES policies: {e}')
@@ -3,10 +3,12 @@ import asyncio
 from ScoutSuite.core.console import print_exception, print_warning
 from ScoutSuite.providers.aws.facade.basefacade import AWSBaseFacade
 from ScoutSuite.providers.aws.facade.utils import AWSFacadeUtils
-from ScoutSuite.providers.utils import run_concurrently, get_and_set_concurrently
+from ScoutSuite.providers.utils import get_and_set_concurrently
 
 
 class SNSFacade(AWSBaseFacade):
+    service = 'sns'
+
     regional_subscriptions_cache_locks = {}
     subscriptions_cache = {}
 
@@ -23,8 +25,9 @@ class SNSFacade(AWSBaseFacade):
     async def _get_and_set_topic_attributes(self, topic: {}, region: str):
         sns_client = AWSFacadeUtils.get_client('sns', self.session, region)
         try:
-            topic['attributes'] = await run_concurrently(
-                lambda: sns_client.get_topic_attributes(TopicArn=topic['TopicArn'])['Attributes']
+            topic['attributes'] = await self._run_concurrently(
+                lambda: sns_client.get_topic_attributes(TopicArn=topic['TopicArn'])['Attributes'],
+                region
             )
         except Exception as e:
             if 'NotFound' in e:
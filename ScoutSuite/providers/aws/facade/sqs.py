@@ -1,14 +1,16 @@
 from ScoutSuite.core.console import print_exception, print_warning
 from ScoutSuite.providers.aws.facade.basefacade import AWSBaseFacade
 from ScoutSuite.providers.aws.facade.utils import AWSFacadeUtils
-from ScoutSuite.providers.utils import run_concurrently, map_concurrently
+from ScoutSuite.providers.utils import map_concurrently
 
 
 class SQSFacade(AWSBaseFacade):
+    service = 'sqs'
+
     async def get_queues(self, region: str, attribute_names: []):
         sqs_client = AWSFacadeUtils.get_client('sqs', self.session, region)
         try:
-            raw_queues = await run_concurrently(sqs_client.list_queues)
+            raw_queues = await self._run_concurrently(sqs_client.list_queues, region)
         except Exception as e:
             print_exception(f'Failed to list SQS queues: {e}')
             return []
@@ -23,9 +25,10 @@ class SQSFacade(AWSBaseFacade):
     async def _get_queue_attributes(self, queue_url: str, region: str, attribute_names: []):
         sqs_client = AWSFacadeUtils.get_client('sqs', self.session, region)
         try:
-            queue_attributes = await run_concurrently(
+            queue_attributes = await self._run_concurrently(
                 lambda: sqs_client.get_queue_attributes(QueueUrl=queue_url, AttributeNames=attribute_names)[
-                    'Attributes']
+                    'Attributes'],
+                region
             )
         except Exception as e:
             if 'NonExistentQueue' in e:
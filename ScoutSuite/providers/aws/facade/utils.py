@@ -1,12 +1,41 @@
+import threading
+
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
 from ScoutSuite.core.conditions import print_exception
-from ScoutSuite.providers.utils import run_concurrently
+from ScoutSuite.core.console import print_error
+from ScoutSuite.providers.aws.facade.async_backend import AsyncClients
+from ScoutSuite.providers.aws.utils import get_paginator_args
+from ScoutSuite.providers.utils import get_max_workers, get_response_cache_key, run_cached, run_concurrently, \
+    run_function_concurrently
 
 
 class AWSFacadeUtils:
     _clients = {}
+    # Locks of the clients being instantiated, by key, so that loading a service model doesn't hold up the others
+    _client_locks = {}
+    _clients_lock = threading.Lock()
+    _client_creations = {}
+    _async_clients = None
+
+    @staticmethod
+    def set_async_backend(enabled: bool):
+        """
+        Fetch paginated resources with aiobotocore clients on the event loop rather than with boto3 clients in threads
+
+        :param enabled: Whether to use the asyncio backend
+        """
+        if enabled and not AsyncClients.is_available():
+            print_error('The asyncio backend requires aiobotocore, falling back to threads')
+            enabled = False
+        AWSFacadeUtils._async_clients = AsyncClients() if enabled else None
+
+    @staticmethod
+    async def close_async_clients():
+        if AWSFacadeUtils._async_clients:
+            await AWSFacadeUtils._async_clients.close()
 
     @staticmethod
     async def get_all_pages(service: str, region: str, session: boto3.session.Session, paginator_name: str,
@@ -31,6 +60,58 @@ class AWSFacadeUtils:
         else:
             return []
 
+    @staticmethod
+    async def get_cached_response(service: str, region: str, session: boto3.session.Session, operation: str,
+                                  **params):
+        """
+        Makes an API call once per run for given parameters, the facades making the same call sharing its response
+
+        :param service:str: Name of the AWS service (ec2, iam, etc.)
+        :param region:str: Region
+        :param session:boto3.session.Session: Boto3 session used to authenticate the client
+        :param operation:str: Name of the client method, e.g. get_role
+        :param **params: Arguments of the call
+
+        :return: A copy of the response.
+        """
+        client = await AWSFacadeUtils.get_client_concurrently(service, session, region)
+        key = get_response_cache_key('aws', service, operation, dict(params, Region=region))
+        return await run_cached(key, lambda: run_concurrently(lambda: getattr(client, operation)(**params),
+                                                              rate_limit_key=('aws', service, region)))
+
+    @staticmethod
+    async def get_pages(service: str, region: str, session: boto3.session.Session, paginator_name: str, entity: str,
+                        **paginator_args):
+        """
+        Yields the entities of a paginator page by page, as they are fetched, so that they can be parsed without waiting
+        for the last page nor holding all of them in memory
+
+        :param service:str: Name of the AWS service (ec2, iam, etc.)
+        :param region:str: Region
+        :param session:boto3.session.Session: Boto3 session used to authenticate the client
+        :param paginator_name:str: Name of the paginator
+        :param entity:str: Key used to retreive the entities in the paginator's response
+        :param **paginator_args: Arguments passed to the paginator
+
+        :return: An asynchronous iterator over the lists of entities of each page.
+        """
+
+        try:
+            if AWSFacadeUtils._async_clients:
+                async for page in AWSFacadeUtils._async_clients.get_pages(
+                        service, region, session, paginator_name, **paginator_args):
+                    yield page[entity]
+                return
+
+            async for page in AWSFacadeUtils._get_raw_pages(service, region, session, paginator_name,
+                                                            **paginator_args):
+                yield page[entity]
+        except ClientError as e:
+            if AWSFacadeUtils._is_access_denied(e):
+                print_exception(f'Failed to get all pages from paginator for the {service} service: {e}')
+            else:
+                raise
+
     @staticmethod
     async def get_multiple_entities_from_all_pages(service: str, region: str, session: boto3.session.Session,
                                                    paginator_name: str, entities: list, **paginator_args):
@@ -46,40 +127,75 @@ class AWSFacadeUtils:
             :return: A dictionary with the entity keys as keys, and the fetched entities lists as values.
         """
 
-        client = AWSFacadeUtils.get_client(service, session, region)
-
-        # Building a paginator doesn't require any API call so no need to do it concurrently:
-        paginator = client.get_paginator(
-            paginator_name).paginate(**paginator_args)
-
-        # Getting all pages from a paginator requires API calls so we need to do it concurrently:
         try:
-            return await run_concurrently(lambda: AWSFacadeUtils._get_all_pages_from_paginator(paginator, entities))
+            if AWSFacadeUtils._async_clients:
+                return await AWSFacadeUtils._async_clients.get_multiple_entities_from_all_pages(
+                    service, region, session, paginator_name, entities, **paginator_args)
+
+            resources = {entity: [] for entity in entities}
+            async for page in AWSFacadeUtils._get_raw_pages(service, region, session, paginator_name,
+                                                            **paginator_args):
+                for entity in entities:
+                    resources[entity].extend(page[entity])
+            return resources
         except ClientError as e:
-            if e.response['Error']['Code'] in ['AccessDenied',
-                                               'AccessDeniedException',
-                                               'UnauthorizedOperation',
-                                               'AuthorizationError']:
+            if AWSFacadeUtils._is_access_denied(e):
                 print_exception(f'Failed to get all pages from paginator for the {service} service: {e}')
                 return []
             else:
                 raise
 
     @staticmethod
-    def _get_all_pages_from_paginator(paginator, entities: list):
-        resources = {entity: [] for entity in entities}
+    def _is_access_denied(e: ClientError):
+        return e.response['Error']['Code'] in ['AccessDenied',
+                                               'AccessDeniedException',
+                                               'UnauthorizedOperation',
+                                               'AuthorizationError']
+
+    @staticmethod
+    async def _get_raw_pages(service: str, region: str, session: boto3.session.Session, paginator_name: str,
+                             **paginator_args):
+        client = await AWSFacadeUtils.get_client_concurrently(service, session, region)
+        # Building a paginator doesn't require any API call so no need to do it concurrently:
+        paginator = client.get_paginator(paginator_name)
+        state = {}
+        while True:
+            # There's an API call hidden behind each iteration, so each page is fetched concurrently:
+            page = await run_concurrently(lambda: AWSFacadeUtils._get_next_page(paginator, paginator_args, state),
+                                          rate_limit_key=('aws', service, region))
+            if page is None:
+                return
+            yield page
 
-        # There's an API call hidden behind each iteration:
-        for page in paginator:
-            for entity in entities:
-                resources[entity].extend(page[entity])
+    @staticmethod
+    def _get_next_page(paginator, paginator_args: dict, state: dict):
+        """
+        Fetches the next page of a paginator. A failed request ends botocore's page iterator, so when it is retried the
+        pages are fetched by a new iterator, starting from the token of the last page fetched.
 
-        return resources
+        :param paginator: The botocore paginator
+        :param paginator_args: Arguments passed to the paginator
+        :param state: The current page iterator and the token of the next page, updated by each call
+
+        :return: The page, or None once all the pages were fetched.
+        """
+        if state.get('pages') is None:
+            state['page_iterator'] = paginator.paginate(**get_paginator_args(paginator_args, state.get('next_token')))
+            state['pages'] = iter(state['page_iterator'])
+        try:
+            page = next(state['pages'], None)
+        except Exception:
+            state['pages'] = None
+            raise
+        if page is not None:
+            state['next_token'] = state['page_iterator']._get_next_token(page)
+        return page
 
     @staticmethod
     def get_client(service: str, session: boto3.session.Session, region: str = None):
         """
-        Instantiates an AWS API client
+        Get the AWS API client of a session for a service and region, which is instantiated once and shared by all the
+        threads making API calls
 
         :param service: Service targeted, e.g. ec2
         :param session: The aws session
@@ -88,10 +204,44 @@ class AWSFacadeUtils:
         :return:
         """
 
-        try:
-            return AWSFacadeUtils._clients.setdefault(
-                (service, region),
-                session.client(service, region_name=region) if region else session.client(service))
-        except Exception as e:
-            print_exception(f'Failed to create client for the {service} service: {e}')
-            return None
+        # Allow as many connections as there are threads making API calls
+        max_pool_connections = get_max_workers()
+        key = (session, service, region, max_pool_connections)
+        client = AWSFacadeUtils._clients.get(key)
+        if client:
+            return client
+        with AWSFacadeUtils._clients_lock:
+            client_lock = AWSFacadeUtils._client_locks.setdefault(key, threading.Lock())
+        with client_lock:
+            if key not in AWSFacadeUtils._clients:
+                try:
+                    config = Config(max_pool_connections=max_pool_connections)
+                    AWSFacadeUtils._clients[key] = session.client(service, region_name=region, config=config) \
+                        if region else session.client(service, config=config)
+                    AWSFacadeUtils._client_creations[key] = AWSFacadeUtils._client_creations.get(key, 0) + 1
+                except Exception as e:
+                    print_exception(f'Failed to create client for the {service} service: {e}')
+                    return None
+            return AWSFacadeUtils._clients[key]
+
+    @staticmethod
+    async def get_client_concurrently(service: str, session: boto3.session.Session, region: str = None):
+        """
+        Same as get_client, except that a client is instantiated in the fetch thread pool rather than on the event loop,
+        as loading its service model takes a while
+
+        :return:
+        """
+        client = AWSFacadeUtils._clients.get((session, service, region, get_max_workers()))
+        if client:
+            return client
+        return await run_function_concurrently(lambda: AWSFacadeUtils.get_client(service, session, region))
+
+    @staticmethod
+    def get_client_creations():
+        """
+        Count the clients instantiated, by (session, service, region, maximum pool connections)
+
+        :return: A dictionary of the number of clients instantiated for each key
+        """
+        return dict(AWSFacadeUtils._client_creations)
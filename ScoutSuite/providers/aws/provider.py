@@ -2,9 +2,12 @@ import copy
 import os
 
 from ScoutSuite.core.console import print_error, print_exception, print_warning, print_debug
+from ScoutSuite.output.utils import get_filename
+from ScoutSuite.providers.aws.facade.utils import AWSFacadeUtils
 from ScoutSuite.providers.aws.services import AWSServicesConfig
 from ScoutSuite.providers.aws.resources.vpc.base import put_cidr_name
-from ScoutSuite.providers.aws.utils import ec2_classic, get_aws_account_id, get_partition_name
+from ScoutSuite.providers.aws.utils import ec2_classic, get_aws_account_id, get_partition_name, \
+    load_region_catalog, save_region_catalog
 from ScoutSuite.providers.base.configs.browser import combine_paths, get_object_at, get_value_at
 from ScoutSuite.providers.base.provider import BaseProvider
 from ScoutSuite.utils import manage_dictionary
@@ -16,7 +19,7 @@ class AWSProvider(BaseProvider):
     """
 
     def __init__(self, profile='default', report_dir=None, timestamp=None, services=None, skipped_services=None,
-                 result_format='json', **kwargs):
+                 result_format='json', aws_async_backend=False, aws_iam_bulk_fetch=False, **kwargs):
         services = [] if services is None else services
         skipped_services = [] if skipped_services is None else skipped_services
 
@@ -39,9 +42,23 @@ class AWSProvider(BaseProvider):
 
         self.account_id = get_aws_account_id(self.credentials.session)
 
+        # The services and regions known to botocore are looked up once per run and reused by the next runs
+        load_region_catalog(get_filename('REGION_CATALOG', self.partition, report_dir)[0], self.partition)
+
+        AWSFacadeUtils.set_async_backend(aws_async_backend)
+
+        self.services = AWSServicesConfig(self.credentials, iam_bulk_fetch=aws_iam_bulk_fetch)
+
         super().__init__(report_dir, timestamp,
                                           services, skipped_services, result_format)
 
+    async def fetch(self, regions=None, excluded_regions=None, partition_name=None):
+        try:
+            await super().fetch(regions, excluded_regions, partition_name)
+        finally:
+            save_region_catalog()
+            await AWSFacadeUtils.close_async_clients()
+
     def get_report_name(self):
         """
         Returns the name of the report using the provider's configuration
@@ -13,9 +13,10 @@ class MetricFilters(AWSResources):
         self.resource_type = 'metric-filter'
 
     async def fetch_all(self):
-        for raw_metric_filter in await self.facade.cloudwatch.get_metric_filters(self.region):
-            name, resource = self._parse_metric_filter(raw_metric_filter)
-            self[name] = resource
+        async for raw_metric_filters in self.facade.cloudwatch.get_metric_filters(self.region):
+            for raw_metric_filter in raw_metric_filters:
+                name, resource = self._parse_metric_filter(raw_metric_filter)
+                self[name] = resource
 
     def _parse_metric_filter(self, raw_metric_filter):
         metric_filter_dict = {}
@@ -3,10 +3,10 @@ from ScoutSuite.providers.aws.resources.base import AWSResources
 
 class Policies(AWSResources):
     async def fetch_all(self):
-        raw_policies = await self.facade.iam.get_policies()
-        for raw_policy in raw_policies:
-            name, resource = self._parse_policy(raw_policy)
-            self[name] = resource
+        async for raw_policies in self.facade.iam.get_policies():
+            for raw_policy in raw_policies:
+                name, resource = self._parse_policy(raw_policy)
+                self[name] = resource
 
     def _parse_policy(self, raw_policy):
         policy = {}
@@ -3,10 +3,10 @@ from ScoutSuite.providers.aws.resources.base import AWSResources
 
 class Roles(AWSResources):
     async def fetch_all(self):
-        raw_roles = await self.facade.iam.get_roles()
-        for raw_role in raw_roles:
-            name, resource = self._parse_role(raw_role)
-            self[name] = resource
+        async for raw_roles in self.facade.iam.get_roles():
+            for raw_role in raw_roles:
+                name, resource = self._parse_role(raw_role)
+                self[name] = resource
 
     def _parse_role(self, raw_role):
         role_dict = {}
@@ -83,11 +83,11 @@ class AWSServicesConfig(BaseServicesConfig):
     :ivar sqs:                          SQS configuration
     """
 
-    def __init__(self, credentials=None, **kwargs):
+    def __init__(self, credentials=None, iam_bulk_fetch=False, **kwargs):
 
         super().__init__(credentials)
 
-        facade = AWSFacade(credentials)
+        facade = AWSFacade(credentials, iam_bulk_fetch)
 
         self.acm = Certificates(facade)
         self.awslambda = Lambdas(facade)
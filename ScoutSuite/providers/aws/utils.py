@@ -1,14 +1,33 @@
+import json
+import os
 import re
+import threading
 
-from ScoutSuite.core.console import print_exception
+import botocore
+from boto3.session import Session
+from botocore.paginate import TokenEncoder
+
+from ScoutSuite.core.console import print_debug, print_exception
 
 ec2_classic = "EC2-Classic"
 
+region_catalog_version = 1
+
+# Caller identities, resolved once per session for the whole run
+_caller_identities = {}
+
+# Services and regions known to botocore, resolved once for the whole run and optionally persisted on disk
+_region_catalog = {'file': None, 'partition': None, 'services': None, 'regions': {}, 'changed': False}
+
+# Sessions looking up the region catalog, by region, for each thread as botocore sessions aren't thread-safe
+_catalog_sessions = threading.local()
+
 
 def get_caller_identity(session):
-    sts_client = session.client("sts")
-    identity = sts_client.get_caller_identity()
-    return identity
+    if session not in _caller_identities:
+        sts_client = session.client("sts")
+        _caller_identities[session] = sts_client.get_caller_identity()
+    return _caller_identities[session]
 
 
 def get_aws_account_id(session):
@@ -23,6 +42,106 @@ def get_partition_name(session):
     return partition_name
 
 
+def get_paginator_args(paginator_args: dict, next_token: dict = None):
+    """
+    Get the arguments of a paginator resuming a pagination, e.g. after a failed request ended the previous paginator
+
+    :param paginator_args:          Arguments of the pagination
+    :param next_token:              Token of the next page, as found in the last page fetched by the previous paginator
+    :return:                        The paginator's arguments, starting from the next page
+    """
+    if not next_token:
+        return paginator_args
+    pagination_config = dict(paginator_args.get('PaginationConfig', {}), StartingToken=TokenEncoder().encode(next_token))
+    return dict(paginator_args, PaginationConfig=pagination_config)
+
+
+def _get_catalog_session(region_name):
+    # Each session loads botocore's endpoint data, so a single one is created per region in each thread
+    sessions = getattr(_catalog_sessions, 'sessions', None)
+    if sessions is None:
+        sessions = _catalog_sessions.sessions = {}
+    if region_name not in sessions:
+        sessions[region_name] = Session(region_name=region_name)
+    return sessions[region_name]
+
+
+def get_available_services(region_name='us-east-1'):
+    """
+    Returns the services known to botocore, which are only looked up once per run
+
+    :param region_name:                 Region of the session used to look them up
+    :return:                            List of service names
+    """
+    if _region_catalog['services'] is None:
+        _region_catalog['services'] = _get_catalog_session(region_name).get_available_services()
+        _region_catalog['changed'] = True
+    return _region_catalog['services']
+
+
+def get_available_regions(service, partition_name='aws', region_name='us-east-1'):
+    """
+    Returns the regions of a service in a partition, which are only looked up once per run
+
+    :param service:                     Name of the service
+    :param partition_name:              Name of the partition
+    :param region_name:                 Region of the session used to look them up
+    :return:                            List of region names
+    """
+    regions = _region_catalog['regions'].setdefault(partition_name, {})
+    if service not in regions:
+        regions[service] = _get_catalog_session(region_name).get_available_regions(service, partition_name)
+        _region_catalog['changed'] = True
+    return regions[service]
+
+
+def load_region_catalog(catalog_file, partition_name):
+    """
+    Loads the services and regions of a partition saved by a previous run with the same botocore version, and saves
+    them to the same file at the end of the run
+
+    :param catalog_file:                Path of the catalog file
+    :param partition_name:              Name of the partition
+    :return:                            True if the catalog was loaded
+    """
+    _region_catalog['file'] = catalog_file
+    _region_catalog['partition'] = partition_name
+    if not os.path.isfile(catalog_file):
+        return False
+    try:
+        with open(catalog_file) as f:
+            catalog = json.load(f)
+        if catalog['version'] != region_catalog_version or catalog['botocore_version'] != botocore.__version__ or \
+                catalog['partition'] != partition_name:
+            print_debug(f'Ignoring outdated region catalog {catalog_file}')
+            return False
+        _region_catalog['services'] = catalog['services']
+        _region_catalog['regions'][partition_name] = catalog['regions']
+    except Exception as e:
+        print_debug(f'Ignoring invalid region catalog {catalog_file}: {e}')
+        return False
+    print_debug(f'Loaded the region catalog from {catalog_file}')
+    return True
+
+
+def save_region_catalog():
+    catalog_file, partition_name = _region_catalog['file'], _region_catalog['partition']
+    if not catalog_file or not _region_catalog['changed'] or _region_catalog['services'] is None:
+        return
+    try:
+        data = json.dumps({'version': region_catalog_version,
+                           'botocore_version': botocore.__version__,
+                           'partition': partition_name,
+                           'services': _region_catalog['services'],
+                           'regions': _region_catalog['regions'].get(partition_name, {})})
+        os.makedirs(os.path.dirname(catalog_file) or '.', exist_ok=True)
+        with open(catalog_file, 'w') as f:
+            f.write(data)
+        _region_catalog['changed'] = False
+    except Exception as e:
+        print_exception(f'Failed to save region catalog {catalog_file}: {e}')
+
+
 def is_throttled(exception):
     """
     Determines whether the exception is due to API throttling.
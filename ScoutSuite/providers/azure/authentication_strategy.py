@@ -7,6 +7,7 @@ from ScoutSuite.core.console import print_exception
 
 from azure.identity import UsernamePasswordCredential, AzureCliCredential, ClientSecretCredential, \
     ManagedIdentityCredential, DeviceCodeCredential
+from ScoutSuite.providers.azure.utils import CachedTokenCredential
 from ScoutSuite.providers.base.authentication_strategy import AuthenticationStrategy, AuthenticationException
 
 AUTHORITY_HOST_URI = 'https://login.microsoftonline.com/'
@@ -24,6 +25,7 @@ class AzureCredentials:
         self.tenant_id = tenant_id
         self.default_subscription_id = default_subscription_id
         self.context = context
+        self._cached_credentials = None
 
     def get_tenant_id(self):
         if self.tenant_id:
@@ -44,7 +46,10 @@ class AzureCredentials:
                 return None
 
     def get_credentials(self):
-        return self.identity_credentials
+        # Shared by all the clients, so that tokens are requested once per scope until they expire
+        if self._cached_credentials is None:
+            self._cached_credentials = CachedTokenCredential(self.identity_credentials)
+        return self._cached_credentials
 
 
 class AzureAuthenticationStrategy(AuthenticationStrategy):
@@ -1,30 +1,36 @@
 from azure.identity import DefaultAzureCredential
-import requests
 
 from ScoutSuite.core.console import print_exception
+from ScoutSuite.providers.azure.facade.graph import GraphClient
 
 
 class AADFacade:
 
     def __init__(self, credentials):
         self.credentials = DefaultAzureCredential()
+        self.graph = GraphClient(self.credentials)
 
+    async def _get_microsoft_graph_response(self, api_resource, api_version='v1.0', batched=False):
+        """
+        Gets a Microsoft Graph resource, with all the items of its collection if it is one
 
-    async def _get_microsoft_graph_response(self, api_resource, api_version='v1.0'):
-        endpoint = 'https://graph.microsoft.com/{}/{}'.format(api_version, api_resource)
+        :param api_resource: Path and query of the resource
+        :param api_version: Version of the API, v1.0 or beta
+        :param batched: Whether to send the request in a $batch with the concurrent requests, only the first page of
+                        a collection being fetched then
+        """
         try:
-            token = self.credentials.get_token('https://graph.microsoft.com/.default').token
-            headers = {'Authorization': f'Bearer {token}'}
-            response = requests.get(endpoint, headers=headers, timeout=30)
-            if response.status_code == 200:
-                return response.json()
-            # If response is 404 then it means there is no resource associated with the provided id
-            elif response.status_code == 404:
-                return {}
-            else:
-                print_exception('Failed to query Microsoft Graph endpoint \"{}\": status code {}'.
-                                format(api_resource, response.status_code))
-                return {}
+            if batched:
+                response = await self.graph.get_batched(api_resource, api_version)
+                return response if response else {}
+            response = {}
+            async for page in self.graph.get_pages(api_resource, api_version):
+                if 'value' in response:
+                    response['value'].extend(page.get('value', []))
+                else:
+                    response = page
+            response.pop('@odata.nextLink', None)
+            return response
         except Exception as e:
             print_exception('Failed to query Microsoft Graph endpoint \"{}\": {}'.format(api_resource, e))
             return {}
@@ -35,7 +41,7 @@ class AADFacade:
             # becomes out of hands
             # See https://github.com/nccgroup/ScoutSuite/issues/698
             user_filter = '?$filter=userType+eq+%27Guest%27'
-            users_response_beta = await self._get_microsoft_graph_response('users'+ user_filter, 'beta')
+            users_response_beta = await self._get_microsoft_graph_response('users' + user_filter, 'beta')
             if users_response_beta:
                 users = users_response_beta.get('value')
                 return users
@@ -47,7 +53,7 @@ class AADFacade:
     async def get_user(self, user_id):
         try:
             user_filter = f'?$filter=id+eq+%27{user_id}%27'
-            user_response_beta = await self._get_microsoft_graph_response('users'+user_filter, 'beta')
+            user_response_beta = await self._get_microsoft_graph_response('users' + user_filter, 'beta', batched=True)
             if user_response_beta:
                 users = user_response_beta.get('value')
                 return users[0]
@@ -70,7 +76,7 @@ class AADFacade:
     async def get_user_groups(self, group_id):
         try:
             group_filter = f'?$filter=id+eq+%27{group_id}%27'
-            user_groups_response = await self._get_microsoft_graph_response('groups' + group_filter)
+            user_groups_response = await self._get_microsoft_graph_response('groups' + group_filter, batched=True)
             if user_groups_response:
                 groups = user_groups_response.get('value')
                 return groups
@@ -109,3 +115,6 @@ class AADFacade:
         except Exception as e:
             print_exception(f'Failed to retrieve policies: {e}')
             return []
+
+    async def close(self):
+        await self.graph.close()
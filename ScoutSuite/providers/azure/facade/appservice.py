@@ -1,37 +1,26 @@
 from azure.mgmt.web import WebSiteManagementClient
-import asyncio
 
 from ScoutSuite.core.console import print_exception
-from ScoutSuite.providers.azure.utils import get_resource_group_name
-from ScoutSuite.providers.utils import run_concurrently, get_and_set_concurrently
-from ScoutSuite.utils import get_user_agent
+from ScoutSuite.providers.azure.utils import get_resource_group_name, get_management_client
+from ScoutSuite.providers.utils import get_and_set_concurrently, RateLimitedFacade
 
 
-class AppServiceFacade:
+class AppServiceFacade(RateLimitedFacade):
+    provider = 'azure'
+    service = 'appservice'
 
     def __init__(self, credentials):
         self.credentials = credentials
 
     def get_client(self, subscription_id: str):
-        client = WebSiteManagementClient(self.credentials.get_credentials(),
-                                         subscription_id=subscription_id, user_agent=get_user_agent())
-        return client
+        return get_management_client(WebSiteManagementClient, self.credentials.get_credentials(), subscription_id)
 
     async def get_web_apps(self, subscription_id: str):
         try:
             client = self.get_client(subscription_id)
-            try:
-                web_apps = await run_concurrently(
-                    lambda: list(client.web_apps.list())
-                )
-            except AttributeError as ae:
-                if 'throttler' in str(ae):
-                    loop = asyncio.get_event_loop()
-                    web_apps = await loop.run_in_executor(
-                        None, lambda: list(client.web_apps.list())
-                    )
-                else:
-                    raise
+            web_apps = await self._run_concurrently(
+                lambda: list(client.web_apps.list())
+            )
         except Exception as e:
             print_exception(f'Failed to retrieve web apps: {e}')
             return []
@@ -43,7 +32,7 @@ class AppServiceFacade:
     async def _get_and_set_web_app_configuration(self, web_app, api_client):
         resource_group_name = get_resource_group_name(web_app.id)
         try:
-            web_app_config = await run_concurrently(
+            web_app_config = await self._run_concurrently(
                 lambda: api_client.web_apps.get_configuration(resource_group_name, web_app.name)
             )
         except Exception as e:
@@ -55,7 +44,7 @@ class AppServiceFacade:
     async def _get_and_set_web_app_auth_settings(self, web_app, api_client):
         resource_group_name = get_resource_group_name(web_app.id)
         try:
-            web_app_auth_settings = await run_concurrently(
+            web_app_auth_settings = await self._run_concurrently(
                 lambda: api_client.web_apps.get_auth_settings(resource_group_name=resource_group_name,
                                                               name=web_app.name)
             )
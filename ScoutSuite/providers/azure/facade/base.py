@@ -15,7 +15,7 @@ from ScoutSuite.providers.azure.facade.loggingmonitoring import LoggingMonitorin
 
 from azure.mgmt.resource import SubscriptionClient
 from ScoutSuite.providers.base.authentication_strategy import AuthenticationException
-from ScoutSuite.utils import get_user_agent
+from ScoutSuite.providers.azure.utils import get_management_client
 
 from ScoutSuite.core.console import print_info, print_exception
 
@@ -86,7 +86,7 @@ class AzureFacade:
     def _set_subscriptions(self):
 
         # Create the client
-        subscription_client = SubscriptionClient(self.credentials.get_credentials(), user_agent=get_user_agent())
+        subscription_client = get_management_client(SubscriptionClient, self.credentials.get_credentials())
         # Get all the accessible subscriptions
         accessible_subscriptions_list = list(subscription_client.subscriptions.list())
 
@@ -0,0 +1,206 @@
+import asyncio
+import random
+import time
+
+import httpx
+
+from ScoutSuite.core.console import print_debug
+from ScoutSuite.providers.utils import get_max_workers, get_rate_limiter, run_function_concurrently
+from ScoutSuite.utils import get_user_agent
+
+
+class GraphError(Exception):
+    def __init__(self, status_code, message):
+        super().__init__(f'status code {status_code}: {message}' if message else f'status code {status_code}')
+        self.status_code = status_code
+
+
+class GraphClient:
+    """
+    Microsoft Graph client making its requests on the event loop, through a connection pool sized to --max-workers. Its
+    token is requested again `token_refresh_margin` seconds before it expires, and throttled requests are retried after
+    the delay in their Retry-After header.
+    """
+    base_url = 'https://graph.microsoft.com'
+    scope = 'https://graph.microsoft.com/.default'
+    token_refresh_margin = 300
+    # Graph's limit of requests in a $batch, and how long requests wait for others to join their batch
+    batch_size = 20
+    batch_delay = 0.05
+    max_attempts = 5
+    backoff_seconds = 15
+    throttling_status_codes = [429, 503, 504]
+
+    def __init__(self, credentials):
+        self.credentials = credentials
+        self._token = None
+        self._session = None
+        self._loop = None
+        self._token_lock = None
+        # Requests waiting to be sent, by API version
+        self._batches = {}
+        self._rate_limiter = get_rate_limiter(('azure', 'graph', None))
+
+    def _get_session(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Sessions and their connection pools are bound to the loop they were created on
+            self._session = httpx.AsyncClient(
+                headers={'User-Agent': get_user_agent()}, timeout=30,
+                limits=httpx.Limits(max_connections=get_max_workers(),
+                                    max_keepalive_connections=get_max_workers()))
+            self._token_lock = asyncio.Lock()
+            self._batches = {}
+            self._loop = loop
+        return self._session
+
+    async def _get_token(self):
+        if self._needs_token():
+            async with self._token_lock:
+                if self._needs_token():
+                    # Credentials may run the Azure CLI or make their own blocking requests
+                    self._token = await run_function_concurrently(lambda: self.credentials.get_token(self.scope))
+        return self._token.token
+
+    def _needs_token(self):
+        return not self._token or self._token.expires_on - self.token_refresh_margin < time.time()
+
+    def _get_retry_after(self, headers, attempt):
+        retry_after = {name.lower(): value for name, value in headers.items()}.get('retry-after')
+        try:
+            return float(retry_after)
+        except (TypeError, ValueError):
+            return random.uniform(0, min(self.backoff_seconds, 2 ** attempt))
+
+    async def _send(self, method, url, **kwargs):
+        session = self._get_session()
+        attempt = 0
+        while True:
+            await self._rate_limiter.acquire()
+            headers = {'Authorization': f'Bearer {await self._get_token()}'}
+            response = await session.request(method, url, headers=headers, **kwargs)
+            attempt += 1
+            if response.status_code not in self.throttling_status_codes:
+                self._rate_limiter.on_success()
+                return response
+            self._rate_limiter.on_throttle()
+            if attempt >= self.max_attempts:
+                return response
+            self._rate_limiter.retries += 1
+            delay = self._get_retry_after(response.headers, attempt)
+            print_debug(f'Hitting Microsoft Graph rate limiting ({url}), will retry in {delay:.1f}s')
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    def _get_body(status_code, body):
+        # There is no resource associated with the provided id
+        if status_code == 404:
+            return None
+        if status_code >= 400:
+            error = body.get('error', {}) if isinstance(body, dict) else {}
+            raise GraphError(status_code, error.get('message'))
+        return body
+
+    async def get(self, resource: str, api_version='v1.0'):
+        """
+        Sends a GET request
+
+        :param resource: Path and query of the request, e.g. users?$filter=userType+eq+%27Guest%27
+        :param api_version: Version of the API, v1.0 or beta
+
+        :return: The response's JSON body, or None if the resource doesn't exist.
+        """
+        response = await self._send('GET', f'{self.base_url}/{api_version}/{resource}')
+        return self._get_body(response.status_code, response.json() if response.content else {})
+
+    async def get_pages(self, resource: str, api_version='v1.0'):
+        """
+        Yields the pages of a collection as they are fetched, following their @odata.nextLink
+
+        :return: An asynchronous iterator over the pages.
+        """
+        url = f'{self.base_url}/{api_version}/{resource}'
+        while url:
+            response = await self._send('GET', url)
+            page = self._get_body(response.status_code, response.json() if response.content else {})
+            if page is None:
+                return
+            yield page
+            url = page.get('@odata.nextLink')
+
+    async def get_all(self, resource: str, api_version='v1.0'):
+        """
+        Gets all the items of a collection, page by page
+
+        :return: A list of the fetched items.
+        """
+        items = []
+        async for page in self.get_pages(resource, api_version):
+            items.extend(page.get('value', []))
+        return items
+
+    async def get_batched(self, resource: str, api_version='v1.0'):
+        """
+        Sends a GET request in a JSON $batch, along with the requests made concurrently with the same API version. The
+        throttled requests of a batch are sent again in another batch.
+
+        :return: The response's JSON body, or None if the resource doesn't exist.
+        """
+        self._get_session()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        batch = self._batches.get(api_version)
+        if batch is None:
+            batch = self._batches[api_version] = []
+            loop.call_later(self.batch_delay, self._send_batch, api_version, batch)
+        batch.append((resource, future))
+        if len(batch) >= self.batch_size:
+            self._send_batch(api_version, batch)
+        return await future
+
+    def _send_batch(self, api_version, batch):
+        # A full batch is sent before its delay is over
+        if self._batches.get(api_version) is not batch:
+            return
+        del self._batches[api_version]
+        asyncio.ensure_future(self._execute_batch(api_version, batch))
+
+    async def _execute_batch(self, api_version, batch):
+        pending = {str(request_id): request for request_id, request in enumerate(batch)}
+        try:
+            for attempt in range(1, self.max_attempts + 1):
+                body = {'requests': [{'id': request_id, 'method': 'GET', 'url': f'/{resource}'}
+                                     for request_id, (resource, _) in pending.items()]}
+                response = await self._send('POST', f'{self.base_url}/{api_version}/$batch', json=body)
+                responses = self._get_body(response.status_code, response.json() if response.content else {})
+                delay = 0
+                for sub_response in (responses or {}).get('responses', []):
+                    if sub_response.get('id') not in pending:
+                        continue
+                    if sub_response['status'] in self.throttling_status_codes and attempt < self.max_attempts:
+                        delay = max(delay, self._get_retry_after(sub_response.get('headers', {}), attempt))
+                        continue
+                    _, future = pending.pop(sub_response['id'])
+                    if future.done():
+                        continue
+                    try:
+                        future.set_result(self._get_body(sub_response['status'], sub_response.get('body')))
+                    except Exception as e:
+                        future.set_exception(e)
+                if not pending:
+                    return
+                self._rate_limiter.on_throttle()
+                self._rate_limiter.retries += 1
+                print_debug(f'Hitting Microsoft Graph rate limiting ({len(pending)} batched requests), '
+                            f'will retry in {delay:.1f}s')
+                await asyncio.sleep(delay)
+            raise GraphError(429, 'No response to the batched request')
+        except Exception as e:
+            for _, future in pending.values():
+                if not future.done():
+                    future.set_exception(e)
+
+    async def close(self):
+        session, self._session, self._loop = self._session, None, None
+        if session:
+            await session.aclose()
@@ -1,36 +1,26 @@
 from azure.mgmt.network import NetworkManagementClient
-import asyncio
 
 from ScoutSuite.core.console import print_exception
-from ScoutSuite.providers.utils import run_concurrently
-from ScoutSuite.utils import get_user_agent
+from ScoutSuite.providers.utils import RateLimitedFacade
+from ScoutSuite.providers.azure.utils import get_management_client
 
 
-class NetworkFacade:
+class NetworkFacade(RateLimitedFacade):
+    provider = 'azure'
+    service = 'network'
 
     def __init__(self, credentials):
         self.credentials = credentials
 
     def get_client(self, subscription_id: str):
-        client = NetworkManagementClient(self.credentials.get_credentials(),
-                                         subscription_id=subscription_id,
-                                         user_agent=get_user_agent())
-        return client
+        return get_management_client(NetworkManagementClient, self.credentials.get_credentials(), subscription_id)
 
     async def get_network_watchers(self, subscription_id: str):
         try:
             client = self.get_client(subscription_id)
-            try:
-                return await run_concurrently(
-                    lambda: list(client.network_watchers.list_all())
-                )
-            except AttributeError as ae:
-                if 'throttler' in str(ae):
-                    loop = asyncio.get_event_loop()
-                    return await loop.run_in_executor(
-                        None, lambda: list(client.network_watchers.list_all())
-                    )
-                raise
+            return await self._run_concurrently(
+                lambda: list(client.network_watchers.list_all())
+            )
         except Exception as e:
             print_exception(f'Failed to retrieve network watchers: {e}')
             return []
@@ -38,17 +28,9 @@ class NetworkFacade:
     async def get_network_security_groups(self, subscription_id: str):
         try:
             client = self.get_client(subscription_id)
-            try:
-                return await run_concurrently(
-                    lambda: list(client.network_security_groups.list_all())
-                )
-            except AttributeError as ae:
-                if 'throttler' in str(ae):
-                    loop = asyncio.get_event_loop()
-                    return await loop.run_in_executor(
-                        None, lambda: list(client.network_security_groups.list_all())
-                    )
-                raise
+            return await self._run_concurrently(
+                lambda: list(client.network_security_groups.list_all())
+            )
         except Exception as e:
             print_exception(f'Failed to retrieve network security groups: {e}')
             return []
@@ -56,17 +38,9 @@ class NetworkFacade:
     async def get_application_security_groups(self, subscription_id: str):
         try:
             client = self.get_client(subscription_id)
-            try:
-                return await run_concurrently(
-                    lambda: list(client.application_security_groups.list_all())
-                )
-            except AttributeError as ae:
-                if 'throttler' in str(ae):
-                    loop = asyncio.get_event_loop()
-                    return await loop.run_in_executor(
-                        None, lambda: list(client.application_security_groups.list_all())
-                    )
-                raise
+            return await self._run_concurrently(
+                lambda: list(client.application_security_groups.list_all())
+            )
         except Exception as e:
             print_exception(f'Failed to retrieve application security groups: {e}')
             return []
@@ -74,17 +48,9 @@ class NetworkFacade:
     async def get_virtual_networks(self, subscription_id: str):
         try:
             client = self.get_client(subscription_id)
-            try:
-                return await run_concurrently(
-                    lambda: list(client.virtual_networks.list_all())
-                )
-            except AttributeError as ae:
-                if 'throttler' in str(ae):
-                    loop = asyncio.get_event_loop()
-                    return await loop.run_in_executor(
-                        None, lambda: list(client.virtual_networks.list_all())
-                    )
-                raise
+            return await self._run_concurrently(
+                lambda: list(client.virtual_networks.list_all())
+            )
         except Exception as e:
             print_exception(f'Failed to retrieve virtual networks: {e}')
             return []
@@ -92,17 +58,9 @@ class NetworkFacade:
     async def get_network_interfaces(self, subscription_id: str):
         try:
             client = self.get_client(subscription_id)
-            try:
-                return await run_concurrently(
-                    lambda: list(client.network_interfaces.list_all())
-                )
-            except AttributeError as ae:
-                if 'throttler' in str(ae):
-                    loop = asyncio.get_event_loop()
-                    return await loop.run_in_executor(
-                        None, lambda: list(client.network_interfaces.list_all())
-                    )
-                raise
+            return await self._run_concurrently(
+                lambda: list(client.network_interfaces.list_all())
+            )
         except Exception as e:
             print_exception(f'Failed to retrieve network interfaces: {e}')
             return []
@@ -1,35 +1,25 @@
 from azure.mgmt.authorization import AuthorizationManagementClient
-import asyncio
 
 from ScoutSuite.core.console import print_exception
-from ScoutSuite.providers.utils import run_concurrently
-from ScoutSuite.utils import get_user_agent
+from ScoutSuite.providers.utils import RateLimitedFacade
+from ScoutSuite.providers.azure.utils import get_management_client
 
 
-class RBACFacade:
+class RBACFacade(RateLimitedFacade):
+    provider = 'azure'
+    service = 'rbac'
 
     def __init__(self, credentials):
         self.credentials = credentials
 
     def get_client(self, subscription_id: str):
-        client = AuthorizationManagementClient(self.credentials.get_credentials(),
-                                               subscription_id=subscription_id,
-                                               user_agent=get_user_agent())
-        return client
+        return get_management_client(AuthorizationManagementClient, self.credentials.get_credentials(), subscription_id)
 
     async def get_roles(self, subscription_id: str):
         try:
             client = self.get_client(subscription_id)
             scope = f'/subscriptions/{subscription_id}'
-            try:
-                return await run_concurrently(lambda: list(client.role_definitions.list(scope=scope)))
-            except AttributeError as ae:
-                if 'throttler' in str(ae):
-                    loop = asyncio.get_event_loop()
-                    return await loop.run_in_executor(
-                        None, lambda: list(client.role_definitions.list(scope=scope))
-                    )
-                raise
+            return await self._run_concurrently(lambda: list(client.role_definitions.list(scope=scope)))
         except Exception as e:
             print_exception(f'Failed to retrieve roles: {e}')
             return []
@@ -38,15 +28,7 @@ class RBACFacade:
         try:
             client = self.get_client(subscription_id)
             scope = f'/subscriptions/{subscription_id}'
-            try:
-                return await run_concurrently(lambda: list(client.role_assignments.list_for_scope(scope=scope)))
-            except AttributeError as ae:
-                if 'throttler' in str(ae):
-                    loop = asyncio.get_event_loop()
-                    return await loop.run_in_executor(
-                        None, lambda: list(client.role_assignments.list_for_scope(scope=scope))
-                    )
-                raise
+            return await self._run_concurrently(lambda: list(client.role_assignments.list_for_scope(scope=scope)))
         except Exception as e:
             print_exception(f'Failed to retrieve role assignments: {e}')
             return []
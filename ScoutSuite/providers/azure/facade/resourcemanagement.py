@@ -1,20 +1,18 @@
-from ScoutSuite.providers.utils import run_concurrently
+from ScoutSuite.providers.utils import RateLimitedFacade
 from ScoutSuite.core.console import print_exception
-from ScoutSuite.utils import get_user_agent
+from ScoutSuite.providers.azure.utils import get_management_client
 from azure.mgmt.resource import ResourceManagementClient
-import asyncio
 
 
-class ResourceManagementFacade:
+class ResourceManagementFacade(RateLimitedFacade):
+    provider = 'azure'
+    service = 'resourcemanagement'
 
     def __init__(self, credentials):
         self.credentials = credentials
 
     def get_client(self, subscription_id: str):
-        client = ResourceManagementClient(self.credentials.get_credentials(),
-                                          subscription_id=subscription_id,
-                                          user_agent=get_user_agent())
-        return client
+        return get_management_client(ResourceManagementClient, self.credentials.get_credentials(), subscription_id)
 
     async def get_specific_type_resources_with_filter(self, subscription_id: str, resource_type_filter: str):
         try:
@@ -22,18 +20,9 @@ class ResourceManagementFacade:
                 f'resourceType eq \'{resource_type_filter}\''
             ])
             client = self.get_client(subscription_id)
-            try:
-                resource = await run_concurrently(
-                    lambda: list(client.resources.list(filter=type_filter))
-                )
-            except AttributeError as ae:
-                if 'throttler' in str(ae):
-                    loop = asyncio.get_event_loop()
-                    resource = await loop.run_in_executor(
-                        None, lambda: list(client.resources.list(filter=type_filter))
-                    )
-                else:
-                    raise
+            resource = await self._run_concurrently(
+                lambda: list(client.resources.list(filter=type_filter))
+            )
             return resource
         except Exception as e:
             print_exception(f'Failed to retrieve key vault resources: {e}')
@@ -42,18 +31,9 @@ class ResourceManagementFacade:
     async def get_all_resources(self, subscription_id: str):
         try:
             client = self.get_client(subscription_id)
-            try:
-                resource = await run_concurrently(
-                    lambda: list(client.resources.list())
-                )
-            except AttributeError as ae:
-                if 'throttler' in str(ae):
-                    loop = asyncio.get_event_loop()
-                    resource = await loop.run_in_executor(
-                        None, lambda: list(client.resources.list())
-                    )
-                else:
-                    raise
+            resource = await self._run_concurrently(
+                lambda: list(client.resources.list())
+            )
             return resource
         except Exception as e:
             print_exception(f'Failed to retrieve resources: {e}')
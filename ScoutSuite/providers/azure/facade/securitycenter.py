@@ -1,38 +1,27 @@
 from azure.mgmt.security import SecurityCenter
 
-import asyncio
 from ScoutSuite.core.console import print_exception, print_debug
-from ScoutSuite.providers.utils import run_concurrently
-from ScoutSuite.utils import get_user_agent
+from ScoutSuite.providers.utils import RateLimitedFacade
+from ScoutSuite.providers.azure.utils import get_management_client
 
 
-class SecurityCenterFacade:
+class SecurityCenterFacade(RateLimitedFacade):
+    provider = 'azure'
+    service = 'securitycenter'
 
     def __init__(self, credentials):
         self.credentials = credentials
 
     def get_client(self, subscription_id: str):
-        client = SecurityCenter(self.credentials.get_credentials(),
-                                subscription_id, '',
-                                user_agent=get_user_agent())
-        return client
+        return get_management_client(SecurityCenter, self.credentials.get_credentials(), subscription_id)
 
     async def get_pricings(self, subscription_id: str):
         try:
             client = self.get_client(subscription_id)
             scope = f'/subscriptions/{subscription_id}'
-            try:
-                pricings_list = await run_concurrently(
-                    lambda: client.pricings.list(scope_id=scope)
-                )
-            except AttributeError as ae:
-                if 'throttler' in str(ae):
-                    loop = asyncio.get_event_loop()
-                    pricings_list = await loop.run_in_executor(
-                        None, lambda: client.pricings.list(scope_id=scope)
-                    )
-                else:
-                    raise
+            pricings_list = await self._run_concurrently(
+                lambda: client.pricings.list(scope_id=scope)
+            )
             if hasattr(pricings_list, 'value'):
                 return pricings_list.value
             else:
@@ -44,18 +33,9 @@ class SecurityCenterFacade:
     async def get_security_contacts(self, subscription_id: str):
         try:
             client = self.get_client(subscription_id)
-            try:
-                return await run_concurrently(
-                    lambda: list(client.security_contacts.list())
-                )
-            except AttributeError as ae:
-                if 'throttler' in str(ae):
-                    loop = asyncio.get_event_loop()
-                    return await loop.run_in_executor(
-                        None, lambda: list(client.security_contacts.list())
-                    )
-                else:
-                    raise
+            return await self._run_concurrently(
+                lambda: list(client.security_contacts.list())
+            )
         except Exception as e:
             print_exception(f'Failed to retrieve security contacts: {e}')
             return []
@@ -63,17 +43,9 @@ class SecurityCenterFacade:
     async def get_auto_provisioning_settings(self, subscription_id: str):
         try:
             client = self.get_client(subscription_id)
-            try:
-                return await run_concurrently(
-                    lambda: list(client.auto_provisioning_settings.list())
-                )
-            except AttributeError as ae:
-                if 'throttler' in str(ae):
-                    loop = asyncio.get_event_loop()
-                    return await loop.run_in_executor(
-                        None, lambda: list(client.auto_provisioning_settings.list())
-                    )
-                raise
+            return await self._run_concurrently(
+                lambda: list(client.auto_provisioning_settings.list())
+            )
         except Exception as e:
             print_exception(f'Failed to retrieve auto provisioning settings: {e}')
             return []
@@ -82,7 +54,7 @@ class SecurityCenterFacade:
         try:
             client = self.get_client(subscription_id)
             scope = f'/subscriptions/{subscription_id}'
-            return await run_concurrently(lambda: list(client.information_protection_policies.list(scope=scope)))
+            return await self._run_concurrently(lambda: list(client.information_protection_policies.list(scope=scope)))
         except Exception as e:
             print_exception(f'Failed to retrieve information protection policies: {e}')
             return []
@@ -90,18 +62,9 @@ class SecurityCenterFacade:
     async def get_settings(self, subscription_id: str):
         try:
             client = self.get_client(subscription_id)
-            try:
-                return await run_concurrently(
-                    lambda: list(client.settings.list())
-                )
-            except AttributeError as ae:
-                if 'throttler' in str(ae):
-                    loop = asyncio.get_event_loop()
-                    return await loop.run_in_executor(
-                        None, lambda: list(client.settings.list())
-                    )
-                else:
-                    raise
+            return await self._run_concurrently(
+                lambda: list(client.settings.list())
+            )
         except Exception as e:
             print_exception(f'Failed to retrieve settings: {e}')
             return []
@@ -109,18 +72,9 @@ class SecurityCenterFacade:
     async def get_alerts(self, subscription_id: str):
         try:
             client = self.get_client(subscription_id)
-            try:
-                return await run_concurrently(
-                    lambda: list(client.alerts.list())
-                )
-            except AttributeError as ae:
-                if 'throttler' in str(ae):
-                    loop = asyncio.get_event_loop()
-                    return await loop.run_in_executor(
-                        None, lambda: list(client.alerts.list())
-                    )
-                else:
-                    raise
+            return await self._run_concurrently(
+                lambda: list(client.alerts.list())
+            )
         except Exception as e:
             print_exception(f'Failed to retrieve alerts: {e}')
             return []
@@ -155,18 +109,9 @@ class SecurityCenterFacade:
         try:
             client = self.get_client(subscription_id)
             scope = f'/subscriptions/{subscription_id}'
-            try:
-                return await run_concurrently(
-                    lambda: self.remove_last_ItemPage_from_the_list(client.compliance_results.list(scope=scope))
-                )
-            except AttributeError as ae:
-                if 'throttler' in str(ae):
-                    loop = asyncio.get_event_loop()
-                    return await loop.run_in_executor(
-                        None, lambda: self.remove_last_ItemPage_from_the_list(client.compliance_results.list(scope=scope))
-                    )
-                else:
-                    raise
+            return await self._run_concurrently(
+                lambda: self.remove_last_ItemPage_from_the_list(client.compliance_results.list(scope=scope))
+            )
         except Exception as e:
             print_exception(f'Failed to retrieve compliance results: {e}')
             return []
@@ -176,17 +121,9 @@ class SecurityCenterFacade:
             client = self.get_client(subscription_id)
             results = []
             try:
-                compliance_standards = await run_concurrently(
+                compliance_standards = await self._run_concurrently(
                     lambda: list(client.regulatory_compliance_standards.list())
                 )
-            except AttributeError as ae:
-                if 'throttler' in str(ae):
-                    loop = asyncio.get_event_loop()
-                    compliance_standards = await loop.run_in_executor(
-                        None, lambda: list(client.regulatory_compliance_standards.list())
-                    )
-                else:
-                    raise
             except Exception as e:
                 if 'as it has no standard pricing bundle' in str(e):
                     print_debug(f'Failed to retrieve regulatory compliance standards: {e}')
@@ -196,19 +133,10 @@ class SecurityCenterFacade:
             else:
                 for standard in compliance_standards:
                     try:
-                        compliance_controls = await run_concurrently(
+                        compliance_controls = await self._run_concurrently(
                             lambda standard=standard: list(client.regulatory_compliance_controls.list(
                                 regulatory_compliance_standard_name=standard.name))
                         )
-                    except AttributeError as ae:
-                        if 'throttler' in str(ae):
-                            loop = asyncio.get_event_loop()
-                            compliance_controls = await loop.run_in_executor(
-                                None, lambda standard=standard: list(client.regulatory_compliance_controls.list(
-                                    regulatory_compliance_standard_name=standard.name))
-                            )
-                        else:
-                            raise
                     except Exception as e:
                         print_exception(f'Failed to retrieve compliance controls: {e}')
                         continue
@@ -1,41 +1,28 @@
 
 from azure.mgmt.sql import SqlManagementClient
-import asyncio
-from ScoutSuite.providers.utils import run_concurrently
+from ScoutSuite.providers.utils import RateLimitedFacade
 from ScoutSuite.core.console import print_exception
-from ScoutSuite.utils import get_user_agent
+from ScoutSuite.providers.azure.utils import get_management_client
 
 
-class SQLDatabaseFacade:
+class SQLDatabaseFacade(RateLimitedFacade):
+    provider = 'azure'
+    service = 'sqldatabase'
 
     def __init__(self, credentials):
         self.credentials = credentials
 
     def get_client(self, subscription_id: str):
-        client = SqlManagementClient(self.credentials.get_credentials(),
-                                     subscription_id=subscription_id,
-                                     user_agent=get_user_agent())
-
-        return client
+        return get_management_client(SqlManagementClient, self.credentials.get_credentials(), subscription_id)
 
     async def get_database_blob_auditing_policies(self, resource_group_name, server_name, database_name,
                                                   subscription_id: str):
         try:
             client = self.get_client(subscription_id)
-            try:
-                return await run_concurrently(
-                    lambda: client.database_blob_auditing_policies.get(
-                        resource_group_name, server_name, database_name)
-                )
-            except AttributeError as ae:
-                if 'throttler' in str(ae):
-                    loop = asyncio.get_event_loop()
-                    return await loop.run_in_executor(
-                        None, lambda: client.database_blob_auditing_policies.get(
-                            resource_group_name, server_name, database_name)
-                    )
-                else:
-                    raise
+            return await self._run_concurrently(
+                lambda: client.database_blob_auditing_policies.get(
+                    resource_group_name, server_name, database_name)
+            )
         except Exception as e:
             print_exception(f'Failed to retrieve database blob auditing policies: {e}')
             return []
@@ -44,20 +31,10 @@ class SQLDatabaseFacade:
                                                      subscription_id: str):
         try:
             client = self.get_client(subscription_id)
-            try:
-                return await run_concurrently(
-                    lambda: client.database_threat_detection_policies.get(resource_group_name, server_name, database_name,
-                                                                          'default')
-                )
-            except AttributeError as ae:
-                if 'throttler' in str(ae):
-                    loop = asyncio.get_event_loop()
-                    return await loop.run_in_executor(
-                        None, lambda: client.database_threat_detection_policies.get(resource_group_name, server_name, database_name,
-                                                                                    'default')
-                    )
-                else:
-                    raise
+            return await self._run_concurrently(
+                lambda: client.database_threat_detection_policies.get(resource_group_name, server_name, database_name,
+                                                                      'default')
+            )
         except Exception as e:
             print_exception(f'Failed to retrieve database threat detection policies: {e}')
             return []
@@ -65,18 +42,9 @@ class SQLDatabaseFacade:
     async def get_databases(self, resource_group_name, server_name, subscription_id: str):
         try:
             client = self.get_client(subscription_id)
-            try:
-                return await run_concurrently(
-                    lambda: list(client.databases.list_by_server(resource_group_name, server_name))
-                )
-            except AttributeError as ae:
-                if 'throttler' in str(ae):
-                    loop = asyncio.get_event_loop()
-                    return await loop.run_in_executor(
-                        None, lambda: list(client.databases.list_by_server(resource_group_name, server_name))
-                    )
-                else:
-                    raise
+            return await self._run_concurrently(
+                lambda: list(client.databases.list_by_server(resource_group_name, server_name))
+            )
         except Exception as e:
             print_exception(f'Failed to retrieve databases: {e}')
             return []
@@ -85,20 +53,10 @@ class SQLDatabaseFacade:
                                              subscription_id: str):
         try:
             client = self.get_client(subscription_id)
-            try:
-                return await run_concurrently(
-                    lambda: list(client.replication_links.list_by_database(
-                        resource_group_name, server_name, database_name))
-                )
-            except AttributeError as ae:
-                if 'throttler' in str(ae):
-                    loop = asyncio.get_event_loop()
-                    return await loop.run_in_executor(
-                        None, lambda: list(client.replication_links.list_by_database(
-                            resource_group_name, server_name, database_name))
-                    )
-                else:
-                    raise
+            return await self._run_concurrently(
+                lambda: list(client.replication_links.list_by_database(
+                    resource_group_name, server_name, database_name))
+            )
         except Exception as e:
             print_exception(f'Failed to retrieve database replication links: {e}')
             return []
@@ -106,18 +64,9 @@ class SQLDatabaseFacade:
     async def get_server_azure_ad_administrators(self, resource_group_name, server_name, subscription_id: str):
         try:
             client = self.get_client(subscription_id)
-            try:
-                return await run_concurrently(
-                    lambda: list(client.server_azure_ad_administrators.list_by_server(resource_group_name, server_name))
-                )
-            except AttributeError as ae:
-                if 'throttler' in str(ae):
-                    loop = asyncio.get_event_loop()
-                    return await loop.run_in_executor(
-                        None, lambda: list(client.server_azure_ad_administrators.list_by_server(resource_group_name, server_name))
-                    )
-                else:
-                    raise
+            return await self._run_concurrently(
+                lambda: list(client.server_azure_ad_administrators.list_by_server(resource_group_name, server_name))
+            )
         except Exception as e:
             print_exception(f'Failed to retrieve server azure ad administrators: {e}')
             return None
@@ -125,18 +74,9 @@ class SQLDatabaseFacade:
     async def get_server_blob_auditing_policies(self, resource_group_name, server_name, subscription_id: str):
         try:
             client = self.get_client(subscription_id)
-            try:
-                return await run_concurrently(
-                    lambda: client.server_blob_auditing_policies.get(resource_group_name, server_name)
-                )
-            except AttributeError as ae:
-                if 'throttler' in str(ae):
-                    loop = asyncio.get_event_loop()
-                    return await loop.run_in_executor(
-                        None, lambda: client.server_blob_auditing_policies.get(resource_group_name, server_name)
-                    )
-                else:
-                    raise
+            return await self._run_concurrently(
+                lambda: client.server_blob_auditing_policies.get(resource_group_name, server_name)
+            )
         except Exception as e:
             print_exception(f'Failed to retrieve server blob auditing policies: {e}')
             return []
@@ -144,18 +84,9 @@ class SQLDatabaseFacade:
     async def get_server_security_alert_policies(self, resource_group_name, server_name, subscription_id: str):
         try:
             client = self.get_client(subscription_id)
-            try:
-                return await run_concurrently(
-                    lambda: client.server_security_alert_policies.get(resource_group_name, server_name, 'default')
-                )
-            except AttributeError as ae:
-                if 'throttler' in str(ae):
-                    loop = asyncio.get_event_loop()
-                    return await loop.run_in_executor(
-                        None, lambda: client.server_security_alert_policies.get(resource_group_name, server_name, 'default')
-                    )
-                else:
-                    raise
+            return await self._run_concurrently(
+                lambda: client.server_security_alert_policies.get(resource_group_name, server_name, 'default')
+            )
         except Exception as e:
             print_exception(f'Failed to retrieve server security alert policies: {e}')
             return []
@@ -163,18 +94,9 @@ class SQLDatabaseFacade:
     async def get_servers(self, subscription_id: str):
         try:
             client = self.get_client(subscription_id)
-            try:
-                return await run_concurrently(
-                    lambda: list(client.servers.list())
-                )
-            except AttributeError as ae:
-                if 'throttler' in str(ae):
-                    loop = asyncio.get_event_loop()
-                    return await loop.run_in_executor(
-                        None, lambda: list(client.servers.list())
-                    )
-                else:
-                    raise
+            return await self._run_concurrently(
+                lambda: list(client.servers.list())
+            )
         except Exception as e:
             print_exception(f'Failed to retrieve servers: {e}')
             return []
@@ -183,20 +105,10 @@ class SQLDatabaseFacade:
                                                         subscription_id: str):
         try:
             client = self.get_client(subscription_id)
-            try:
-                return await run_concurrently(
-                    lambda: client.transparent_data_encryptions.get(
-                        resource_group_name, server_name, database_name, 'current')
-                )
-            except AttributeError as ae:
-                if 'throttler' in str(ae):
-                    loop = asyncio.get_event_loop()
-                    return await loop.run_in_executor(
-                        None, lambda: client.transparent_data_encryptions.get(
-                            resource_group_name, server_name, database_name, 'current')
-                    )
-                else:
-                    raise
+            return await self._run_concurrently(
+                lambda: client.transparent_data_encryptions.get(
+                    resource_group_name, server_name, database_name, 'current')
+            )
         except Exception as e:
             print_exception(f'Failed to retrieve database transparent data encryptions: {e}')
             return []
@@ -205,36 +117,18 @@ class SQLDatabaseFacade:
                                                    subscription_id: str):
         try:
             client = self.get_client(subscription_id)
-            try:
-                return await run_concurrently(
-                    lambda: client.server_vulnerability_assessments.get(resource_group_name, server_name, 'default')
-                )
-            except AttributeError as ae:
-                if 'throttler' in str(ae):
-                    loop = asyncio.get_event_loop()
-                    return await loop.run_in_executor(
-                        None, lambda: client.server_vulnerability_assessments.get(resource_group_name, server_name, 'default')
-                    )
-                else:
-                    raise
+            return await self._run_concurrently(
+                lambda: client.server_vulnerability_assessments.get(resource_group_name, server_name, 'default')
+            )
         except Exception as e:
             print_exception(f'Failed to retrieve server vulnerability assessments: {e}')
 
     async def get_server_encryption_protectors(self, resource_group_name, server_name, subscription_id: str):
         try:
             client = self.get_client(subscription_id)
-            try:
-                return await run_concurrently(
-                    lambda: client.encryption_protectors.get(resource_group_name, server_name, 'current')
-                )
-            except AttributeError as ae:
-                if 'throttler' in str(ae):
-                    loop = asyncio.get_event_loop()
-                    return await loop.run_in_executor(
-                        None, lambda: client.encryption_protectors.get(resource_group_name, server_name, 'current')
-                    )
-                else:
-                    raise
+            return await self._run_concurrently(
+                lambda: client.encryption_protectors.get(resource_group_name, server_name, 'current')
+            )
         except Exception as e:
             print_exception(f'Failed to retrieve database transparent data encryptions: {e}')
             return []
@@ -242,18 +136,9 @@ class SQLDatabaseFacade:
     async def get_firewall_rules(self, resource_group_name, server_name, subscription_id: str):
         try:
             client = self.get_client(subscription_id)
-            try:
-                return await run_concurrently(
-                    lambda: list(client.firewall_rules.list_by_server(resource_group_name, server_name))
-                )
-            except AttributeError as ae:
-                if 'throttler' in str(ae):
-                    loop = asyncio.get_event_loop()
-                    return await loop.run_in_executor(
-                        None, lambda: list(client.firewall_rules.list_by_server(resource_group_name, server_name))
-                    )
-                else:
-                    raise
+            return await self._run_concurrently(
+                lambda: list(client.firewall_rules.list_by_server(resource_group_name, server_name))
+            )
         except Exception as e:
             print_exception(f'Failed to retrieve firewalls rules: {e}')
             return []
@@ -1,39 +1,28 @@
 import datetime
-import asyncio
 from azure.mgmt.monitor import MonitorManagementClient
 from azure.mgmt.storage import StorageManagementClient
 
 from ScoutSuite.core.console import print_exception
-from ScoutSuite.providers.utils import run_concurrently, get_and_set_concurrently
-from ScoutSuite.utils import get_user_agent
+from ScoutSuite.providers.utils import get_and_set_concurrently, RateLimitedFacade
+from ScoutSuite.providers.azure.utils import get_management_client
 
 
-class StorageAccountsFacade:
+class StorageAccountsFacade(RateLimitedFacade):
+    provider = 'azure'
+    service = 'storageaccounts'
 
     def __init__(self, credentials):
         self.credentials = credentials
 
     def get_client(self, subscription_id: str):
-        client = StorageManagementClient(self.credentials.get_credentials(),
-                                         subscription_id=subscription_id,
-                                         user_agent=get_user_agent())
-        return client
+        return get_management_client(StorageManagementClient, self.credentials.get_credentials(), subscription_id)
 
     async def get_storage_accounts(self, subscription_id: str):
         try:
             client = self.get_client(subscription_id)
-            try:
-                storage_accounts = await run_concurrently(
-                    lambda: list(client.storage_accounts.list())
-                )
-            except AttributeError as ae:
-                if 'throttler' in str(ae):
-                    loop = asyncio.get_event_loop()
-                    storage_accounts = await loop.run_in_executor(
-                        None, lambda: list(client.storage_accounts.list())
-                    )
-                else:
-                    raise
+            storage_accounts = await self._run_concurrently(
+                lambda: list(client.storage_accounts.list())
+            )
         except Exception as e:
             print_exception(f'Failed to retrieve storage accounts: {e}')
             return []
@@ -45,18 +34,9 @@ class StorageAccountsFacade:
     async def get_blob_containers(self, resource_group_name, storage_account_name, subscription_id: str):
         try:
             client = self.get_client(subscription_id)
-            try:
-                containers = await run_concurrently(
-                    lambda: list(client.blob_containers.list(resource_group_name, storage_account_name))
-                )
-            except AttributeError as ae:
-                if 'throttler' in str(ae):
-                    loop = asyncio.get_event_loop()
-                    containers = await loop.run_in_executor(
-                        None, lambda: list(client.blob_containers.list(resource_group_name, storage_account_name))
-                    )
-                else:
-                    raise
+            containers = await self._run_concurrently(
+                lambda: list(client.blob_containers.list(resource_group_name, storage_account_name))
+            )
 
         except Exception as e:
             print_exception(f'Failed to retrieve blob containers: {e}')
@@ -67,18 +47,9 @@ class StorageAccountsFacade:
     async def get_blob_services(self, resource_group_name, storage_account_name, subscription_id: str):
         try:
             client = self.get_client(subscription_id)
-            try:
-                blob_services = await run_concurrently(
-                    lambda: list(client.blob_services.list(resource_group_name, storage_account_name))
-                )
-            except AttributeError as ae:
-                if 'throttler' in str(ae):
-                    loop = asyncio.get_event_loop()
-                    blob_services = await loop.run_in_executor(
-                        None, lambda: list(client.blob_services.list(resource_group_name, storage_account_name))
-                    )
-                else:
-                    raise
+            blob_services = await self._run_concurrently(
+                lambda: list(client.blob_services.list(resource_group_name, storage_account_name))
+            )
 
         except Exception as e:
             print_exception(f'Failed to retrieve blob services: {e}')
@@ -88,7 +59,7 @@ class StorageAccountsFacade:
             return blob_services
 
     async def _get_and_set_activity_logs(self, storage_account, subscription_id: str):
-        client = MonitorManagementClient(self.credentials.get_credentials(), subscription_id, user_agent=get_user_agent())
+        client = get_management_client(MonitorManagementClient, self.credentials.get_credentials(), subscription_id)
 
         # Time format used by Azure API:
         time_format = "%Y-%m-%dT%H:%M:%S.%f"
@@ -104,18 +75,9 @@ class StorageAccountsFacade:
             f"resourceId eq {storage_account.id}",
         ])
         try:
-            try:
-                activity_logs = await run_concurrently(
-                    lambda: list(client.activity_logs.list(filter=logs_filter, select="eventTimestamp, operationName"))
-                )
-            except AttributeError as ae:
-                if 'throttler' in str(ae):
-                    loop = asyncio.get_event_loop()
-                    activity_logs = await loop.run_in_executor(
-                        None, lambda: list(client.activity_logs.list(filter=logs_filter, select="eventTimestamp, operationName"))
-                    )
-                else:
-                    raise
+            activity_logs = await self._run_concurrently(
+                lambda: list(client.activity_logs.list(filter=logs_filter, select="eventTimestamp, operationName"))
+            )
         except Exception as e:
             print_exception(f'Failed to retrieve activity logs: {e}')
             setattr(storage_account, 'activity_logs', [])
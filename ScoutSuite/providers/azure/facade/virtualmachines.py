@@ -1,38 +1,26 @@
 from azure.mgmt.compute import ComputeManagementClient
-import asyncio
 
 from ScoutSuite.core.console import print_exception
-from ScoutSuite.providers.utils import run_concurrently
-from ScoutSuite.utils import get_user_agent
+from ScoutSuite.providers.utils import RateLimitedFacade
+from ScoutSuite.providers.azure.utils import get_management_client
 
 
-class VirtualMachineFacade:
+class VirtualMachineFacade(RateLimitedFacade):
+    provider = 'azure'
+    service = 'virtualmachines'
 
     def __init__(self, credentials):
         self.credentials = credentials
 
     def get_client(self, subscription_id: str):
-
-        client = ComputeManagementClient(self.credentials.get_credentials(),
-                                         subscription_id=subscription_id,
-                                         user_agent=get_user_agent())
-        return client
+        return get_management_client(ComputeManagementClient, self.credentials.get_credentials(), subscription_id)
 
     async def get_instances(self, subscription_id: str):
         try:
             client = self.get_client(subscription_id)
-            try:
-                return await run_concurrently(
-                    lambda: list(client.virtual_machines.list_all())
-                )
-            except AttributeError as ae:
-                if 'throttler' in str(ae):
-                    loop = asyncio.get_event_loop()
-                    return await loop.run_in_executor(
-                        None, lambda: list(client.virtual_machines.list_all())
-                    )
-                else:
-                    raise
+            return await self._run_concurrently(
+                lambda: list(client.virtual_machines.list_all())
+            )
         except Exception as e:
             print_exception(f'Failed to retrieve virtual machines: {e}')
             return []
@@ -42,19 +30,10 @@ class VirtualMachineFacade:
                                       resource_group: str):
         try:
             client = self.get_client(subscription_id)
-            try:
-                extensions = await run_concurrently(
-                    lambda: client.virtual_machine_extensions.list(resource_group,
-                                                                   instance_name)
-                )
-            except AttributeError as ae:
-                if 'throttler' in str(ae):
-                    loop = asyncio.get_event_loop()
-                    extensions = await loop.run_in_executor(
-                        None, lambda: client.virtual_machine_extensions.list(resource_group, instance_name)
-                    )
-                else:
-                    raise
+            extensions = await self._run_concurrently(
+                lambda: client.virtual_machine_extensions.list(resource_group,
+                                                               instance_name)
+            )
             return list(extensions.value)
         except Exception as e:
             print_exception(f'Failed to retrieve virtual machine extensions: {e}')
@@ -63,18 +42,9 @@ class VirtualMachineFacade:
     async def get_disks(self, subscription_id: str):
         try:
             client = self.get_client(subscription_id)
-            try:
-                return await run_concurrently(
-                    lambda: list(client.disks.list())
-                )
-            except AttributeError as ae:
-                if 'throttler' in str(ae):
-                    loop = asyncio.get_event_loop()
-                    return await loop.run_in_executor(
-                        None, lambda: list(client.disks.list())
-                    )
-                else:
-                    raise
+            return await self._run_concurrently(
+                lambda: list(client.disks.list())
+            )
         except Exception as e:
             print_exception(f'Failed to retrieve disks: {e}')
             return []
@@ -82,18 +52,9 @@ class VirtualMachineFacade:
     async def get_snapshots(self, subscription_id: str):
         try:
             client = self.get_client(subscription_id)
-            try:
-                return await run_concurrently(
-                    lambda: list(client.snapshots.list())
-                )
-            except AttributeError as ae:
-                if 'throttler' in str(ae):
-                    loop = asyncio.get_event_loop()
-                    return await loop.run_in_executor(
-                        None, lambda: list(client.snapshots.list())
-                    )
-                else:
-                    raise
+            return await self._run_concurrently(
+                lambda: list(client.snapshots.list())
+            )
         except Exception as e:
             print_exception(f'Failed to retrieve snapshots: {e}')
             return []
@@ -101,18 +62,9 @@ class VirtualMachineFacade:
     async def get_images(self, subscription_id: str):
         try:
             client = self.get_client(subscription_id)
-            try:
-                return await run_concurrently(
-                    lambda: list(client.images.list())
-                )
-            except AttributeError as ae:
-                if 'throttler' in str(ae):
-                    loop = asyncio.get_event_loop()
-                    return await loop.run_in_executor(
-                        None, lambda: list(client.images.list())
-                    )
-                else:
-                    raise
+            return await self._run_concurrently(
+                lambda: list(client.images.list())
+            )
         except Exception as e:
             print_exception(f'Failed to retrieve images: {e}')
             return []
@@ -1,10 +1,14 @@
+import asyncio
+
 from ScoutSuite.providers.azure.resources.base import AzureResources
 
 
 class Users(AzureResources):
     async def fetch_all(self):
-        for raw_user in await self.facade.aad.get_users():
-            id, user = await self._parse_user(raw_user)
+        # Users are parsed concurrently so that their groups are requested in the same batches, and stored in the order
+        # they were listed
+        raw_users = await self.facade.aad.get_users()
+        for id, user in await asyncio.gather(*[self._parse_user(raw_user) for raw_user in raw_users]):
             self[id] = user
 
     async def fetch_additional_users(self, user_list):
@@ -12,11 +16,9 @@ class Users(AzureResources):
         Alternative method which only fetches defined users
         :param user_list: a list of the users to fetch and parse
         """
-        for user in user_list:
-            raw_user = await self.facade.aad.get_user(user)
-            if raw_user:
-                id, user = await self._parse_user(raw_user)
-                self[id] = user
+        raw_users = await asyncio.gather(*[self.facade.aad.get_user(user) for user in user_list])
+        for id, user in await asyncio.gather(*[self._parse_user(raw_user) for raw_user in raw_users if raw_user]):
+            self[id] = user
 
     async def _parse_user(self, raw_user):
         user_dict = {}
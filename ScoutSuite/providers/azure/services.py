@@ -74,11 +74,14 @@ class AzureServicesConfig(BaseServicesConfig):
         return provider_name == 'azure'
 
     async def fetch(self, services: list, regions: list, excluded_regions: list):
-        await super().fetch(services, regions, excluded_regions)
+        try:
+            await super().fetch(services, regions, excluded_regions)
 
-        # This is a unique case where we'll want to fetch additional resources (in the AAD service) in the
-        # event the RBAC service was included. There's no existing cross-service fetching logic (only cross-service
-        # processing), hence why we needed to add this.
-        if 'rbac' in services and 'aad' in services:
-            user_list = self.rbac.get_user_id_list()
-            await self.aad.fetch_additional_users(user_list)
+            # This is a unique case where we'll want to fetch additional resources (in the AAD service) in the
+            # event the RBAC service was included. There's no existing cross-service fetching logic (only
+            # cross-service processing), hence why we needed to add this.
+            if 'rbac' in services and 'aad' in services:
+                user_list = self.rbac.get_user_id_list()
+                await self.aad.fetch_additional_users(user_list)
+        finally:
+            await self.aad.facade.aad.close()
@@ -1,5 +1,81 @@
 import re
+import threading
+import time
+
+import requests
+from azure.core.pipeline.transport import RequestsTransport
+from urllib3.util.retry import Retry
+
+from ScoutSuite.providers.utils import get_max_workers
+from ScoutSuite.utils import get_user_agent
+
+_transport = {'transport': None}
+_transport_lock = threading.Lock()
+# Management clients, by (client class, credentials, subscription)
+_clients = {}
+_clients_lock = threading.Lock()
 
 
 def get_resource_group_name(id):
     return re.findall("/resourceGroups/(.*?)/", id)[0]
+
+
+def get_transport():
+    """
+    Get the HTTP transport shared by the management clients, whose connection pool is sized to the number of threads
+    making API calls (--max-workers)
+    """
+    with _transport_lock:
+        if not _transport['transport']:
+            session = requests.Session()
+            # Retries are handled by the clients' pipelines, as with the SDK's default transport
+            adapter = requests.adapters.HTTPAdapter(pool_connections=get_max_workers(),
+                                                    pool_maxsize=get_max_workers(),
+                                                    max_retries=Retry(total=False, redirect=False,
+                                                                      raise_on_status=False))
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _transport['transport'] = RequestsTransport(session=session, session_owner=False)
+        return _transport['transport']
+
+
+def get_management_client(client_class, credentials, subscription_id=None):
+    """
+    Get the management client of a subscription, created once per run so that all the facades' calls share its
+    pipeline and the transport's connection pool
+
+    :param client_class:            Class of the client, e.g. NetworkManagementClient
+    :param credentials:             Credentials of the client, see AzureCredentials.get_credentials
+    :param subscription_id:         ID of the subscription, for the clients scoped to one
+    :return:
+    """
+    key = (client_class, credentials, subscription_id)
+    with _clients_lock:
+        if key not in _clients:
+            args = (credentials, subscription_id) if subscription_id else (credentials,)
+            _clients[key] = client_class(*args, user_agent=get_user_agent(), transport=get_transport())
+        return _clients[key]
+
+
+class CachedTokenCredential:
+    """
+    Credential caching the tokens of the wrapped credential until `refresh_margin` seconds before they expire. Some
+    credentials, such as AzureCliCredential, would otherwise request a new token for every client and thread.
+    """
+    refresh_margin = 300
+
+    def __init__(self, credential):
+        self.credential = credential
+        self._tokens = {}
+        self._lock = threading.Lock()
+
+    def get_token(self, *scopes, **kwargs):
+        # Tokens requested for a claims challenge are never cached
+        if kwargs.get('claims'):
+            return self.credential.get_token(*scopes, **kwargs)
+        key = (scopes, kwargs.get('tenant_id'))
+        with self._lock:
+            token = self._tokens.get(key)
+            if not token or token.expires_on - self.refresh_margin < time.time():
+                token = self._tokens[key] = self.credential.get_token(*scopes, **kwargs)
+            return token
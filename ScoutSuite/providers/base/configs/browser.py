@@ -1,4 +1,4 @@
-import copy
+from functools import lru_cache
 
 from ScoutSuite.core.console import print_exception
 
@@ -52,7 +52,7 @@ def get_value_at(all_info, current_path, key, to_string=False):
     :param to_string:       Whether or not the returned value should be casted as a string
     :return:                The value in `all_info` indicated by the `key` in `current_path`
     """
-    keys = key.split('.')
+    keys = _split_key(key)
     if keys[-1] == 'id':
         target_obj = current_path[len(keys) - 1]
     else:
@@ -73,16 +73,15 @@ def get_value_at(all_info, current_path, key, to_string=False):
                         target_path.append(key)
                 except Exception as e:
                     print_exception(f'Unable to get index \"{i}\" from path \"{current_path}\": {e}',
-                                    additional_details={'current_path': current_path,
+                                    additional_details={'current_path': list(current_path),
                                                         'target_path': target_path,
                                                         'key': key,
                                                         'i': i})
                     return None
             if len(keys) > len(current_path):
-                target_path = target_path + keys[len(target_path):]
+                target_path = target_path + list(keys[len(target_path):])
         else:
-            target_path = copy.deepcopy(current_path)
-            target_path.append(key)
+            target_path = [*current_path, key]
         target_obj = all_info
         for p in target_path:
             try:
@@ -102,7 +101,7 @@ def get_value_at(all_info, current_path, key, to_string=False):
                     target_obj = target_obj.get(p)
             except Exception as e:
                 print_exception(f'Unable to get \"{p}\" from target object \"{target_obj}\" in path \"{target_path}\": {e}',
-                                additional_details={'current_path': current_path,
+                                additional_details={'current_path': list(current_path),
                                                     'target_obj': target_obj,
                                                     'p': p})
                 return None
@@ -110,3 +109,8 @@ def get_value_at(all_info, current_path, key, to_string=False):
         return str(target_obj)
     else:
         return target_obj
+
+
+@lru_cache(maxsize=4096)
+def _split_key(key):
+    return tuple(key.split('.'))
@@ -1,16 +1,19 @@
 from ScoutSuite.core.console import print_exception
 from ScoutSuite.providers.do.authentication_strategy import DoCredentials
-from ScoutSuite.providers.utils import run_concurrently
+from ScoutSuite.providers.utils import RateLimitedFacade
 
 
-class DatabasesFacade:
+class DatabasesFacade(RateLimitedFacade):
+    provider = 'do'
+    service = 'database'
+
     def __init__(self, credentials: DoCredentials):
         self._credentials = credentials
         self._client = credentials.client
 
     async def get_databases(self):
         try:
-            databases = await run_concurrently(
+            databases = await self._run_concurrently(
                 lambda: self._client.databases.list_clusters()["databases"]
             )
             return databases
@@ -20,7 +23,7 @@ class DatabasesFacade:
 
     async def get_databaseusers(self, db_uuid):
         try:
-            db_users = await run_concurrently(
+            db_users = await self._run_concurrently(
                 lambda: self._client.databases.list_users(db_uuid)["users"]
             )
             return db_users
@@ -30,7 +33,7 @@ class DatabasesFacade:
 
     async def get_eviction_policy(self, db_uuid):
         try:
-            eviction_policy = await run_concurrently(
+            eviction_policy = await self._run_concurrently(
                 lambda: self._client.databases.get_eviction_policy(db_uuid)[
                     "eviction_policy"
                 ]
@@ -42,7 +45,7 @@ class DatabasesFacade:
 
     async def get_connection_pools(self, db_uuid):
         try:
-            connection_pools = await run_concurrently(
+            connection_pools = await self._run_concurrently(
                 lambda: self._client.databases.list_connection_pools(db_uuid)["pools"]
             )
             return connection_pools
@@ -52,7 +55,7 @@ class DatabasesFacade:
 
     async def get_firewalls(self, db_uuid):
         try:
-            firewall_rules = await run_concurrently(
+            firewall_rules = await self._run_concurrently(
                 lambda: self._client.databases.list_firewall_rules(db_uuid)
             )
             return firewall_rules
@@ -62,7 +65,7 @@ class DatabasesFacade:
 
     async def get_resources(self, tag):
         try:
-            resources = await run_concurrently(
+            resources = await self._run_concurrently(
                 lambda: self._client.tags.get(tag)["tag"]["resources"]
             )
             return resources
@@ -2,11 +2,14 @@ from botocore.exceptions import ClientError
 import boto3
 from ScoutSuite.core.console import print_exception, print_debug, print_warning
 from ScoutSuite.providers.aws.facade.utils import AWSFacadeUtils
-from ScoutSuite.providers.utils import run_concurrently, get_and_set_concurrently
+from ScoutSuite.providers.utils import get_and_set_concurrently, RateLimitedFacade
 from ScoutSuite.providers.do.authentication_strategy import DoCredentials
 
 
-class SpacesFacade:
+class SpacesFacade(RateLimitedFacade):
+    provider = 'do'
+    service = 'spaces'
+
     def __init__(self, credentials: DoCredentials):
         self._credentials = credentials
         self._client = credentials.client
@@ -27,7 +30,7 @@ class SpacesFacade:
             exception = None
             try:
                 client = self.get_client("s3", self.session, region)
-                buckets = await run_concurrently(
+                buckets = await self._run_concurrently(
                     lambda: client.list_buckets()["Buckets"]
                 )
             except Exception as e:
@@ -61,7 +64,9 @@ class SpacesFacade:
         client = self.get_client("s3", self.session, bucket["region"])        
         try:
             # Attempt to get the CORS configuration
-            response = client.get_bucket_cors(Bucket=bucket["Name"])
+            response = await self._run_concurrently(
+                lambda: client.get_bucket_cors(Bucket=bucket["Name"])
+            )
             if 'CORSRules' in response:
                 bucket["CORS"] = response['CORSRules']
             else:
@@ -75,7 +80,7 @@ class SpacesFacade:
     async def _get_and_set_s3_bucket_location(self, bucket: {}, region=None):
         client = self.get_client("s3", self.session, region)
         try:
-            location = await run_concurrently(
+            location = await self._run_concurrently(
                 lambda: client.get_bucket_location(Bucket=bucket["Name"])
             )
         except Exception as e:
@@ -110,11 +115,11 @@ class SpacesFacade:
         try:
             grantees = {}
             if key_name:
-                grants = await run_concurrently(
+                grants = await self._run_concurrently(
                     lambda: client.get_object_acl(Bucket=bucket_name, Key=key_name)
                 )
             else:
-                grants = await run_concurrently(
+                grants = await self._run_concurrently(
                     lambda: client.get_bucket_acl(Bucket=bucket_name)
                 )
             for grant in grants["Grants"]:
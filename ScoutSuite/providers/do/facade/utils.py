@@ -14,11 +14,13 @@ class DOFacadeUtils:
         while next_page:
             if filters:
                 resp = await run_concurrently(
-                    lambda: list_client(**filters, per_page=per_page, page=current_page)
+                    lambda: list_client(**filters, per_page=per_page, page=current_page),
+                    rate_limit_key=('do', None, None)
                 )
             else:
                 resp = await run_concurrently(
-                    lambda: list_client(per_page=per_page, page=current_page)
+                    lambda: list_client(per_page=per_page, page=current_page),
+                    rate_limit_key=('do', None, None)
                 )
             if object_name in final_output.keys():
                 final_output[object_name].extend(resp[object_name])
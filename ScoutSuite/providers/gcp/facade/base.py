@@ -44,8 +44,7 @@ class GCPFacade(GCPBaseFacade):
         self.stackdriverlogging = StackdriverLoggingFacade()
         self.stackdrivermonitoring = StackdriverMonitoringFacade()
 
-        # lock to minimize concurrent calls to get_services()
-        self.projects_services_lock = False
+        # Enabled services of each project, fetched once per run
         self.projects_services = {}
 
         # Instantiate facades for proprietary services
@@ -103,7 +102,7 @@ class GCPFacade(GCPBaseFacade):
             return None
 
         resourcemanager_client = self._get_client()
-        resourcemanager_client_v2 = self._build_arbitrary_client('cloudresourcemanager', 'v2', force_new=True)
+        resourcemanager_client_v2 = self._build_arbitrary_client('cloudresourcemanager', 'v2')
 
         projects = []
 
@@ -152,47 +151,40 @@ class GCPFacade(GCPBaseFacade):
         finally:
             return projects
 
-    async def get_enabled_services(self, project_id, attempt=1, has_lock=False):
-        timeout = 60*attempt
-        if project_id not in self.projects_services:
-            # not locked, make query
-            if has_lock or not self.projects_services_lock:
-                self.projects_services_lock = True
-                try:
-                    serviceusage_client = self._build_arbitrary_client('serviceusage', 'v1', force_new=True)
-                    services = serviceusage_client.services()
-                    request = services.list(parent=f'projects/{project_id}', pageSize=200, filter="state:ENABLED")
-                    services_response = await GCPFacadeUtils.get_all('services', request, services)
-                    self.projects_services[project_id] = services_response
-                    self.projects_services_lock = False
-                    return self.projects_services[project_id]
-                except Exception as e:
-                    # hit quota, wait and retry
-                    if ('API_SHARED_QUOTA_EXHAUSTED' in str(e) or 'RATE_LIMIT_EXCEEDED' in str(e)) and attempt <= 10:
-                        print_warning(f"Service Usage quotas exceeded for project \"{project_id}\", retrying in {timeout}s")
-                        await asyncio.sleep(timeout)
-                        return await self.get_enabled_services(project_id, attempt + 1, has_lock=True)
-                    # unknown error
-                    else:
-                        print_warning(f"Could not fetch the state of services for project \"{project_id}\": {e}")
-                        self.projects_services_lock = False
-                        return None
-            # locked, wait and retry
-            else:
-                if attempt <= 10:  # need to set a limit to ensure we don't hit recursion limits
-                    if attempt != 1:
-                        print_debug(f"Lock already acquired for get_services() on project \"{project_id}\", retrying in {timeout}s")
-                        await asyncio.sleep(timeout)
-                    # set a lower threshold for the first attempt so that execution runs faster when there aren't any issues
-                    else:
-                        await asyncio.sleep(10)
-                    return await self.get_enabled_services(project_id, attempt + 1)
+    def prefetch_enabled_services(self, project_ids):
+        """
+        Start fetching the enabled services of projects concurrently, for the services to share the results
+        """
+        for project_id in project_ids:
+            if project_id not in self.projects_services:
+                self.projects_services[project_id] = asyncio.ensure_future(self._get_enabled_services(project_id))
+
+    async def get_enabled_services(self, project_id):
+        """
+        Returns the enabled services of a project, which are fetched once per run: concurrent callers share the same
+        request
+        """
+        self.prefetch_enabled_services([project_id])
+        # A cancelled caller must not cancel the request for the others
+        return await asyncio.shield(self.projects_services[project_id])
+
+    async def _get_enabled_services(self, project_id):
+        for attempt in range(1, 12):
+            try:
+                serviceusage_client = self._build_arbitrary_client('serviceusage', 'v1')
+                services = serviceusage_client.services()
+                request = services.list(parent=f'projects/{project_id}', pageSize=200, filter="state:ENABLED")
+                return await GCPFacadeUtils.get_all('services', request, services)
+            except Exception as e:
+                # hit quota, wait and retry
+                if ('API_SHARED_QUOTA_EXHAUSTED' in str(e) or 'RATE_LIMIT_EXCEEDED' in str(e)) and attempt <= 10:
+                    timeout = 60 * attempt
+                    print_warning(f"Service Usage quotas exceeded for project \"{project_id}\", retrying in {timeout}s")
+                    await asyncio.sleep(timeout)
+                # unknown error
                 else:
-                    print_warning(f"Could not fetch the state of services for project \"{project_id}\", "
-                                  f"exiting before hitting maximum recursion")
+                    print_warning(f"Could not fetch the state of services for project \"{project_id}\": {e}")
                     return None
-        else:
-            return self.projects_services[project_id]
 
     async def is_api_enabled(self, project_id, service):
         """
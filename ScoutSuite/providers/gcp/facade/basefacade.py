@@ -3,55 +3,177 @@
 # resolves the following:
 #   - https://github.com/nccgroup/ScoutSuite/issues/443
 #   - https://github.com/nccgroup/ScoutSuite/issues/665
+import hashlib
+import json
+import os
+import threading
+import time
+
+import certifi
 import httplib2shim
-httplib2shim.patch()
+import urllib3
 
 from googleapiclient import http
 from googleapiclient import discovery
 
+from ScoutSuite.core.console import print_debug
+from ScoutSuite.providers.utils import get_max_workers, RateLimitedFacade
 from ScoutSuite.utils import get_user_agent
 
 
-class GCPBaseFacade:
+def _make_pool(http, proxy_info):
+    """
+    Size the clients' connection pools to the number of threads making API calls (--max-workers). Same as httplib2shim's
+    default otherwise, which fails since Python 3.10 as it refers to collections.Callable. Only relies on the public
+    make_pool hook of httplib2shim.patch, certifi and urllib3.
+    """
+    if callable(proxy_info):
+        proxy_info = proxy_info()
+    if not http.ca_certs:
+        http.ca_certs = certifi.where()
+    cert_reqs = 'CERT_REQUIRED' if http.ca_certs and not http.disable_ssl_certificate_validation else None
+    pool_args = {'ca_certs': http.ca_certs, 'cert_reqs': cert_reqs, 'maxsize': get_max_workers()}
+    if not proxy_info:
+        return urllib3.PoolManager(**pool_args)
+    proxy_headers = {}
+    if proxy_info.proxy_user and proxy_info.proxy_pass:
+        proxy_credentials = f'{proxy_info.proxy_user}:{proxy_info.proxy_pass}'
+        proxy_url = f'http://{proxy_credentials}@{proxy_info.proxy_host}:{proxy_info.proxy_port}/'
+        proxy_headers = urllib3.util.request.make_headers(proxy_basic_auth=proxy_credentials)
+    else:
+        proxy_url = f'http://{proxy_info.proxy_host}:{proxy_info.proxy_port}/'
+    return urllib3.ProxyManager(proxy_url=proxy_url, proxy_headers=proxy_headers, **pool_args)
+
+
+httplib2shim.patch(_make_pool)
+
+
+# Discovery service the documents are downloaded from instead of using the ones bundled with the client library, e.g.
+# a local stand-in of the APIs, and the index of the documents downloaded by the previous runs (see DiscoveryCache)
+_discovery = {'service_url': None, 'cache_file': None}
+# Clients built from the discovery documents, by (name, version). They are shared by the threads making API calls, as
+# httplib2shim makes their HTTP connections thread-safe
+_clients = {}
+
+
+def set_discovery_options(service_url=None, cache_file=None):
+    """
+    Download the discovery documents from a discovery service and cache them on disk
+
+    :param service_url:             URI template of the discovery documents, with {api} and {apiVersion} placeholders.
+                                    The documents bundled with the client library are used if not set.
+    :param cache_file:              Index of the cached documents, see DiscoveryCache
+    """
+    _discovery['service_url'] = service_url
+    _discovery['cache_file'] = cache_file
+    _clients.clear()
+
+
+def build_client(client_name, client_version):
+    """
+    Build a client once per run, as parsing the discovery document takes a while for the larger APIs
+    """
+    key = (client_name, client_version)
+    if key not in _clients:
+        if _discovery['service_url']:
+            client = discovery.build(client_name, client_version,
+                                     discoveryServiceUrl=_discovery['service_url'], static_discovery=False,
+                                     cache_discovery=True, cache=DiscoveryCache(_discovery['cache_file']))
+        else:
+            client = discovery.build(client_name, client_version, cache_discovery=False)
+        http.set_user_agent(client._http, get_user_agent())  # force set custom user agent
+        # Threads building the same client concurrently all end up using the first one
+        return _clients.setdefault(key, client)
+    return _clients[key]
+
+
+class GCPBaseFacade(RateLimitedFacade):
+    provider = 'gcp'
+
     def __init__(self, client_name: str, client_version: str):
         self._client_name = client_name
         self._client_version = client_version
-        self._client = None
+
+    @property
+    def service(self):
+        # The calls share the rate limiter of their API with the requests of GCPFacadeUtils
+        return self._client_name
 
     def _build_client(self) -> discovery.Resource:
         return self._build_arbitrary_client(self._client_name, self._client_version)
 
-    def _build_arbitrary_client(self, client_name, client_version, force_new=False):
+    def _build_arbitrary_client(self, client_name, client_version):
         """
         :param client_name: name of the service
-        :param client_version:  version of the client to create
-        :param force_new: whether to create a new client - useful to create arbitrary clients from facades
+        :param client_version:  version of the client to create, the clients being shared by all the facades
         :return:
         """
-
-        if force_new:
-            client = discovery.build(client_name, client_version, cache_discovery=False, cache=MemoryCache())
-            http.set_user_agent(client._http, get_user_agent())  # force set custom user agent
-            return client
-        else:
-            if not self._client:
-                client = discovery.build(client_name, client_version, cache_discovery=False, cache=MemoryCache())
-                http.set_user_agent(client._http, get_user_agent())  # force set custom user agent
-                self._client = client
-            return self._client
+        return build_client(client_name, client_version)
 
     def _get_client(self) -> discovery.Resource:
         return self._build_client()
 
 
-class MemoryCache:
+class DiscoveryCache:
     """
+    Cache of the downloaded discovery documents, in memory and on disk for `ttl` seconds. The documents are stored next
+    to the index file under the SHA-256 of their content, and the index maps their URL to the hash and download time.
     Workaround https://github.com/googleapis/google-api-python-client/issues/325#issuecomment-274349841
     """
     _cache = {}
+    _lock = threading.Lock()
+    ttl = 24 * 3600
+
+    def __init__(self, index_file=None):
+        self.index_file = index_file
+        self.documents_dir = os.path.splitext(index_file)[0] if index_file else None
 
     def get(self, url):
-        return MemoryCache._cache.get(url)
+        if url in DiscoveryCache._cache:
+            return DiscoveryCache._cache[url]
+        if not self.index_file:
+            return None
+        try:
+            entry = self._load_index().get(url)
+            if not entry or time.time() - entry['time'] > self.ttl:
+                return None
+            with open(os.path.join(self.documents_dir, f'{entry["sha256"]}.json')) as f:
+                content = f.read()
+            if hashlib.sha256(content.encode('utf-8')).hexdigest() != entry['sha256']:
+                return None
+        except Exception as e:
+            print_debug(f'Ignoring the cached discovery document of {url}: {e}')
+            return None
+        DiscoveryCache._cache[url] = content
+        return content
 
     def set(self, url, content):
-        MemoryCache._cache[url] = content
+        DiscoveryCache._cache[url] = content
+        if not self.index_file:
+            return
+        digest = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        try:
+            with DiscoveryCache._lock:
+                os.makedirs(self.documents_dir, exist_ok=True)
+                document_file = os.path.join(self.documents_dir, f'{digest}.json')
+                if not os.path.isfile(document_file):
+                    self._write(document_file, content)
+                index = self._load_index()
+                index[url] = {'sha256': digest, 'time': time.time()}
+                self._write(self.index_file, json.dumps(index))
+        except Exception as e:
+            print_debug(f'Failed to cache the discovery document of {url}: {e}')
+
+    def _load_index(self):
+        if not os.path.isfile(self.index_file):
+            return {}
+        with open(self.index_file) as f:
+            return json.load(f)
+
+    @staticmethod
+    def _write(file_name, content):
+        # Other runs may read the file concurrently
+        temporary_file = f'{file_name}.{os.getpid()}.tmp'
+        with open(temporary_file, 'w') as f:
+            f.write(content)
+        os.replace(temporary_file, file_name)
@@ -1,6 +1,5 @@
 from ScoutSuite.core.console import print_exception
 from ScoutSuite.providers.gcp.facade.basefacade import GCPBaseFacade
-from ScoutSuite.providers.utils import run_concurrently
 
 class CloudResourceManagerFacade(GCPBaseFacade):
     def __init__(self):
@@ -9,7 +8,7 @@ class CloudResourceManagerFacade(GCPBaseFacade):
     async def get_member_bindings(self, project_id: str):
         try:
             cloudresourcemanager_client = self._get_client()
-            response = await run_concurrently(
+            response = await self._run_concurrently(
                     lambda: cloudresourcemanager_client.projects().getIamPolicy(resource=project_id).execute()
             )
             return response.get('bindings', [])
@@ -2,11 +2,13 @@ from google.cloud import storage
 from google.api_core.gapic_v1.client_info import ClientInfo
 
 from ScoutSuite.core.console import print_exception
-from ScoutSuite.providers.utils import run_concurrently, get_and_set_concurrently
+from ScoutSuite.providers.utils import get_and_set_concurrently, RateLimitedFacade
 from ScoutSuite.utils import get_user_agent
 
 
-class CloudStorageFacade:
+class CloudStorageFacade(RateLimitedFacade):
+    provider = 'gcp'
+    service = 'storage'
 
     def get_client(self, project_id: str):
         client_info = ClientInfo(user_agent=get_user_agent())
@@ -17,7 +19,7 @@ class CloudStorageFacade:
     async def get_buckets(self, project_id: str):
         try:
             client = self.get_client(project_id)
-            buckets = await run_concurrently(lambda: list(client.list_buckets()))
+            buckets = await self._run_concurrently(lambda: list(client.list_buckets()))
             await get_and_set_concurrently([self._get_and_set_bucket_logging, 
                 self._get_and_set_bucket_iam_policy], buckets)
             return buckets
@@ -27,7 +29,7 @@ class CloudStorageFacade:
 
     async def _get_and_set_bucket_logging(self, bucket):
         try:
-            bucket_logging = await run_concurrently(lambda: bucket.get_logging())
+            bucket_logging = await self._run_concurrently(lambda: bucket.get_logging())
             setattr(bucket, 'logging', bucket_logging)
         except Exception as e:
             print_exception(f'Failed to retrieve bucket logging: {e}')
@@ -35,7 +37,7 @@ class CloudStorageFacade:
 
     async def _get_and_set_bucket_iam_policy(self, bucket):
         try:
-            bucket_iam_policy = await run_concurrently(lambda: bucket.get_iam_policy())
+            bucket_iam_policy = await self._run_concurrently(lambda: bucket.get_iam_policy())
             setattr(bucket, 'iam_policy', bucket_iam_policy)
         except Exception as e:
             print_exception(f'Failed to retrieve bucket IAM policy: {e}')
@@ -1,7 +1,6 @@
 from ScoutSuite.core.console import print_exception
 from ScoutSuite.providers.gcp.facade.basefacade import GCPBaseFacade
 from ScoutSuite.providers.gcp.facade.utils import GCPFacadeUtils
-from ScoutSuite.providers.utils import run_concurrently
 
 
 class DNSFacade(GCPBaseFacade):
@@ -11,7 +10,7 @@ class DNSFacade(GCPBaseFacade):
     async def get_zones(self, project_id):
         try:
             dns_client = self._get_client()
-            return await run_concurrently(
+            return await self._run_concurrently(
                 lambda: dns_client.managedZones().list(project=project_id).execute()
             )
         except Exception as e:
@@ -1,7 +1,7 @@
 from ScoutSuite.core.console import print_exception
 from ScoutSuite.providers.gcp.facade.basefacade import GCPBaseFacade
 from ScoutSuite.providers.gcp.facade.utils import GCPFacadeUtils
-from ScoutSuite.providers.utils import map_concurrently, run_concurrently, get_and_set_concurrently
+from ScoutSuite.providers.utils import map_concurrently, get_and_set_concurrently
 
 
 class FunctionsFacade(GCPBaseFacade):
@@ -32,7 +32,7 @@ class FunctionsFacade(GCPBaseFacade):
             return functions
 
     async def _list_functions_version(self, project_id: str, api_version: str):
-        functions_client = self._build_arbitrary_client(self._client_name, api_version, force_new=True)
+        functions_client = self._build_arbitrary_client(self._client_name, api_version)
         parent = f'projects/{project_id}/locations/-'
         functions = functions_client.projects().locations().functions()
         request = functions.list(parent=parent)
@@ -41,20 +41,20 @@ class FunctionsFacade(GCPBaseFacade):
 
     async def _get_function_version(self, name: str, api_version: str):
         try:
-            functions_client = self._build_arbitrary_client(self._client_name, api_version, force_new=True)
+            functions_client = self._build_arbitrary_client(self._client_name, api_version)
             functions = functions_client.projects().locations().functions()
             request = functions.get(name=name)
-            return await run_concurrently(lambda: request.execute())
+            return await self._run_concurrently(lambda: request.execute())
         except Exception as e:
             print_exception(f'Failed to get Cloud Functions functions ({api_version}): {e}')
             return {}
 
     async def _get_and_set_function_iam_policy(self, function, api_version: str):
         try:
-            functions_client = self._build_arbitrary_client(self._client_name, api_version, force_new=True)
+            functions_client = self._build_arbitrary_client(self._client_name, api_version)
             functions = functions_client.projects().locations().functions()
             request = functions.getIamPolicy(resource=function.get('name'))
-            policy = await run_concurrently(lambda: request.execute())
+            policy = await self._run_concurrently(lambda: request.execute())
             # setattr(function, 'bindings', policy.get('bindings', []))
             function['bindings'] = policy.get('bindings', [])
         except Exception as e:
@@ -1,7 +1,6 @@
 from ScoutSuite.core.console import print_exception, print_warning
 from ScoutSuite.providers.gcp.facade.basefacade import GCPBaseFacade
 from ScoutSuite.providers.gcp.facade.utils import GCPFacadeUtils
-from ScoutSuite.providers.utils import run_concurrently
 
 
 class GCEFacade(GCPBaseFacade):
@@ -13,7 +12,7 @@ class GCEFacade(GCPBaseFacade):
             gce_client = self._get_client()
             request = gce_client.disks().list(project=project_id, zone=zone)
             disks_group = gce_client.disks()
-            return await GCPFacadeUtils.get_all('items', request, disks_group)
+            return await GCPFacadeUtils.get_all('items', request, disks_group, gce_client)
         except Exception as e:
             print_exception(f'Failed to retrieve disks: {e}')
             return []
@@ -34,7 +33,7 @@ class GCEFacade(GCPBaseFacade):
             gce_client = self._get_client()
             request = gce_client.instances().list(project=project_id, zone=zone)
             instances_group = gce_client.instances()
-            instances = await GCPFacadeUtils.get_all('items', request, instances_group)
+            instances = await GCPFacadeUtils.get_all('items', request, instances_group, gce_client)
         except Exception as e:
             print_exception(f'Failed to retrieve compute instances: {e}')
         else:
@@ -65,9 +64,7 @@ class GCEFacade(GCPBaseFacade):
     async def get_project(self, project_id):
         try:
             gce_client = self._get_client()
-            return await run_concurrently(
-                lambda: gce_client.projects().get(project=project_id).execute()
-            )
+            return await GCPFacadeUtils.execute(gce_client.projects().get(project=project_id), gce_client)
         except Exception as e:
             print_exception(f'Failed to retrieve GCE project: {e}')
             return None
@@ -95,10 +92,8 @@ class GCEFacade(GCPBaseFacade):
     async def get_subnetwork(self, project_id, region, subnetwork_id):
         try:
             gce_client = self._get_client()
-            return await run_concurrently(
-                lambda: gce_client.subnetworks().get(project=project_id, region=region,
-                                                     subnetwork=subnetwork_id).execute()
-            )
+            return await GCPFacadeUtils.execute(
+                gce_client.subnetworks().get(project=project_id, region=region, subnetwork=subnetwork_id), gce_client)
         except Exception as e:
             if 'was not found' in str(e):
                 print_warning(f'Failed to retrieve subnetwork: {e}')
@@ -111,7 +106,7 @@ class GCEFacade(GCPBaseFacade):
             gce_client = self._get_client()
             request = gce_client.subnetworks().list(project=project_id, region=region)
             subnetworks_group = gce_client.subnetworks()
-            return await GCPFacadeUtils.get_all('items', request, subnetworks_group)
+            return await GCPFacadeUtils.get_all('items', request, subnetworks_group, gce_client)
         except Exception as e:
             if 'was not found' in str(e):
                 print_warning(f'Failed to retrieve subnetworks: {e}')
@@ -134,7 +129,7 @@ class GCEFacade(GCPBaseFacade):
             gce_client = self._get_client()
             request = gce_client.forwardingRules().list(project=project_id, region=region)
             forwarding_rules = gce_client.forwardingRules()
-            return await GCPFacadeUtils.get_all('items', request, forwarding_rules)
+            return await GCPFacadeUtils.get_all('items', request, forwarding_rules, gce_client)
         except Exception as e:
             print_exception(f'Failed to retrieve forwarding_rules: {e}')
             return []
@@ -2,7 +2,7 @@ import re
 
 from ScoutSuite.core.console import print_exception
 from ScoutSuite.providers.gcp.facade.base import GCPBaseFacade
-from ScoutSuite.providers.utils import run_concurrently, get_and_set_concurrently
+from ScoutSuite.providers.utils import get_and_set_concurrently
 
 
 class GKEFacade(GCPBaseFacade):
@@ -13,7 +13,7 @@ class GKEFacade(GCPBaseFacade):
     async def get_clusters(self, project_id):
         try:
             gke_client = self._get_client()
-            response = await run_concurrently(
+            response = await self._run_concurrently(
                 lambda: gke_client.projects().locations().clusters().list(parent=f"projects/{project_id}/locations/-").execute()
             )
             clusters = response.get('clusters', [])
@@ -1,7 +1,6 @@
 from ScoutSuite.core.console import print_exception
 from ScoutSuite.providers.gcp.facade.basefacade import GCPBaseFacade
 from ScoutSuite.providers.gcp.facade.utils import GCPFacadeUtils
-from ScoutSuite.providers.utils import run_concurrently
 
 class IAMFacade(GCPBaseFacade):
     def __init__(self):
@@ -22,9 +21,8 @@ class IAMFacade(GCPBaseFacade):
         try:
             resource = f'projects/{project_id}/serviceAccounts/{service_account_email}'
             iam_client = self._get_client()
-            response = await run_concurrently(
-                    lambda: iam_client.projects().serviceAccounts().getIamPolicy(resource=resource).execute()
-            )
+            response = await GCPFacadeUtils.execute(
+                iam_client.projects().serviceAccounts().getIamPolicy(resource=resource), iam_client)
             return response.get('bindings', [])
         except Exception as e:
             print_exception(f'Failed to retrieve service account IAM policy bindings: {e}')
@@ -34,10 +32,8 @@ class IAMFacade(GCPBaseFacade):
         try:
             name = f'projects/{project_id}/serviceAccounts/{service_account_email}'
             iam_client = self._get_client()
-            response = await run_concurrently(
-                    lambda: iam_client.projects().serviceAccounts().keys().list(name=name,
-                                                                                keyTypes=key_types).execute()
-            )
+            response = await GCPFacadeUtils.execute(
+                iam_client.projects().serviceAccounts().keys().list(name=name, keyTypes=key_types), iam_client)
             return response.get('keys', [])
         except Exception as e:
             print_exception(f'Failed to retrieve service account keys: {e}')
@@ -46,10 +42,8 @@ class IAMFacade(GCPBaseFacade):
     async def get_service_account_key(self, key_name: str):
         try:
             iam_client = self._get_client()
-            response = await run_concurrently(
-                lambda: iam_client.projects().serviceAccounts().keys().get(name=key_name,
-                                                                           fields='').execute()
-            )
+            response = await GCPFacadeUtils.execute(
+                iam_client.projects().serviceAccounts().keys().get(name=key_name, fields=''), iam_client)
             return response
         except Exception as e:
             print_exception(f'Failed to retrieve service account keys: {e}')
@@ -60,15 +54,15 @@ class IAMFacade(GCPBaseFacade):
             role = role.split("_withcond_")[0] # remove the condition key to get the actual role
             iam_client = self._get_client()
             if 'projects/' in role:
-                response = await run_concurrently(
+                response = await self._run_concurrently(
                     lambda: iam_client.projects().roles().get(name=role).execute()
                 )
             elif 'organizations/' in role:
-                response = await run_concurrently(
+                response = await self._run_concurrently(
                     lambda: iam_client.organizations().roles().get(name=role).execute()
                 )
             else:
-                response = await run_concurrently(
+                response = await self._run_concurrently(
                     lambda: iam_client.roles().get(name=role).execute()
                 )
             return response
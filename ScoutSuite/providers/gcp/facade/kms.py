@@ -4,7 +4,6 @@ from google.api_core.gapic_v1.client_info import ClientInfo
 from ScoutSuite.core.console import print_exception
 from ScoutSuite.providers.gcp.facade.basefacade import GCPBaseFacade
 from ScoutSuite.providers.gcp.facade.utils import GCPFacadeUtils
-from ScoutSuite.providers.utils import run_concurrently
 from ScoutSuite.utils import get_user_agent
 
 
@@ -35,7 +34,7 @@ class KMSFacade(GCPBaseFacade):
             key_rings = {}
             for l in locations:
                 parent = self.cloud_client.location_path(project_id, l['locationId'])
-                key_rings[l['locationId']] = await run_concurrently(
+                key_rings[l['locationId']] = await self._run_concurrently(
                     lambda: list(self.cloud_client.list_key_rings(parent)))
             return key_rings
         except Exception as e:
@@ -2,11 +2,13 @@ from google.cloud import logging as stackdriverlogging
 from google.api_core.gapic_v1.client_info import ClientInfo
 
 from ScoutSuite.core.console import print_exception
-from ScoutSuite.providers.utils import run_concurrently
+from ScoutSuite.providers.utils import RateLimitedFacade
 from ScoutSuite.utils import get_user_agent
 
 
-class StackdriverLoggingFacade:
+class StackdriverLoggingFacade(RateLimitedFacade):
+    provider = 'gcp'
+    service = 'logging'
 
     def get_client(self, project_id: str):
         client_info = ClientInfo(user_agent=get_user_agent())
@@ -17,7 +19,7 @@ class StackdriverLoggingFacade:
     async def get_sinks(self, project_id: str):
         try:
             client = self.get_client(project_id)
-            return await run_concurrently(lambda: [sink for sink in client.list_sinks()])
+            return await self._run_concurrently(lambda: [sink for sink in client.list_sinks()])
         except Exception as e:
             print_exception(f'Failed to retrieve sinks: {e}')
             return []
@@ -25,7 +27,7 @@ class StackdriverLoggingFacade:
     async def get_metrics(self, project_id: str):
         try:
             client = self.get_client(project_id)
-            return await run_concurrently(lambda: [metric for metric in client.list_metrics()])
+            return await self._run_concurrently(lambda: [metric for metric in client.list_metrics()])
         except Exception as e:
             print_exception(f'Failed to retrieve metrics: {e}')
             return []
@@ -2,11 +2,14 @@ from google.cloud import monitoring as stackdrivermonitoring
 from google.api_core.gapic_v1.client_info import ClientInfo
 
 from ScoutSuite.core.console import print_exception
-from ScoutSuite.providers.utils import run_concurrently
+from ScoutSuite.providers.utils import RateLimitedFacade
 from ScoutSuite.utils import get_user_agent
 
 
-class StackdriverMonitoringFacade:
+class StackdriverMonitoringFacade(RateLimitedFacade):
+    provider = 'gcp'
+    service = 'monitoring'
+
     # TODO find a way to skip the project if it's not configured as a stackdriver workspace
 
     def get_uptime_client(self):
@@ -23,7 +26,8 @@ class StackdriverMonitoringFacade:
         try:
             client = self.get_uptime_client()
             project_name = f"projects/{project_id}"
-            return await run_concurrently(lambda: [r for r in client.list_uptime_check_configs(parent=project_name)])
+            return await self._run_concurrently(
+                lambda: [r for r in client.list_uptime_check_configs(parent=project_name)])
         except Exception as e:
             if 'is not a workspace' not in getattr(e, 'message', '') and '404' not in str(e):
                 print_exception(f'Failed to retrieve uptime checks: {e}')
@@ -33,7 +37,7 @@ class StackdriverMonitoringFacade:
         try:
             client = self.get_alerts_client()
             project_name = f"projects/{project_id}"
-            return await run_concurrently(lambda: [r for r in client.list_alert_policies(name=project_name)])
+            return await self._run_concurrently(lambda: [r for r in client.list_alert_policies(name=project_name)])
         except Exception as e:
             if 'is not a workspace' not in getattr(e, 'message', '') and '404' not in str(e):
                 print_exception(f'Failed to retrieve alert policies: {e}')
@@ -1,18 +1,112 @@
+import asyncio
+
+from ScoutSuite.providers.gcp.utils import is_throttled
 from ScoutSuite.providers.utils import run_concurrently
 
 
 class GCPFacadeUtils:
+    # Maximum number of requests sent in a batch, and how long requests wait for others to join their batch
+    batch_size = 100
+    batch_delay = 0.05
+    _batch_mode = False
+    # Requests waiting to be sent, by client
+    _batches = {}
+
+    @staticmethod
+    def set_batch_mode(enabled: bool):
+        """
+        Send the requests made with a client in batches of up to `batch_size` requests rather than one by one
+
+        :param enabled: Whether to batch requests
+        """
+        GCPFacadeUtils._batch_mode = enabled
+        GCPFacadeUtils._batches = {}
+
+    @staticmethod
+    async def execute(request, client=None):
+        """
+        Executes a request in the fetch thread pool. In batch mode, requests made concurrently with the same client are
+        sent in a single batch, and their throttled requests are retried one by one.
+
+        :param request: The request, e.g. client.instances().list(project=project_id, zone=zone)
+        :param client: The client the request was built from, requests are never batched without it
+
+        :return: The response.
+        """
+        rate_limit_key = ('gcp', request.methodId.split('.')[0] if request.methodId else None, None)
+        if GCPFacadeUtils._batch_mode and client is not None:
+            try:
+                return await GCPFacadeUtils._add_to_batch(request, client, rate_limit_key)
+            except Exception as e:
+                if not is_throttled(e):
+                    raise
+        return await run_concurrently(request.execute, rate_limit_key=rate_limit_key)
+
     @staticmethod
-    async def _get_all(resources, resource_key: str, request, resources_group):
+    async def _add_to_batch(request, client, rate_limit_key):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        batch = GCPFacadeUtils._batches.get(client)
+        if batch is None:
+            batch = GCPFacadeUtils._batches[client] = []
+            loop.call_later(GCPFacadeUtils.batch_delay, GCPFacadeUtils._send_batch, client, batch, rate_limit_key)
+        batch.append((request, future))
+        if len(batch) >= GCPFacadeUtils.batch_size:
+            GCPFacadeUtils._send_batch(client, batch, rate_limit_key)
+        return await future
+
+    @staticmethod
+    def _send_batch(client, batch, rate_limit_key):
+        # A full batch is sent before its delay is over
+        if GCPFacadeUtils._batches.get(client) is not batch:
+            return
+        del GCPFacadeUtils._batches[client]
+        asyncio.ensure_future(GCPFacadeUtils._execute_batch(client, batch, rate_limit_key))
+
+    @staticmethod
+    async def _execute_batch(client, batch, rate_limit_key):
+        responses = {}
+        batch_request = client.new_batch_http_request(
+            callback=lambda request_id, response, exception: responses.update({request_id: (response, exception)}))
+        for request_id, (request, _) in enumerate(batch):
+            batch_request.add(request, request_id=str(request_id))
+        try:
+            await run_concurrently(batch_request.execute, rate_limit_key=rate_limit_key)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for request_id, (_, future) in enumerate(batch):
+            response, exception = responses[str(request_id)]
+            if future.done():
+                continue
+            elif exception:
+                future.set_exception(exception)
+            else:
+                future.set_result(response)
+
+    @staticmethod
+    async def _get_all(resources, resource_key: str, request, resources_group, client=None):
+        # The pages are fetched one after the other, while the other resources' pages are fetched concurrently
         while request is not None:
-            response = request.execute()
+            response = await GCPFacadeUtils.execute(request, client)
             resources.extend(response.get(resource_key, []))
-            request = await run_concurrently(
-                lambda: resources_group.list_next(previous_request=request, previous_response=response)
-            )
+            # Building the next request doesn't require any API call
+            request = resources_group.list_next(previous_request=request, previous_response=response)
 
     @staticmethod
-    async def get_all(resource_key: str, request, resources_group):
+    async def get_all(resource_key: str, request, resources_group, client=None):
+        """
+        Gets all the resources of a list request, page by page
+
+        :param resource_key: Key of the resources in the responses, e.g. items
+        :param request: The list request
+        :param resources_group: Group of the list method, e.g. client.instances()
+        :param client: The client the request was built from, needed for the request to be batched (see execute)
+
+        :return: A list of the fetched resources.
+        """
         resources = []
-        await GCPFacadeUtils._get_all(resources, resource_key, request, resources_group)
+        await GCPFacadeUtils._get_all(resources, resource_key, request, resources_group, client)
         return resources
@@ -1,7 +1,10 @@
 import os
 
 from ScoutSuite.core.console import print_exception
+from ScoutSuite.output.utils import get_filename
 from ScoutSuite.providers.base.provider import BaseProvider
+from ScoutSuite.providers.gcp.facade.basefacade import set_discovery_options
+from ScoutSuite.providers.gcp.facade.utils import GCPFacadeUtils
 from ScoutSuite.providers.gcp.services import GCPServicesConfig
 
 
@@ -12,6 +15,7 @@ class GCPProvider(BaseProvider):
 
     def __init__(self,
                  project_id=None, folder_id=None, organization_id=None, all_projects=None,
+                 gcp_batch_requests=False, gcp_discovery_url=None,
                  report_dir=None, timestamp=None, services=None, skipped_services=None, result_format='json', **kwargs):
         services = [] if services is None else services
         skipped_services = [] if skipped_services is None else skipped_services
@@ -31,6 +35,10 @@ class GCPProvider(BaseProvider):
         self.credentials = kwargs['credentials']
         self._set_account_id()
 
+        GCPFacadeUtils.set_batch_mode(gcp_batch_requests)
+        # The downloaded discovery documents are reused by the next runs
+        set_discovery_options(gcp_discovery_url, get_filename('DISCOVERY_CACHE', file_dir=report_dir)[0])
+
         self.services = GCPServicesConfig(self.credentials, self.credentials.default_project_id,
                                           self.project_id, self.folder_id, self.organization_id, self.all_projects)
 
@@ -1,3 +1,5 @@
+import asyncio
+
 from ScoutSuite.providers.gcp.resources.base import GCPCompositeResources
 
 
@@ -17,10 +19,14 @@ class Projects(GCPCompositeResources):
 
         self['projects'] = {}
         # For each project, validate that the corresponding service API is enabled before including it in the execution.
-        for p in raw_projects:
-            enabled = await self.facade.is_api_enabled(p['projectId'], self.__class__.__name__)
-            if enabled:
-                self['projects'][p['projectId']] = {}
+        # The enabled services of all the projects are fetched concurrently and shared with the other services.
+        project_ids = [p['projectId'] for p in raw_projects]
+        self.facade.prefetch_enabled_services(project_ids)
+        enabled = await asyncio.gather(*[self.facade.is_api_enabled(project_id, self.__class__.__name__)
+                                         for project_id in project_ids])
+        for project_id, project_enabled in zip(project_ids, enabled):
+            if project_enabled:
+                self['projects'][project_id] = {}
 
         await self._fetch_children_of_all_resources(
             resources=self['projects'],
@@ -2,18 +2,21 @@ from oci.object_storage import ObjectStorageClient
 from ScoutSuite.providers.oci.authentication_strategy import OracleCredentials
 from oci.pagination import list_call_get_all_results
 
-from ScoutSuite.providers.utils import run_concurrently
+from ScoutSuite.providers.utils import RateLimitedFacade
 from ScoutSuite.core.console import print_exception
 
 
-class ObjectStorageFacade:
+class ObjectStorageFacade(RateLimitedFacade):
+    provider = 'oci'
+    service = 'objectstorage'
+
     def __init__(self, credentials: OracleCredentials):
         self._credentials = credentials
         self._client = ObjectStorageClient(self._credentials.config)
 
     async def get_namespace(self):
         try:
-            response = await run_concurrently(
+            response = await self._run_concurrently(
                 lambda: self._client.get_namespace()
             )
             # response.data is the namespace string
@@ -24,7 +27,7 @@ class ObjectStorageFacade:
 
     async def get_bucket_details(self, namespace, bucket_name):
         try:
-            response = await run_concurrently(
+            response = await self._run_concurrently(
                 lambda: self._client.get_bucket(namespace, bucket_name)
             )
             return response.data
@@ -37,7 +40,7 @@ class ObjectStorageFacade:
             if not namespace:
                 print_exception('No Object Storage namespace; skipping bucket listing')
                 return []
-            response = await run_concurrently(
+            response = await self._run_concurrently(
                 lambda: list_call_get_all_results(self._client.list_buckets, namespace, self._credentials.get_scope()))
             return response.data
         except Exception as e:
@@ -46,7 +49,7 @@ class ObjectStorageFacade:
 
     async def get_bucket_objects(self, namespace, bucket_name):
         try:
-            response = await run_concurrently(
+            response = await self._run_concurrently(
                 lambda: list_call_get_all_results(self._client.list_objects, namespace, bucket_name))
             return response.data
         except Exception as e:
@@ -1,13 +1,103 @@
 import asyncio
+import copy
 import inspect
+import json
+import os
+import random
 import re
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from hashlib import sha1
 
-from ScoutSuite.core.console import print_info, print_warning
+from ScoutSuite.core.console import print_debug, print_info, print_warning
 from ScoutSuite.providers.aws.utils import is_throttled as aws_is_throttled
 from ScoutSuite.providers.gcp.utils import is_throttled as gcp_is_throttled
 
 
+# Number of threads running the providers' blocking API calls, which their HTTP connection pools are sized to
+_fetch_pool = {'max_workers': 10, 'executor': None}
+
+
+class FetchExecutor(ThreadPoolExecutor):
+    """
+    Thread pool running the providers' blocking API calls, which keeps track of the calls waiting for a free thread
+    """
+
+    def __init__(self, max_workers):
+        super().__init__(max_workers=max_workers, thread_name_prefix='scout-fetch')
+        self._stats_lock = threading.Lock()
+        self.submitted = 0
+        self.queued = 0
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.running = 0
+
+    def submit(self, fn, /, *args, **kwargs):
+        with self._stats_lock:
+            self.submitted += 1
+            if self.running + self.queue_depth >= self._max_workers:
+                self.queued += 1
+            self.queue_depth += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        return super().submit(self._run, fn, *args, **kwargs)
+
+    def _run(self, fn, *args, **kwargs):
+        with self._stats_lock:
+            self.queue_depth -= 1
+            self.running += 1
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._stats_lock:
+                self.running -= 1
+
+
+def set_fetch_executor(max_workers):
+    """
+    Run the blocking API calls of the running event loop in a pool of `max_workers` threads
+
+    :param max_workers:             Number of threads, the HTTP connection pools of the providers' clients are sized to
+                                    the same number
+    """
+    _fetch_pool['max_workers'] = max_workers
+    _fetch_pool['executor'] = FetchExecutor(max_workers)
+    asyncio.get_running_loop().set_default_executor(_fetch_pool['executor'])
+
+
+def shutdown_fetch_executor():
+    """
+    Stop the threads running the blocking API calls, e.g. before forking processes. The pool is replaced by an idle
+    one, whose threads are only started by the next calls.
+    """
+    executor = _fetch_pool['executor']
+    if not executor:
+        return
+    executor.shutdown(wait=True)
+    try:
+        set_fetch_executor(_fetch_pool['max_workers'])
+    except RuntimeError:
+        # No running event loop
+        _fetch_pool['executor'] = None
+
+
+def get_max_workers():
+    return _fetch_pool['max_workers']
+
+
+def print_fetch_executor_stats():
+    """
+    Report how often API calls waited for a free thread, in debug output
+    """
+    executor = _fetch_pool['executor']
+    if executor and executor.submitted:
+        print_debug(f'Fetch thread pool: {executor.queued}/{executor.submitted} calls waited for one of '
+                    f'{executor._max_workers} threads, maximum queue depth {executor.max_queue_depth}')
+
+
 def get_non_provider_id(name):
     """
     Not all resources have an ID and some services allow the use of "." in names, which breaks Scout's
@@ -21,35 +111,338 @@ def get_non_provider_id(name):
     return f'scoutid-{name_hash.hexdigest()}'
 
 
-async def run_concurrently(function, backoff_seconds=15):
+class RateLimiter:
+    """
+    Token bucket limiting the rate of the API calls made to one (provider, service, region), which adapts its rate to
+    the API's limits. Calls aren't limited until one is throttled, the rate then starts from half the rate calls were
+    made at: it is halved when a call is throttled (multiplicative decrease) and increased by one call per second after
+    each successful call (additive increase), up to max_rate if it is set
+    """
+
+    min_rate = 1
+    # Ceiling of the rate in calls per second, calls aren't limited until they are throttled if it isn't set
+    max_rate = None
+    increase = 1
+    decrease = 0.5
+    # Period over which the rate of the calls is measured before the first throttled call, in seconds
+    window = 1
+
+    def __init__(self, key):
+        self.key = key
+        self.rate = self.max_rate
+        self.tokens = 1
+        self.updated = time.monotonic()
+        self.recent_calls = deque()
+        self.calls = 0
+        self.throttled = 0
+        self.retries = 0
+        self.min_reached_rate = self.rate
+
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            if self.rate is None:
+                self.recent_calls.append(now)
+                while self.recent_calls[0] <= now - self.window:
+                    self.recent_calls.popleft()
+                self.calls += 1
+                return
+            self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                self.calls += 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def on_success(self):
+        if self.rate is not None:
+            self.rate = self.rate + self.increase if self.max_rate is None \
+                else min(self.max_rate, self.rate + self.increase)
+
+    def on_throttle(self):
+        self.throttled += 1
+        if self.rate is None:
+            # The bucket starts empty, from the rate the calls were made at when the API throttled them
+            self.rate = len(self.recent_calls) / self.window
+            self.recent_calls.clear()
+            self.updated = time.monotonic()
+        self.rate = max(self.min_rate, self.rate * self.decrease)
+        self.tokens = min(self.tokens, 0)
+        self.min_reached_rate = self.rate if self.min_reached_rate is None else min(self.min_reached_rate, self.rate)
+
+
+# Rate limiters by (provider, service, region)
+_rate_limiters = {}
+
+
+def get_rate_limiter(key):
+    if key not in _rate_limiters:
+        _rate_limiters[key] = RateLimiter(key)
+    return _rate_limiters[key]
+
+
+def print_rate_limiter_stats():
+    """
+    Report the calls made, throttled and retried for each (provider, service, region), in debug output
+    """
+    def format_rate(rate):
+        return 'unlimited' if rate is None else f'{rate:g}/s'
+
+    for key, limiter in sorted(_rate_limiters.items(), key=lambda item: str(item[0])):
+        print_debug(f'Rate limiter {"/".join(str(k) for k in key if k) if key else "default"}: {limiter.calls} calls, '
+                    f'{limiter.throttled} throttled, {limiter.retries} retries, '
+                    f'lowest rate {format_rate(limiter.min_reached_rate)}, current rate {format_rate(limiter.rate)}')
+
+
+async def run_concurrently(function, backoff_seconds=15, max_attempts=5, rate_limit_key=None):
+    """
+    Run a blocking API call in the fetch thread pool, at the rate its (provider, service, region) allows. Throttled
+    calls slow down the calls sharing their rate limiter and are retried with a jittered exponential backoff.
+
+    :param function:                The function making the API call
+    :param backoff_seconds:         Maximum backoff between attempts
+    :param max_attempts:            Number of attempts before throttling errors are raised
+    :param rate_limit_key:          (provider, service, region) of the call, the calls made without one share a
+                                    rate limiter
+    :return:                        The result of the function
+    """
     loop = asyncio.get_running_loop()
     throttler = getattr(loop, 'throttler', None)
-    try:
-        if throttler:
-            async with throttler:
-                return await run_function_concurrently(function)
+    rate_limiter = get_rate_limiter(rate_limit_key)
+    attempt = 0
+    while True:
+        await rate_limiter.acquire()
+        try:
+            if throttler:
+                async with throttler:
+                    result = await run_function_concurrently(function)
+            else:
+                result = await run_function_concurrently(function)
+        except Exception as e:
+            attempt += 1
+            if attempt >= max_attempts or not is_throttled(e):
+                raise
+            await wait_before_retry(rate_limiter, attempt, get_function_location(function), backoff_seconds)
         else:
-            return await run_function_concurrently(function)
-    except Exception as e:
+            rate_limiter.on_success()
+            return result
+
+
+async def wait_before_retry(rate_limiter, attempt, location, backoff_seconds=15):
+    """
+    Slow down the calls sharing the rate limiter of a throttled call, and wait for a jittered exponential backoff
+    before it is retried
+
+    :param rate_limiter:            Rate limiter of the throttled call
+    :param attempt:                 Number of attempts made so far
+    :param location:                Where the call is made from, for debug output
+    :param backoff_seconds:         Maximum backoff
+    """
+    rate_limiter.on_throttle()
+    rate_limiter.retries += 1
+    delay = random.uniform(0, min(backoff_seconds, 2 ** attempt))
+    print_debug(f'Hitting API rate limiting ({location}), will retry in {delay:.1f}s')
+    await asyncio.sleep(delay)
+
+
+class RateLimitedFacade:
+    """
+    Facade whose API calls share the rate limiter of its provider's service in each region
+    """
+
+    provider = None
+    service = None
+
+    def _rate_limit_key(self, region=None, service=None):
+        return self.provider, service if service else self.service, region
+
+    async def _run_concurrently(self, function, region=None, service=None):
+        """
+        Run a blocking API call made to the facade's service, or to another service of its provider, see
+        run_concurrently
+
+        :param function:                The function making the API call
+        :param region:                  Region the call is made to, if the service is regional
+        :param service:                 Service the call is made to, if not the facade's
+        :return:                        The result of the function
+        """
+        return await run_concurrently(function, rate_limit_key=self._rate_limit_key(region, service))
+
+
+# Responses of the API calls shared by the facades during a run, with hits and misses per operation
+_response_cache = {'responses': {}, 'stats': {}}
+
+
+def clear_response_cache():
+    _response_cache['responses'] = {}
+    _response_cache['stats'] = {}
+
+
+def get_response_cache_key(provider, service, operation, params):
+    """
+    Key of an API call in the response cache, the parameters being canonicalized
+
+    :param provider:                Provider code, e.g. aws
+    :param service:                 Service of the call, e.g. iam
+    :param operation:               Operation, e.g. get_role
+    :param params:                  Parameters of the call
+    :return:                        The key
+    """
+    return provider, service, operation, json.dumps(params, sort_keys=True, default=str)
+
+
+async def run_cached(key, coroutine_function):
+    """
+    Make an API call once per run: concurrent identical calls share the call in flight, and later ones reuse its
+    response. Failed calls are not cached.
+
+    :param key:                     Key of the call, see get_response_cache_key
+    :param coroutine_function:      Function returning a coroutine making the call, e.g. with run_concurrently
+    :return:                        A copy of the response, which callers are free to modify
+    """
+    stats = _response_cache['stats'].setdefault(key[:3], {'hits': 0, 'misses': 0})
+    future = _response_cache['responses'].get(key)
+    if future is None:
+        stats['misses'] += 1
+        future = asyncio.ensure_future(coroutine_function())
+        _response_cache['responses'][key] = future
+    else:
+        stats['hits'] += 1
+    try:
+        # A cancelled caller must not cancel the call for the others
+        response = await asyncio.shield(future)
+    except Exception:
+        if _response_cache['responses'].get(key) is future:
+            del _response_cache['responses'][key]
         raise
+    return copy.deepcopy(response)
+
+
+def print_response_cache_stats():
+    """
+    Report the hits and misses of the response cache for each (provider, service, operation), in debug output
+    """
+    for key, stats in sorted(_response_cache['stats'].items()):
+        print_debug(f'Response cache {"/".join(key)}: {stats["hits"]} hits, {stats["misses"]} misses')
+
+
+# Watchdog of the event loop during the fetch phase, see --loop-blocking-threshold
+_loop_blocking_detector = {'detector': None}
+
+
+class LoopBlockingDetector(threading.Thread):
+    """
+    Watchdog thread reporting where the event loop is held for more than `threshold_ms` by a single coroutine step,
+    typically a blocking API call made without run_concurrently
+    """
+
+    def __init__(self, loop, threshold_ms):
+        super().__init__(name='scout-loop-watchdog', daemon=True)
+        self.loop = loop
+        self.loop_thread_id = threading.get_ident()
+        self.threshold = threshold_ms / 1000
+        self.heartbeat = time.monotonic()
+        # Longest stall and number of stalls per location
+        self.stalls = {}
+        self._stopped = threading.Event()
+        self._handle = None
+
+    def start(self):
+        self._beat()
+        super().start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._handle:
+            self._handle.cancel()
+        self.join()
+
+    def _beat(self):
+        self.heartbeat = time.monotonic()
+        self._handle = self.loop.call_later(self.threshold / 4, self._beat)
+
+    def run(self):
+        stalled_heartbeat = None
+        location = None
+        while not self._stopped.wait(self.threshold / 4):
+            heartbeat = self.heartbeat
+            duration = time.monotonic() - heartbeat
+            if duration <= self.threshold:
+                continue
+            if heartbeat != stalled_heartbeat:
+                # New stall, sample the stack of the event loop's thread
+                frame = sys._current_frames().get(self.loop_thread_id)
+                if self.is_waiting(frame):
+                    # The loop is waiting for events but late to wake up, e.g. as the threads hold the GIL
+                    continue
+                stalled_heartbeat = heartbeat
+                location = self.get_location(frame)
+                if location not in self.stalls:
+                    print_warning(f'Event loop blocked for more than {int(self.threshold * 1000)} ms at {location}')
+                self.stalls.setdefault(location, {'count': 0, 'longest': 0})['count'] += 1
+            self.stalls[location]['longest'] = max(self.stalls[location]['longest'], duration)
+
+    @staticmethod
+    def is_waiting(frame):
+        return frame is not None and frame.f_code.co_name == 'select' and \
+            frame.f_code.co_filename.endswith('selectors.py')
+
+    @staticmethod
+    def get_location(frame):
         """
-        Commented out so this does not trigger errors from is_throttled, which is not fully implemented
-        # Determine whether the exception is due to API throttling
-        if is_throttled(e):
-            source_file = inspect.getsourcefile(function)
-            source_file_line = inspect.getsourcelines(function)[1]
-            print_warning(f'Hitting API rate limiting ({"/".join(source_file.split("/")[-2:])} L{source_file_line}), will retry in {backoff_seconds}s')
-            await asyncio.sleep(backoff_seconds)
-            return await run_concurrently(function, backoff_seconds + 15)
-        else:
-            raise
+        Innermost ScoutSuite frame of a stack, followed by the innermost frame when it is another module's
         """
+        if frame is None:
+            return 'unknown location'
+        stack = traceback.extract_stack(frame)
+        locations = [f'{"/".join(entry.filename.split(os.sep)[-3:])} L{entry.lineno} ({entry.name})'
+                     for entry in stack]
+        scout_entries = [i for i, entry in enumerate(stack) if f'{os.sep}ScoutSuite{os.sep}' in entry.filename]
+        if not scout_entries or scout_entries[-1] == len(stack) - 1:
+            return locations[-1]
+        return f'{locations[scout_entries[-1]]}, in {locations[-1]}'
+
+
+def start_loop_blocking_detector(threshold_ms):
+    """
+    Report the coroutine steps holding the running event loop for more than `threshold_ms`
+
+    :param threshold_ms:            Threshold in milliseconds
+    """
+    detector = LoopBlockingDetector(asyncio.get_running_loop(), threshold_ms)
+    detector.start()
+    _loop_blocking_detector['detector'] = detector
+
+
+def stop_loop_blocking_detector():
+    """
+    Stop the loop blocking detector and summarize the stalls it found
+    """
+    detector, _loop_blocking_detector['detector'] = _loop_blocking_detector['detector'], None
+    if not detector:
+        return
+    detector.stop()
+    if not detector.stalls:
+        print_info(f'The event loop was never blocked for more than {int(detector.threshold * 1000)} ms')
+    for location, stalls in sorted(detector.stalls.items(), key=lambda item: -item[1]['longest']):
+        print_info(f'Event loop blocked {stalls["count"]} times at {location}, '
+                   f'longest for {int(stalls["longest"] * 1000)} ms')
+
+
+def get_function_location(function):
+    try:
+        source_file = inspect.getsourcefile(function)
+        source_file_line = inspect.getsourcelines(function)[1]
+        return f'{"/".join(source_file.split("/")[-2:])} L{source_file_line}'
+    except Exception:
+        return getattr(function, '__qualname__', str(function))
 
 
 def run_function_concurrently(function):
     """
     Schedules the execution of function `function` in the default thread pool (referred as 'executor') that has been
-    associated with the global event loop.
+    associated with the global event loop, sized by --max-workers (see set_fetch_executor).
 
     :param function: function to be executed concurrently, in a dedicated thread.
     :return: an asyncio.Future to be awaited.
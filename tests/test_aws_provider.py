@@ -173,3 +173,92 @@ hats off to TRON: HereIsSomethingThatAppearsAtEndOfLineMCP
             "0000000000/1111111111/2222222222/3333333",
             "HereIsSomethingThatAppearsAtEndOfLineMCP"
         ]
+
+    @mock.patch("ScoutSuite.providers.aws.facade.ec2.AWSFacadeUtils.get_all_pages")
+    def test_ec2_vpc_resources_fetched_once_per_region(self, mock_get_all_pages):
+        import asyncio
+        from ScoutSuite.providers.aws.facade.ec2 import EC2Facade
+
+        security_groups = [{'GroupId': f'sg-{i}', 'VpcId': f'vpc-{i % 3}'} for i in range(9)]
+
+        async def get_all_pages(service, region, session, paginator_name, entity, **paginator_args):
+            assert not paginator_args
+            return security_groups
+
+        mock_get_all_pages.side_effect = get_all_pages
+        facade = EC2Facade(mock.MagicMock(), '123456789012')
+
+        async def fetch(facade):
+            return await asyncio.gather(*[facade.get_security_groups('us-east-1', f'vpc-{i}') for i in range(4)])
+
+        results = asyncio.run(fetch(facade))
+        assert mock_get_all_pages.call_count == 1
+        assert [len(groups) for groups in results] == [3, 3, 3, 0]
+        assert all(group['VpcId'] == 'vpc-1' for group in results[1])
+
+        # Facades of other sessions don't share the resources
+        asyncio.run(fetch(EC2Facade(mock.MagicMock(), '210987654321')))
+        assert mock_get_all_pages.call_count == 2
+
+    @mock.patch("ScoutSuite.providers.aws.facade.ec2.AWSFacadeUtils.get_all_pages")
+    def test_ec2_vpc_resources_failures_not_cached(self, mock_get_all_pages):
+        import asyncio
+        from ScoutSuite.providers.aws.facade.ec2 import EC2Facade
+
+        mock_get_all_pages.side_effect = [Exception('RequestLimitExceeded'), [{'GroupId': 'sg-0', 'VpcId': 'vpc-0'}]]
+        facade = EC2Facade(mock.MagicMock(), '123456789012')
+
+        async def fetch():
+            return await asyncio.gather(*[facade.get_security_groups('us-east-1', f'vpc-{i}') for i in range(2)])
+
+        # The concurrent calls share the failure, the next ones fetch the resources again
+        with mock.patch("ScoutSuite.providers.aws.facade.ec2.print_exception"):
+            assert asyncio.run(fetch()) == [[], []]
+        assert asyncio.run(fetch()) == [[{'GroupId': 'sg-0', 'VpcId': 'vpc-0'}], []]
+        assert mock_get_all_pages.call_count == 2
+
+    @mock.patch("ScoutSuite.providers.aws.facade.iam.AWSFacadeUtils.get_multiple_entities_from_all_pages")
+    def test_iam_authorization_details(self, mock_get_multiple_entities_from_all_pages):
+        import asyncio
+        from ScoutSuite.providers.aws.facade.iam import IAMFacade
+
+        document = {'Version': '2012-10-17', 'Statement': {'Effect': 'Allow', 'Action': 's3:*', 'Resource': '*'}}
+        policy_arn = 'arn:aws:iam::123456789012:policy/policy'
+
+        async def get_multiple_entities_from_all_pages(service, region, session, paginator_name, entities):
+            assert paginator_name == 'get_account_authorization_details'
+            return {
+                'UserDetailList': [{'UserName': 'user', 'UserId': 'user-id', 'GroupList': ['group'],
+                                    'UserPolicyList': [], 'AttachedManagedPolicies': [
+                                        {'PolicyName': 'policy', 'PolicyArn': policy_arn}]}],
+                'GroupDetailList': [{'Path': '/', 'GroupName': 'group', 'GroupId': 'group-id',
+                                     'Arn': 'arn:aws:iam::123456789012:group/group', 'CreateDate': None,
+                                     'GroupPolicyList': [{'PolicyName': 'inline', 'PolicyDocument': document}],
+                                     'AttachedManagedPolicies': []}],
+                'RoleDetailList': [],
+                'Policies': [
+                    {'PolicyName': 'policy', 'PolicyId': 'policy-id', 'Arn': policy_arn, 'AttachmentCount': 1,
+                     'Description': '', 'PolicyVersionList': [
+                         {'Document': {}, 'IsDefaultVersion': False},
+                         {'Document': document, 'IsDefaultVersion': True}]},
+                    {'PolicyName': 'unused', 'PolicyId': 'unused-id', 'AttachmentCount': 0,
+                     'Arn': 'arn:aws:iam::123456789012:policy/unused', 'PolicyVersionList': []}]
+            }
+
+        mock_get_multiple_entities_from_all_pages.side_effect = get_multiple_entities_from_all_pages
+        facade = IAMFacade(mock.MagicMock(), bulk_fetch=True)
+
+        async def fetch():
+            groups = await facade.get_groups()
+            policies = [policy async for policies in facade.get_policies() for policy in policies]
+            return groups, policies
+
+        groups, policies = asyncio.run(fetch())
+        assert mock_get_multiple_entities_from_all_pages.call_count == 1
+        assert groups[0]['Users'] == ['user-id']
+        assert groups[0]['inline_policies_count'] == 1
+        assert list(groups[0]['inline_policies'].values())[0]['PolicyDocument']['Statement']['Action'] == ['s3:*']
+        assert [policy['PolicyId'] for policy in policies] == ['policy-id']
+        assert policies[0]['PolicyDocument'] == document
+        assert policies[0]['attached_to'] == {'users': [{'name': 'user', 'id': 'user-id'}]}
+        assert 'PolicyVersionList' not in policies[0]
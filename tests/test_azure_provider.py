@@ -1,9 +1,18 @@
+import asyncio
+import json
+import time
 import unittest
 from unittest import mock
 
+import httpx
 import pytest
+from azure.core.credentials import AccessToken
+from azure.mgmt.network import NetworkManagementClient
 
 from ScoutSuite.providers.azure.authentication_strategy import AzureCredentials
+from ScoutSuite.providers.azure.facade.graph import GraphClient
+from ScoutSuite.providers.azure.facade.network import NetworkFacade
+from ScoutSuite.providers.azure.facade.sqldatabase import SQLDatabaseFacade
 from ScoutSuite.providers.base.authentication_strategy import AuthenticationException
 from ScoutSuite.providers.base.authentication_strategy_factory import get_authentication_strategy
 
@@ -49,3 +58,100 @@ class TestAzureProviderClass(unittest.TestCase):
         # exception test
         with pytest.raises(AuthenticationException):
             result = azure_authentication_strategy.authenticate(None, None, None, None)
+
+    def test_management_clients_shared(self):
+        identity_credentials = mock.Mock()
+        identity_credentials.get_token.side_effect = \
+            lambda *scopes, **kwargs: AccessToken(f'token-{len(identity_credentials.get_token.mock_calls)}',
+                                                  int(time.time()) + 3600)
+        credentials = AzureCredentials(identity_credentials)
+        network, sql = NetworkFacade(credentials), SQLDatabaseFacade(credentials)
+
+        # Clients are created once per class and subscription, and share their transport
+        client = network.get_client('subscription-1')
+        assert isinstance(client, NetworkManagementClient)
+        assert network.get_client('subscription-1') is client
+        assert NetworkFacade(credentials).get_client('subscription-1') is client
+        assert network.get_client('subscription-2') is not client
+        assert sql.get_client('subscription-1')._client._pipeline._transport is client._client._pipeline._transport
+
+        # Tokens are requested once per scope until they are about to expire
+        scope = 'https://management.azure.com/.default'
+        token = credentials.get_credentials().get_token(scope)
+        assert credentials.get_credentials().get_token(scope) is token
+        assert credentials.get_credentials().get_token('https://graph.microsoft.com/.default') is not token
+        assert identity_credentials.get_token.call_count == 2
+        identity_credentials.get_token.side_effect = lambda *scopes, **kwargs: AccessToken('token', int(time.time()))
+        credentials.get_credentials()._tokens.clear()
+        credentials.get_credentials().get_token(scope)
+        credentials.get_credentials().get_token(scope)
+        assert identity_credentials.get_token.call_count == 4
+
+    def test_graph_client(self):
+        requests = []
+        throttled = set()
+
+        def handler(request):
+            requests.append((request.method, request.url.path))
+            if request.url.path == '/v1.0/users':
+                # The first request is throttled, the users' second page is linked from the first one
+                if len(requests) == 1:
+                    return httpx.Response(429, headers={'Retry-After': '0'})
+                if request.url.params.get('$skiptoken'):
+                    return httpx.Response(200, json={'value': [{'id': 'user-2'}]})
+                return httpx.Response(200, json={'value': [{'id': 'user-1'}],
+                                                 '@odata.nextLink': f'{request.url}?$skiptoken=1'})
+            responses = []
+            for sub_request in json.loads(request.content)['requests']:
+                group_id = sub_request['url'].split('/')[-1]
+                if group_id == 'group-404':
+                    responses.append({'id': sub_request['id'], 'status': 404, 'body': {}})
+                elif group_id == 'group-3' and group_id not in throttled:
+                    throttled.add(group_id)
+                    responses.append({'id': sub_request['id'], 'status': 429, 'headers': {'Retry-After': '0'}})
+                else:
+                    responses.append({'id': sub_request['id'], 'status': 200, 'body': {'id': group_id}})
+            return httpx.Response(200, json={'responses': responses})
+
+        async_client = httpx.AsyncClient
+        credentials = mock.Mock()
+        credentials.get_token.return_value = AccessToken('token', int(time.time()) + 3600)
+        graph = GraphClient(credentials)
+
+        async def fetch():
+            users = await graph.get_all('users')
+            group_ids = [f'group-{i}' for i in range(25)] + ['group-404']
+            groups = await asyncio.gather(*[graph.get_batched(f'groups/{group_id}') for group_id in group_ids])
+            await graph.close()
+            return users, groups
+
+        with mock.patch('httpx.AsyncClient', lambda **kwargs: async_client(
+                transport=httpx.MockTransport(handler), **kwargs)):
+            users, groups = asyncio.run(fetch())
+
+        assert users == [{'id': 'user-1'}, {'id': 'user-2'}]
+        assert groups == [{'id': f'group-{i}'} for i in range(25)] + [None]
+        # 20 requests per batch, the throttled ones being sent again
+        assert requests[3:] == [('POST', '/v1.0/$batch')] * 3
+        assert credentials.get_token.call_count == 1
+
+    def test_users_order(self):
+        from ScoutSuite.providers.azure.resources.aad.users import Users
+
+        async def get_user_groups(user_id):
+            if user_id == 'invalid':
+                raise Exception('Failed to get the groups')
+            # The groups of the first users are the last ones returned
+            await asyncio.sleep(0.01 * (5 - int(user_id)))
+            return []
+
+        facade = mock.Mock()
+        facade.aad.get_users = mock.AsyncMock(return_value=[{'id': str(i)} for i in range(5)])
+        facade.aad.get_user_groups = get_user_groups
+        users = Users(facade)
+        asyncio.run(users.fetch_all())
+        assert list(users) == [str(i) for i in range(5)]
+
+        facade.aad.get_users.return_value = [{'id': '0'}, {'id': 'invalid'}]
+        with self.assertRaises(Exception):
+            asyncio.run(Users(facade).fetch_all())
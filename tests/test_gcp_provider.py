@@ -0,0 +1,129 @@
+import asyncio
+import concurrent.futures
+import http.server
+import json
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from google.auth.credentials import AnonymousCredentials
+from googleapiclient import discovery_cache
+
+from ScoutSuite.providers.gcp.facade.base import GCPFacade
+from ScoutSuite.providers.gcp.facade.basefacade import DiscoveryCache, build_client, set_discovery_options
+from ScoutSuite.providers.gcp.facade.utils import GCPFacadeUtils
+from ScoutSuite.providers.gcp.resources.projects import Projects
+from ScoutSuite.providers.utils import set_fetch_executor
+
+
+# Test methods for GCP Provider
+class TestGCPProviderClass(unittest.TestCase):
+    @mock.patch("ScoutSuite.providers.gcp.facade.base.KMSFacade")
+    @mock.patch("ScoutSuite.providers.gcp.facade.base.GCPFacadeUtils.get_all")
+    @mock.patch("ScoutSuite.providers.gcp.facade.base.GCPFacade._build_arbitrary_client")
+    def test_enabled_services_fetched_once_per_project(self, mock_build_arbitrary_client, mock_get_all,
+                                                       mock_KMSFacade):
+        requested = []
+
+        # The list requests are their parent
+        mock_build_arbitrary_client.return_value.services.return_value.list.side_effect = \
+            lambda parent, **kwargs: parent
+
+        async def get_all(resource_key, request, resources_group):
+            project_id = request.split('/')[1]
+            requested.append(project_id)
+            await asyncio.sleep(0.01)
+            if project_id == 'project-2':
+                raise Exception('Permission denied')
+            return [{'name': 'projects/1/services/compute.googleapis.com',
+                     'config': {'name': 'compute.googleapis.com'}}]
+
+        mock_get_all.side_effect = get_all
+
+        class ComputeEngine(Projects):
+            _children = []
+
+        class KMS(Projects):
+            _children = []
+
+        facade = GCPFacade(project_id='project-0')
+        facade.get_projects = mock.AsyncMock(
+            return_value=[{'projectId': f'project-{i}'} for i in range(3)])
+
+        async def fetch():
+            compute_engine, kms = ComputeEngine(facade), KMS(facade)
+            await asyncio.gather(compute_engine.fetch_all(), kms.fetch_all())
+            return compute_engine, kms
+
+        with mock.patch("ScoutSuite.providers.gcp.facade.base.print_warning"), \
+                mock.patch("ScoutSuite.providers.gcp.facade.base.print_info"):
+            compute_engine, kms = asyncio.run(fetch())
+
+        # Each project's services are fetched once, the failed project being included in the execution
+        assert sorted(requested) == ['project-0', 'project-1', 'project-2']
+        assert list(compute_engine['projects']) == ['project-0', 'project-1', 'project-2']
+        assert list(kms['projects']) == ['project-2']
+
+    @mock.patch("google.auth.default", return_value=(AnonymousCredentials(), None))
+    def test_discovery_cache(self, mock_default):
+        requests = []
+
+        class StandInHandler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                requests.append(self.path)
+                if self.path.startswith('/discovery/'):
+                    document = json.loads(discovery_cache.get_static_doc('serviceusage', 'v1'))
+                    document['rootUrl'] = f'http://127.0.0.1:{self.server.server_port}/'
+                    body = json.dumps(document)
+                else:
+                    body = json.dumps({'services': [{'name': 'projects/1/services/compute.googleapis.com'}]})
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.end_headers()
+                self.wfile.write(body.encode('utf-8'))
+
+            def log_message(self, *args):
+                pass
+
+        async def get_services(client):
+            set_fetch_executor(2)
+            request = client.services().list(parent='projects/1')
+            return await GCPFacadeUtils.get_all('services', request, client.services())
+
+        server = http.server.HTTPServer(('127.0.0.1', 0), StandInHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        service_url = f'http://127.0.0.1:{server.server_port}/discovery/{{api}}/{{apiVersion}}'
+        try:
+            with tempfile.TemporaryDirectory() as report_dir:
+                index_file = os.path.join(report_dir, 'discovery.json')
+                set_discovery_options(service_url, index_file)
+                DiscoveryCache._cache.clear()
+                client = build_client('serviceusage', 'v1')
+                # Clients are built once, and run against the stand-in endpoint of the discovery document
+                assert build_client('serviceusage', 'v1') is client
+                # and shared by the threads making API calls
+                with concurrent.futures.ThreadPoolExecutor(1) as executor:
+                    assert executor.submit(build_client, 'serviceusage', 'v1').result() is client
+                assert asyncio.run(get_services(client)) == [
+                    {'name': 'projects/1/services/compute.googleapis.com'}]
+                assert requests == ['/discovery/serviceusage/v1', '/v1/projects/1/services?alt=json']
+
+                # The next runs read the document from disk until it expires
+                set_discovery_options(service_url, index_file)
+                DiscoveryCache._cache.clear()
+                assert build_client('serviceusage', 'v1') is not client
+                assert len(requests) == 2
+                with open(index_file) as f:
+                    index = json.load(f)
+                assert list(index) == [f'http://127.0.0.1:{server.server_port}/discovery/serviceusage/v1']
+                set_discovery_options(service_url, index_file)
+                DiscoveryCache._cache.clear()
+                with mock.patch.object(DiscoveryCache, 'ttl', -1):
+                    build_client('serviceusage', 'v1')
+                assert requests[2] == '/discovery/serviceusage/v1'
+        finally:
+            server.shutdown()
+            set_discovery_options()
+            DiscoveryCache._cache.clear()
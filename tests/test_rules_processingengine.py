@@ -1,11 +1,17 @@
+import datetime
 import json
 import os
 import tempfile
+import threading
+import time
 import unittest
+from unittest import mock
 
 from ScoutSuite.core.console import set_logger_configuration, print_error
+from ScoutSuite.core import processingengine
 from ScoutSuite.core.processingengine import ProcessingEngine
 from ScoutSuite.core.ruleset import Ruleset
+from ScoutSuite.core.utils import recurse
 
 
 class DummyObject(object):
@@ -40,6 +46,215 @@ class TestScoutRulesProcessingEngine(unittest.TestCase):
         print('Verified  rules: %d' % self.rule_counters['verified'])
 
 
+    def test_compiled_conditions_match_interpreted(self):
+        with open(os.path.join(self.test_dir, '../ScoutSuite/providers/aws/rules/rulesets/default.json'), 'rt') as f:
+            ruleset = json.load(f)
+
+        for rule_file_name in ruleset['rules']:
+            test_config_file_name = os.path.join(self.test_dir, 'data/rule-configs/%s' % rule_file_name)
+            if not os.path.isfile(test_config_file_name):
+                continue
+            rule = ruleset['rules'][rule_file_name][0]
+            rule['enabled'] = True
+            service = rule_file_name.split('-')[0]
+
+            results = []
+            for compiled in [True, False]:
+                test_ruleset = self._generate_ruleset(rule_file_name, dict(rule))
+                if not compiled:
+                    for rules in test_ruleset.rules.values():
+                        for r in rules:
+                            r.condition_evaluator = None
+                dummy_provider = DummyObject()
+                with open(test_config_file_name, 'rt') as f:
+                    test_config_dict = json.load(f)
+                    for key in test_config_dict:
+                        setattr(dummy_provider, key, test_config_dict[key])
+                dummy_provider.service_list = [service]
+                ProcessingEngine(test_ruleset).run(dummy_provider)
+                results.append(dummy_provider.services[service]['findings'])
+
+            assert (results[0] == results[1]), rule_file_name
+
+    def test_shared_traversal_matches_single_rule_runs(self):
+        with open(os.path.join(self.test_dir, '../ScoutSuite/providers/aws/rules/rulesets/default.json'), 'rt') as f:
+            ruleset = json.load(f)
+        for rule_file_name in ruleset['rules']:
+            for rule in ruleset['rules'][rule_file_name]:
+                rule['enabled'] = True
+        with tempfile.NamedTemporaryFile('wt', delete=False) as f:
+            f.write(json.dumps(ruleset))
+        all_rules = Ruleset(cloud_provider='aws', filename=f.name)
+        filter_rules = Ruleset(cloud_provider='aws', filename='filters.json', rule_type='filters')
+
+        for rule_file_name in ruleset['rules']:
+            test_config_file_name = os.path.join(self.test_dir, 'data/rule-configs/%s' % rule_file_name)
+            if not os.path.isfile(test_config_file_name):
+                continue
+            service = rule_file_name.split('-')[0]
+            single_rule = self._generate_ruleset(rule_file_name, ruleset['rules'][rule_file_name][0])
+            providers = []
+            for rulesets in [(single_rule,), (all_rules, filter_rules)]:
+                dummy_provider = DummyObject()
+                with open(test_config_file_name, 'rt') as f:
+                    test_config_dict = json.load(f)
+                    for key in test_config_dict:
+                        setattr(dummy_provider, key, test_config_dict[key])
+                dummy_provider.service_list = [service]
+                ProcessingEngine(*rulesets).run(dummy_provider)
+                providers.append(dummy_provider)
+
+            single_findings = providers[0].services[service]['findings']
+            for key in single_findings:
+                assert (single_findings[key] == providers[1].services[service]['findings'][key]), rule_file_name
+            assert ('filters' in providers[1].services[service])
+
+    def _get_all_rules(self):
+        with open(os.path.join(self.test_dir, '../ScoutSuite/providers/aws/rules/rulesets/default.json'), 'rt') as f:
+            ruleset = json.load(f)
+        for rule_file_name in ruleset['rules']:
+            for rule in ruleset['rules'][rule_file_name]:
+                rule['enabled'] = True
+        with tempfile.NamedTemporaryFile('wt', delete=False) as f:
+            f.write(json.dumps(ruleset))
+        return Ruleset(cloud_provider='aws', filename=f.name)
+
+    def _run_rules(self, rules, test_config_file_name, workers):
+        dummy_provider = DummyObject()
+        with open(os.path.join(self.test_dir, 'data/rule-configs', test_config_file_name), 'rt') as f:
+            test_config_dict = json.load(f)
+            for key in test_config_dict:
+                setattr(dummy_provider, key, test_config_dict[key])
+        dummy_provider.service_list = list(dummy_provider.services)
+        ProcessingEngine(rules).run(dummy_provider, workers=workers)
+        return json.dumps(dummy_provider.services)
+
+    def test_rule_workers_match_single_process(self):
+        all_rules = self._get_all_rules()
+        for test_config_file_name in ['ec2-security-group-opens-all-ports-to-all.json',
+                                      'iam-password-policy.json']:
+            services = [self._run_rules(all_rules, test_config_file_name, workers) for workers in [1, 4]]
+            assert (services[0] == services[1])
+
+    def test_rule_workers_with_running_threads(self):
+        all_rules = self._get_all_rules()
+        test_config_file_name = 'ec2-security-group-opens-all-ports-to-all.json'
+        single_process = self._run_rules(all_rules, test_config_file_name, 1)
+
+        # The workers are not forked while another thread runs, the rules are processed in-process
+        stop = threading.Event()
+        thread = threading.Thread(target=stop.wait)
+        thread.start()
+        try:
+            with mock.patch('multiprocessing.get_context') as mock_get_context:
+                assert self._run_rules(all_rules, test_config_file_name, 4) == single_process
+            mock_get_context.assert_not_called()
+        finally:
+            stop.set()
+            thread.join()
+
+    def test_rule_workers_run_clock(self):
+        from ScoutSuite.core.conditions import get_run_clock, set_run_clock
+        run_clock = datetime.datetime(2020, 1, 1)
+        set_run_clock()
+        # The workers measure ages against the time of the run, not the time they started
+        processingengine._init_worker({}, [], run_clock)
+        try:
+            assert get_run_clock() == run_clock
+        finally:
+            processingengine._worker_state.clear()
+            set_run_clock()
+
+    def test_rule_workers_timeout(self):
+        all_rules = self._get_all_rules()
+        test_config_file_name = 'ec2-security-group-opens-all-ports-to-all.json'
+        single_process = self._run_rules(all_rules, test_config_file_name, 1)
+
+        # The workers never return, their rules are processed in-process
+        recurse_tree = processingengine.recurse_tree
+        parent_pid = os.getpid()
+
+        def hung_recurse_tree(*args):
+            if os.getpid() != parent_pid:
+                time.sleep(60)
+            return recurse_tree(*args)
+
+        with mock.patch('ScoutSuite.core.processingengine.recurse_tree', hung_recurse_tree), \
+                mock.patch('ScoutSuite.core.processingengine.threading.active_count', return_value=1), \
+                mock.patch('ScoutSuite.core.processingengine.worker_timeout', 1):
+            started = time.monotonic()
+            assert self._run_rules(all_rules, test_config_file_name, 4) == single_process
+        assert time.monotonic() - started < 30
+
+    def test_rule_cache(self):
+        test_config_file_name = os.path.join(self.test_dir, 'data/rule-configs/ec2-security-group-opens-all-ports-to-all.json')
+        rule = {'enabled': True, 'level': 'danger'}
+        cache_file = os.path.join(tempfile.mkdtemp(), 'rule_cache.json')
+
+        def run_engine(update=None):
+            dummy_provider = DummyObject()
+            with open(test_config_file_name, 'rt') as f:
+                test_config_dict = json.load(f)
+                for key in test_config_dict:
+                    setattr(dummy_provider, key, test_config_dict[key])
+            if update:
+                update(dummy_provider.services)
+            dummy_provider.service_list = ['ec2']
+            ruleset = self._generate_ruleset('ec2-security-group-opens-all-ports-to-all.json', dict(rule))
+            ProcessingEngine(ruleset).run(dummy_provider, cache_file=cache_file)
+            return list(dummy_provider.services['ec2']['findings'].values())[0]
+
+        first = run_engine()
+        assert (os.path.isfile(cache_file))
+        with open(cache_file) as f:
+            cache = json.load(f)
+        assert (len(cache['rules']) == 1)
+
+        # Cached results are reused when neither the rule nor the data changed
+        with mock.patch('ScoutSuite.core.processingengine.recurse_tree') as recurse_tree:
+            assert (run_engine() == first)
+            recurse_tree.assert_called_once()
+            assert (recurse_tree.call_args[0][2].children == {})
+
+        # Rules are re-run when the data they read changed
+        def remove_rules(services):
+            for region in services['ec2']['regions'].values():
+                for vpc in region['vpcs'].values():
+                    for security_group in vpc['security_groups'].values():
+                        security_group['rules'] = {}
+        assert (run_engine(remove_rules)['items'] == [])
+
+    def test_recurse_matches_processing_engine(self):
+        with open(os.path.join(self.test_dir, '../ScoutSuite/providers/aws/rules/rulesets/default.json'), 'rt') as f:
+            ruleset = json.load(f)
+
+        for rule_file_name in ruleset['rules']:
+            test_config_file_name = os.path.join(self.test_dir, 'data/rule-configs/%s' % rule_file_name)
+            if not os.path.isfile(test_config_file_name):
+                continue
+            rule = ruleset['rules'][rule_file_name][0]
+            rule['enabled'] = True
+            service = rule_file_name.split('-')[0]
+            test_ruleset = self._generate_ruleset(rule_file_name, rule)
+
+            dummy_provider = DummyObject()
+            with open(test_config_file_name, 'rt') as f:
+                test_config_dict = json.load(f)
+                for key in test_config_dict:
+                    setattr(dummy_provider, key, test_config_dict[key])
+            dummy_provider.service_list = [service]
+            ProcessingEngine(test_ruleset).run(dummy_provider)
+            findings = dummy_provider.services[service]['findings']
+
+            for r in test_ruleset.rules[rule_file_name]:
+                current_path = []
+                r.checked_items = 0
+                items = recurse(dummy_provider.services, dummy_provider.services, r.path.split('.'), current_path, r,
+                                True)
+                assert (current_path == [])
+                assert (items == findings[r.key]['items']), rule_file_name
+                assert (r.checked_items == findings[r.key]['checked_items']), rule_file_name
+
     def _test_rule(self, ruleset_file_name, rule_file_name, rule):
         test_config_file_name = os.path.join(self.test_dir, 'data/rule-configs/%s' % rule_file_name)
         if not os.path.isfile(test_config_file_name):
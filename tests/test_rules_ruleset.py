@@ -1,4 +1,6 @@
 import os
+import shutil
+import tempfile
 
 from unittest import mock
 import unittest
@@ -105,3 +107,38 @@ class TestScoutRulesRuleset(unittest.TestCase):
 
     def test_search_ruleset(self):
         test201 = Ruleset(cloud_provider='aws').search_ruleset('test', no_prompt=True)
+
+    def test_ruleset_cache(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            ruleset_file = os.path.join(tmp_dir, 'ruleset.json')
+            shutil.copy(os.path.join(self.test_dir, '../ScoutSuite/providers/aws/rules/rulesets/default.json'),
+                        ruleset_file)
+            cache_file = os.path.join(tmp_dir, 'cache', 'ruleset_cache.json')
+            prepared = Ruleset(cloud_provider='aws', filename=ruleset_file, account_id='123456789012',
+                               cache_file=cache_file)
+            assert (os.path.isfile(cache_file))
+
+            # Warm starts restore the prepared rules without loading their definitions
+            with mock.patch.object(Ruleset, 'load') as load:
+                cached = Ruleset(cloud_provider='aws', filename=ruleset_file, account_id='123456789012',
+                                 cache_file=cache_file)
+                assert (load.call_count == 0)
+            assert (cached.about == prepared.about)
+            assert (list(cached.rules) == list(prepared.rules))
+            for filename in prepared.rules:
+                assert ([rule.to_dict() for rule in cached.rules[filename]] ==
+                        [rule.to_dict() for rule in prepared.rules[filename]])
+                for cached_rule, prepared_rule in zip(cached.rules[filename], prepared.rules[filename]):
+                    assert ((cached_rule.condition_evaluator is None) == (prepared_rule.condition_evaluator is None))
+
+            # Other parameters, rule types and modified files invalidate the cache
+            with mock.patch.object(Ruleset, 'load', side_effect=Ruleset.load, autospec=True) as load:
+                Ruleset(cloud_provider='aws', filename=ruleset_file, account_id='210987654321', cache_file=cache_file)
+                assert (load.call_count == 1)
+                Ruleset(cloud_provider='aws', filename='filters.json', rule_type='filters', cache_file=cache_file)
+                assert (load.call_count == 2)
+                Ruleset(cloud_provider='aws', filename='filters.json', rule_type='filters', cache_file=cache_file)
+                assert (load.call_count == 2)
+                os.utime(ruleset_file, (0, 0))
+                Ruleset(cloud_provider='aws', filename=ruleset_file, account_id='210987654321', cache_file=cache_file)
+                assert (load.call_count == 3)
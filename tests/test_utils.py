@@ -8,8 +8,13 @@ from ScoutSuite.providers.aws.utils import (
     get_partition_name,
     snake_keys,
 )
+from ScoutSuite.providers.utils import get_max_workers, get_rate_limiter, run_concurrently, \
+    run_function_concurrently, set_fetch_executor, shutdown_fetch_executor, RateLimitedFacade, RateLimiter
 from ScoutSuite.utils import *
+import asyncio
 import collections
+import threading
+import time
 import unittest
 from unittest import mock
 import datetime
@@ -83,6 +88,49 @@ class TestScoutUtilsClass(unittest.TestCase):
         ):
             assert get_partition_name("") == "b"
 
+    def test_get_caller_identity(self):
+        session = mock.MagicMock()
+        session.client.return_value.get_caller_identity.return_value = {"Arn": "arn:aws-cn:iam::123456789012:user/u"}
+        assert get_aws_account_id(session) == "123456789012"
+        assert get_partition_name(session) == "aws-cn"
+        assert session.client.return_value.get_caller_identity.call_count == 1
+
+    def test_region_catalog(self):
+        import os
+        import tempfile
+        from ScoutSuite.providers.aws import utils
+
+        with tempfile.TemporaryDirectory() as directory, \
+                mock.patch.object(utils, '_region_catalog', {'file': None, 'partition': None, 'services': None,
+                                                             'regions': {}, 'changed': False}), \
+                mock.patch.object(utils, '_catalog_sessions', threading.local()), \
+                mock.patch.object(utils, 'Session') as mock_session:
+            catalog_file = os.path.join(directory, 'catalog.json')
+            mock_session.return_value.get_available_services.return_value = ['ec2', 's3']
+            mock_session.return_value.get_available_regions.return_value = ['eu-west-1']
+
+            assert not utils.load_region_catalog(catalog_file, 'aws')
+            for _ in range(3):
+                assert utils.get_available_services() == ['ec2', 's3']
+                assert utils.get_available_regions('ec2', 'aws') == ['eu-west-1']
+            assert mock_session.call_count == 1
+            assert mock_session.return_value.get_available_regions.call_count == 1
+            # Other threads don't share the session, only the catalog
+            thread = threading.Thread(target=lambda: utils.get_available_regions('s3', 'aws'))
+            thread.start()
+            thread.join()
+            assert mock_session.call_count == 2
+            assert utils.get_available_regions('s3', 'aws') == ['eu-west-1']
+            assert mock_session.return_value.get_available_regions.call_count == 2
+            utils.save_region_catalog()
+
+            # A later run loads the catalog instead of looking it up
+            utils._region_catalog.update(services=None, regions={})
+            assert utils.load_region_catalog(catalog_file, 'aws')
+            assert utils.get_available_regions('ec2', 'aws') == ['eu-west-1']
+            assert mock_session.call_count == 2
+            assert not utils.load_region_catalog(catalog_file, 'aws-cn')
+
     def test_snake_case(self):
         src = {
             "AttributeDefinitions": [
@@ -131,3 +179,411 @@ class TestScoutUtilsClass(unittest.TestCase):
         d = snake_keys(src)
         self.maxDiff = None
         self.assertEqual(d, dest)
+
+    def test_fetch_executor(self):
+        async def fetch(count):
+            set_fetch_executor(2)
+            release = threading.Event()
+            tasks = [run_function_concurrently(release.wait) for _ in range(count)]
+            await asyncio.sleep(0.1)
+            release.set()
+            return await asyncio.gather(*tasks), asyncio.get_running_loop()._default_executor
+
+        results, executor = asyncio.run(fetch(5))
+        assert results == [True] * 5
+        assert get_max_workers() == 2
+        assert executor._max_workers == 2
+        assert executor.submitted == 5
+        # The calls beyond the pool's two threads waited in its queue
+        assert executor.queued == 3
+        assert 3 <= executor.max_queue_depth <= 5
+        assert executor.queue_depth == 0 and executor.running == 0
+
+    def test_shutdown_fetch_executor(self):
+        def fetch_threads():
+            return [thread for thread in threading.enumerate() if thread.name.startswith('scout-fetch')]
+
+        async def fetch():
+            set_fetch_executor(2)
+            await asyncio.gather(*[run_function_concurrently(lambda: time.sleep(0.01)) for _ in range(4)])
+            assert fetch_threads()
+            shutdown_fetch_executor()
+            # No thread is left running, and the next calls start new ones
+            assert not fetch_threads()
+            assert await run_function_concurrently(lambda: 'result') == 'result'
+
+        asyncio.run(fetch())
+
+    def test_rate_limiter(self):
+        limiter = RateLimiter(('aws', 'iam', None))
+
+        async def acquire(count):
+            for _ in range(count):
+                await limiter.acquire()
+
+        # Calls aren't limited until one is throttled
+        asyncio.run(acquire(1000))
+        for _ in range(1000):
+            limiter.on_success()
+        assert limiter.rate is None
+        # The rate then starts from half the rate the calls were made at
+        limiter.on_throttle()
+        assert 1000 * RateLimiter.decrease <= limiter.rate
+        limiter.on_throttle()
+        rate = limiter.rate
+        limiter.on_success()
+        assert limiter.rate == rate + RateLimiter.increase
+        for _ in range(100):
+            limiter.on_throttle()
+        assert limiter.rate == RateLimiter.min_rate
+        assert limiter.min_reached_rate == RateLimiter.min_rate
+
+    def test_rate_limiter_max_rate(self):
+        with mock.patch.object(RateLimiter, 'max_rate', 10):
+            limiter = RateLimiter(('aws', 'iam', None))
+            assert limiter.rate == 10
+            limiter.on_throttle()
+            assert limiter.rate == 10 * RateLimiter.decrease
+            for _ in range(100):
+                limiter.on_success()
+            assert limiter.rate == 10
+
+    def test_rate_limited_facade(self):
+        class TestFacade(RateLimitedFacade):
+            provider = 'test'
+            service = 'compute'
+
+        async def run():
+            facade = TestFacade()
+            await facade._run_concurrently(lambda: None, 'region-1')
+            await facade._run_concurrently(lambda: None, 'region-1', service='storage')
+
+        asyncio.run(run())
+        assert get_rate_limiter(('test', 'compute', 'region-1')).calls == 1
+        assert get_rate_limiter(('test', 'storage', 'region-1')).calls == 1
+
+    def test_run_concurrently_retries_throttled_calls(self):
+        calls = []
+
+        def throttled_once():
+            calls.append(1)
+            if len(calls) == 1:
+                raise Exception('An error occurred (Throttling) when calling the GetPolicyVersion operation')
+            return 'result'
+
+        def failing():
+            calls.append(1)
+            raise Exception('AccessDenied')
+
+        key = ('aws', 'iam', 'test')
+        with mock.patch('ScoutSuite.providers.utils.random.uniform', return_value=0):
+            assert asyncio.run(run_concurrently(throttled_once, rate_limit_key=key)) == 'result'
+            assert len(calls) == 2
+            limiter = get_rate_limiter(key)
+            assert (limiter.calls, limiter.throttled, limiter.retries) == (2, 1, 1)
+            # The throttled call was the only one made in the last second
+            assert limiter.rate == RateLimiter.min_rate + RateLimiter.increase
+
+            calls.clear()
+            with self.assertRaises(Exception):
+                asyncio.run(run_concurrently(failing, rate_limit_key=key))
+            assert len(calls) == 1
+
+    def test_aws_client_pool(self):
+        import boto3
+        from concurrent.futures import ThreadPoolExecutor
+        from ScoutSuite.providers.aws.facade.utils import AWSFacadeUtils
+
+        sessions = [boto3.session.Session(aws_access_key_id='a', aws_secret_access_key='b') for _ in range(2)]
+        with ThreadPoolExecutor(8) as executor:
+            clients = list(executor.map(lambda i: AWSFacadeUtils.get_client('s3', sessions[i % 2], 'us-east-1'),
+                                        range(64)))
+        assert len({id(client) for client in clients}) == 2
+        assert clients[0] is AWSFacadeUtils.get_client('s3', sessions[0], 'us-east-1')
+        assert clients[0].meta.config.max_pool_connections == get_max_workers()
+        creations = AWSFacadeUtils.get_client_creations()
+        for session in sessions:
+            assert creations[(session, 's3', 'us-east-1', get_max_workers())] == 1
+
+    def test_aws_client_lock_per_key(self):
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+        from ScoutSuite.providers.aws.facade.utils import AWSFacadeUtils
+
+        loading = threading.Event()
+        loaded = threading.Event()
+
+        class Session:
+            def client(self, service, region_name=None, config=None):
+                if service == 'ec2':
+                    loading.set()
+                    assert loaded.wait(5)
+                return object()
+
+        session = Session()
+        with ThreadPoolExecutor(2) as executor:
+            slow_client = executor.submit(AWSFacadeUtils.get_client, 'ec2', session, 'us-east-1')
+            assert loading.wait(5)
+            # Another client is instantiated while the service model of the first one is still loading
+            assert AWSFacadeUtils.get_client('iam', session) is not None
+            loaded.set()
+            assert slow_client.result() is AWSFacadeUtils.get_client('ec2', session, 'us-east-1')
+
+    def test_aws_async_backend_fallback(self):
+        from ScoutSuite.providers.aws.facade.async_backend import AsyncClients
+        from ScoutSuite.providers.aws.facade.utils import AWSFacadeUtils
+
+        AWSFacadeUtils.set_async_backend(True)
+        try:
+            assert (AWSFacadeUtils._async_clients is not None) == AsyncClients.is_available()
+        finally:
+            AWSFacadeUtils.set_async_backend(False)
+        assert AWSFacadeUtils._async_clients is None
+
+    def test_aws_get_pages(self):
+        import boto3
+        from botocore.stub import Stubber
+        from ScoutSuite.providers.aws.facade.utils import AWSFacadeUtils
+
+        client = boto3.client('iam', aws_access_key_id='a', aws_secret_access_key='b')
+        requests = []
+        client.meta.events.register('provide-client-params.iam.ListUsers',
+                                    lambda params, **kwargs: requests.append(params.get('Marker')))
+        stubber = Stubber(client)
+        for i in range(3):
+            stubber.add_response('list_users', {'Users': [self._get_user(f'user-{i}-{j}') for j in range(2)],
+                                                'IsTruncated': i < 2, 'Marker': f'marker-{i}'})
+
+        async def consume():
+            pages = []
+            async for page in AWSFacadeUtils.get_pages('iam', None, None, 'list_users', 'Users'):
+                # Pages are yielded as they are fetched, not once all of them are
+                assert len(requests) == len(pages) + 1
+                pages.append([user['UserName'] for user in page])
+            return pages
+
+        with stubber, mock.patch.object(AWSFacadeUtils, 'get_client', return_value=client):
+            pages = asyncio.run(consume())
+        assert pages == [[f'user-{i}-{j}' for j in range(2)] for i in range(3)]
+
+    def test_aws_get_pages_throttled(self):
+        import boto3
+        from botocore.stub import Stubber
+        from ScoutSuite.providers.aws.facade.utils import AWSFacadeUtils
+
+        client = boto3.client('iam', aws_access_key_id='a', aws_secret_access_key='b')
+        requests = []
+        client.meta.events.register('provide-client-params.iam.ListUsers',
+                                    lambda params, **kwargs: requests.append(params.get('Marker')))
+        stubber = Stubber(client)
+        for i in range(3):
+            stubber.add_response('list_users', {'Users': [self._get_user(f'user-{i}')],
+                                                'IsTruncated': i < 2, 'Marker': f'marker-{i}'})
+            if i == 1:
+                # The third page is throttled once
+                stubber.add_client_error('list_users', 'Throttling', 'Rate exceeded')
+
+        async def get_users():
+            return await AWSFacadeUtils.get_all_pages('iam', None, None, 'list_users', 'Users')
+
+        with stubber, mock.patch.object(AWSFacadeUtils, 'get_client', return_value=client), \
+                mock.patch('ScoutSuite.providers.utils.random.uniform', return_value=0):
+            users = asyncio.run(get_users())
+        # The listing resumes from the page that was throttled
+        assert [user['UserName'] for user in users] == ['user-0', 'user-1', 'user-2']
+        assert requests == [None, 'marker-0', 'marker-1', 'marker-1']
+
+    def test_aws_async_backend_throttled_pages(self):
+        import boto3
+        from ScoutSuite.providers.aws.facade.async_backend import AsyncClients
+        if not AsyncClients.is_available():
+            self.skipTest('aiobotocore is not installed')
+        from aiobotocore.stub import AioStubber
+
+        session = boto3.session.Session(aws_access_key_id='a', aws_secret_access_key='b', region_name='us-east-1')
+        async_clients = AsyncClients()
+
+        async def get_users():
+            client = await async_clients.get_client('iam', session)
+            # The clients resolve the session's credentials
+            assert (await client._request_signer._credentials.get_frozen_credentials()).access_key == 'a'
+            requests = []
+            client.meta.events.register('provide-client-params.iam.ListUsers',
+                                        lambda params, **kwargs: requests.append(params.get('Marker')))
+            stubber = AioStubber(client)
+            for i in range(3):
+                stubber.add_response('list_users', {'Users': [self._get_user(f'user-{i}')],
+                                                    'IsTruncated': i < 2, 'Marker': f'marker-{i}'})
+                if i == 1:
+                    stubber.add_client_error('list_users', 'Throttling', 'Rate exceeded')
+            with stubber:
+                users = await async_clients.get_multiple_entities_from_all_pages(
+                    'iam', None, session, 'list_users', ['Users'])
+            await async_clients.close()
+            return users['Users'], requests
+
+        with mock.patch('ScoutSuite.providers.utils.random.uniform', return_value=0):
+            users, requests = asyncio.run(get_users())
+        # The pagination resumes from the page that was throttled, as with the thread backend
+        assert [user['UserName'] for user in users] == ['user-0', 'user-1', 'user-2']
+        assert requests == [None, 'marker-0', 'marker-1', 'marker-1']
+
+    def test_aws_async_backend_credentials_refresh(self):
+        from botocore.credentials import RefreshableCredentials
+        from ScoutSuite.providers.aws.facade.async_backend import SessionCredentials
+
+        refreshes = []
+
+        def refresh():
+            refreshes.append(1)
+            # Temporary credentials expiring within botocore's refresh window
+            expiry = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(minutes=1)
+            return {'access_key': f'key-{len(refreshes)}', 'secret_key': 'secret', 'token': 'token',
+                    'expiry_time': expiry.isoformat()}
+
+        credentials = SessionCredentials(RefreshableCredentials.create_from_metadata(refresh(), refresh, 'sts'))
+
+        async def get_access_keys():
+            set_fetch_executor(2)
+            return [(await credentials.get_frozen_credentials()).access_key for _ in range(2)]
+
+        # The credentials are refreshed as they expire instead of being frozen once for the whole run
+        assert asyncio.run(get_access_keys()) == ['key-2', 'key-3']
+
+    @staticmethod
+    def _get_user(name):
+        return {'Path': '/', 'UserName': name, 'UserId': f'{name}-id-0000000', 'Arn': f'arn:aws:iam::1:user/{name}',
+                'CreateDate': datetime.datetime(2020, 1, 1)}
+
+    def test_run_cached(self):
+        from ScoutSuite.providers.utils import _response_cache, clear_response_cache, get_response_cache_key, \
+            run_cached
+
+        calls = []
+
+        async def get_role(name):
+            calls.append(name)
+            await asyncio.sleep(0.01)
+            if name == 'missing':
+                raise Exception('NoSuchEntity')
+            return {'Role': {'RoleName': name}}
+
+        async def fetch():
+            names = ['a', 'b', 'a', 'a']
+            responses = await asyncio.gather(*[
+                run_cached(get_response_cache_key('aws', 'iam', 'get_role', {'RoleName': name}),
+                           lambda name=name: get_role(name))
+                for name in names])
+            # Callers get their own copy
+            responses[0]['Role']['policies'] = []
+            responses.append(await run_cached(get_response_cache_key('aws', 'iam', 'get_role', {'RoleName': 'a'}),
+                                              lambda: get_role('a')))
+            missing_key = get_response_cache_key('aws', 'iam', 'get_role', {'RoleName': 'missing'})
+            for _ in range(2):
+                with self.assertRaises(Exception):
+                    await run_cached(missing_key, lambda: get_role('missing'))
+            return responses
+
+        clear_response_cache()
+        responses = asyncio.run(fetch())
+        assert calls == ['a', 'b', 'missing', 'missing']
+        assert responses[4] == {'Role': {'RoleName': 'a'}}
+        assert responses[2] == responses[4]
+        assert _response_cache['stats'][('aws', 'iam', 'get_role')] == {'hits': 3, 'misses': 4}
+        clear_response_cache()
+
+    def test_gcp_batch_requests(self):
+        from ScoutSuite.providers.gcp.facade.utils import GCPFacadeUtils
+
+        batches = []
+        executed = []
+
+        class Request:
+            methodId = 'compute.zones.get'
+
+            def __init__(self, zone):
+                self.zone = zone
+
+            def execute(self):
+                executed.append(self.zone)
+                return {'name': self.zone}
+
+        class BatchRequest:
+            def __init__(self, callback):
+                self.callback = callback
+                self.requests = []
+
+            def add(self, request, request_id):
+                self.requests.append((request_id, request))
+
+            def execute(self):
+                batches.append([request.zone for _, request in self.requests])
+                for request_id, request in self.requests:
+                    if request.zone == 'throttled':
+                        self.callback(request_id, None, Exception('RATE_LIMIT_EXCEEDED'))
+                    elif request.zone == 'missing':
+                        self.callback(request_id, None, Exception('Not found'))
+                    else:
+                        self.callback(request_id, {'name': request.zone}, None)
+
+        class Client:
+            def new_batch_http_request(self, callback):
+                return BatchRequest(callback)
+
+        async def fetch(zones, client):
+            set_fetch_executor(10)
+            return await asyncio.gather(*[GCPFacadeUtils.execute(Request(zone), client) for zone in zones],
+                                        return_exceptions=True)
+
+        zones = [f'zone-{i}' for i in range(150)] + ['throttled', 'missing']
+        GCPFacadeUtils.set_batch_mode(True)
+        try:
+            responses = asyncio.run(fetch(zones, Client()))
+        finally:
+            GCPFacadeUtils.set_batch_mode(False)
+        assert [len(batch) for batch in batches] == [100, 52]
+        assert responses[:150] == [{'name': zone} for zone in zones[:150]]
+        # Throttled requests are retried one by one, the other errors are raised
+        assert executed == ['throttled']
+        assert responses[150] == {'name': 'throttled'}
+        assert str(responses[151]) == 'Not found'
+
+        # Requests are sent one by one without batch mode or without their client
+        batches.clear()
+        executed.clear()
+        asyncio.run(fetch(['zone-0', 'zone-1'], Client()))
+        GCPFacadeUtils.set_batch_mode(True)
+        try:
+            asyncio.run(fetch(['zone-2'], None))
+        finally:
+            GCPFacadeUtils.set_batch_mode(False)
+        assert batches == [] and sorted(executed) == ['zone-0', 'zone-1', 'zone-2']
+
+    def test_loop_blocking_detector(self):
+        from ScoutSuite.providers.utils import _loop_blocking_detector, start_loop_blocking_detector, \
+            stop_loop_blocking_detector
+
+        def blocking_call():
+            time.sleep(0.3)
+
+        async def fetch():
+            start_loop_blocking_detector(50)
+            detector = _loop_blocking_detector['detector']
+            try:
+                await asyncio.sleep(0.1)
+                blocking_call()
+                await run_concurrently(blocking_call)
+                await asyncio.sleep(0.1)
+            finally:
+                stop_loop_blocking_detector()
+            return detector
+
+        with mock.patch('ScoutSuite.providers.utils.print_warning') as print_warning:
+            detector = asyncio.run(fetch())
+        # Only the call made on the event loop is reported, at the coroutine making it
+        assert len(detector.stalls) == 1
+        location, stalls = detector.stalls.popitem()
+        assert 'test_utils.py' in location and '(blocking_call)' in location
+        assert stalls['count'] == 1 and stalls['longest'] >= 0.2
+        print_warning.assert_called_once()
+        assert _loop_blocking_detector['detector'] is None
@@ -1,9 +1,13 @@
 # -*- coding: utf-8 -*-
+import copy
 import os
 import unittest
+from unittest import mock
 
 
 from ScoutSuite.core.conditions import *
+from ScoutSuite.core.conditions import _expand_statement_actions, _get_statement_actions, _get_wildcard_actions, \
+    _parse_date
 
 class TestOpinelConditionClass(unittest.TestCase):
     """
@@ -13,6 +17,110 @@ class TestOpinelConditionClass(unittest.TestCase):
     def test___prepare_age_test(self):
         pass
 
+    def test_compile_conditions(self):
+        all_info = {'iam': {'users': {'alice': {'name': 'alice', 'keys': [], 'mfa': 'true'},
+                                      'bob': {'name': 'bob', 'keys': ['AKIA1'], 'mfa': 'false'}}}}
+        conditions = ['or',
+                      ['iam.users.id.keys', 'notEmpty', ''],
+                      ['and',
+                       ['iam.users.id.mfa', 'false', ''],
+                       ['iam.users.id.name', 'equal', 'alice']]]
+        evaluator = compile_conditions(conditions)
+        for user in ['alice', 'bob']:
+            current_path = ['iam', 'users', user]
+            assert evaluator(all_info, current_path) == pass_conditions(all_info, current_path, copy.deepcopy(conditions))
+        assert evaluator(all_info, ['iam', 'users', 'alice']) == False
+        assert evaluator(all_info, ['iam', 'users', 'bob']) == True
+        assert compile_conditions([])(all_info, []) == True
+
+        # Values read with _GET_VALUE_AT_ are resolved for each item
+        evaluator = compile_conditions(['and', ['iam.users.id.name', 'equal', '_GET_VALUE_AT_(iam.users.id.name)']])
+        assert evaluator(all_info, ['iam', 'users', 'bob']) == True
+
+        # Unknown test cases are reported and fail, as with pass_conditions
+        evaluator = compile_conditions(['and', ['iam.users.id.name', 'unknownTest', '']])
+        assert evaluator(all_info, ['iam', 'users', 'bob']) == False
+        evaluator = compile_conditions(['and', ['iam.users.id.name', 'unknownTest', '']], True)
+        assert evaluator(all_info, ['iam', 'users', 'bob']) == True
+
+    def test_compiled_regex_tests(self):
+        all_info = {'s3': {'buckets': {'b1': {'Principal': ['123456789012', {'AWS': 'arn:aws:iam::123456789013:root'}],
+                                              'Name': 'logs-bucket',
+                                              'Actions': ['s3:GetObject', 's3:*']}}}}
+        current_path = ['s3', 'buckets', 'b1']
+        for condition in [['s3.buckets.id.Principal', 'isCrossAccount', '123456789012'],
+                          ['s3.buckets.id.Principal', 'isCrossAccount', '123456789013'],
+                          ['s3.buckets.id.Principal', 'isAccountRoot', '123456789013'],
+                          ['s3.buckets.id.Principal', 'isAccountRoot', '123456789012'],
+                          ['s3.buckets.id.Name', 'match', ['.*-bucket', 'xyz']],
+                          ['s3.buckets.id.Name', 'notMatch', 'logs-.*'],
+                          ['s3.buckets.id.Actions', 'matchInList', ['s3:Put.*', 's3:Get.*']],
+                          ['s3.buckets.id.Actions', 'containAtLeastOneMatching', '.*[*].*'],
+                          # Invalid regular expressions fail at evaluation time, as when interpreted
+                          ['s3.buckets.id.Name', 'match', '(']]:
+            conditions = ['and', condition]
+            assert (compile_conditions(conditions)(all_info, current_path) ==
+                    pass_conditions(all_info, current_path, copy.deepcopy(conditions))), condition
+
+    def test_subnets_index(self):
+        known_subnets = ['10.0.0.0/8', '10.1.0.0/16', '192.168.0.0/24', '192.168.2.0/23', '172.16.5.4/32',
+                         '2600:1f00::/24', '2600:1f14:abc::/48']
+        grants = ['10.2.3.0/24', '10.0.0.0/7', '9.255.255.255', '11.0.0.0/32', '192.168.1.0/24', '192.168.2.128/25',
+                  '192.168.3.255', '192.168.0.0/22', '172.16.5.4', '172.16.5.4/31', '0.0.0.0/0',
+                  '2600:1f14:abc:1::/64', '2600:1e00::/24', '::/0']
+        in_subnets = condition_test_compilers['inSubnets'](known_subnets)
+        not_in_subnets = condition_test_compilers['notInSubnets'](known_subnets)
+        for grant in grants:
+            expected = any(netaddr.IPNetwork(grant) in netaddr.IPNetwork(c) for c in known_subnets)
+            assert in_subnets(grant) == expected, grant
+            assert not_in_subnets(grant) == (not expected), grant
+            assert pass_condition(grant, 'inSubnets', known_subnets) == expected, grant
+        # A single subnet may be given as a string
+        assert condition_test_compilers['inSubnets']('10.0.0.0/8')('10.2.3.4') == True
+        # No subnet of the grant's IP version
+        assert condition_test_compilers['inSubnets'](['10.0.0.0/8'])('2600:1f14::/32') == False
+        # Invalid subnets are reported once, the valid ones still being tested
+        with mock.patch('ScoutSuite.core.conditions.print_exception') as print_exception:
+            in_subnets = condition_test_compilers['inSubnets'](['10.0.0.0/8', 'invalid', '192.168.0.0/24'])
+            assert in_subnets('10.2.3.4') == True
+            assert in_subnets('192.168.0.1') == True
+            assert in_subnets('172.16.0.1') == False
+            assert pass_condition('192.168.0.1', 'inSubnets', ['10.0.0.0/8', 'invalid', '192.168.0.0/24']) == True
+        assert print_exception.call_count == 1
+
+    def test_action_caches(self):
+        clear_action_caches()
+        statements = [{'Effect': 'Allow', 'Action': ['iam:Get*', 'S3:GetObject'], 'Resource': '*'},
+                      {'Effect': 'Allow', 'Action': ['iam:Get*', 'S3:GetObject'], 'Resource': 'arn:aws:s3:::b/*'},
+                      {'Effect': 'Allow', 'NotAction': 'iam:*', 'Resource': '*'}]
+        for statement in statements:
+            assert _get_statement_actions(statement) == set(get_actions_from_statement(statement))
+            assert _get_statement_actions(json.dumps(statement)) == _get_statement_actions(statement)
+        # Statements differing only by their other attributes share an expansion
+        assert _expand_statement_actions.cache_info().misses == 2
+        for action in ['iam:GetUser', 'iam:createuser', 's3:getobject', 'ec2:*']:
+            expected = [pass_condition(statement, test, action) for statement in statements
+                        for test in ['containAction', 'notContainAction', 'containAtLeastOneAction']]
+            clear_action_caches()
+            assert expected == [condition_test_compilers[test](action)(statement) for statement in statements
+                                for test in ['containAction', 'notContainAction', 'containAtLeastOneAction']]
+        assert _get_wildcard_actions.cache_info().hits > 0
+
+    def test_parse_date(self):
+        for value in ['2016-04-11 12:20:26.996000+00:00', '2016-04-11T12:20:26Z', '2016-04-11T12:20:26.1+05:30',
+                      '2016-04-11', '2016-04-11T12:20', '2016-04-11T12:20:26.123456789Z', 'Apr 11 2016 12:20:26',
+                      '2016-04-11T12:20:26+0000', str(datetime.datetime(2016, 4, 11, 12, 20, 26, 1))]:
+            assert _parse_date(value) == dateutil.parser.parse(value).replace(tzinfo=None), value
+
+    def test_run_clock(self):
+        try:
+            set_run_clock(datetime.datetime(2020, 1, 31))
+            assert pass_condition('2020-01-01T00:00:00Z', 'olderThan', [29, 'days']) == True
+            assert pass_condition('2020-01-01T00:00:00Z', 'olderThan', [30, 'days']) == False
+            assert pass_condition('2020-01-01T00:00:00Z', 'newerThan', [31, 'days']) == True
+        finally:
+            set_run_clock()
+
     def test_pass_condition(self):
 
         assert pass_condition('a', 'equal', 'a') == True
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import boto3
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), '..'))
+
+from ScoutSuite.providers.aws.facade.utils import AWSFacadeUtils  # noqa: E402
+from ScoutSuite.providers.utils import set_fetch_executor  # noqa: E402
+
+REGIONS = ['us-east-1', 'us-west-2', 'eu-west-1', 'eu-central-1', 'ap-southeast-2']
+
+
+def start_server(port):
+    from moto.server import ThreadedMotoServer
+    server = ThreadedMotoServer(port=port, verbose=False)
+    server.start()
+    os.environ['AWS_ENDPOINT_URL'] = f'http://127.0.0.1:{port}'
+    return server
+
+
+def get_session():
+    return boto3.session.Session(aws_access_key_id='testing', aws_secret_access_key='testing',
+                                 region_name='us-east-1')
+
+
+def populate(session, count):
+    """
+    Create `count` IAM users and `count` security groups in each region
+    """
+    iam = session.client('iam')
+    for i in range(count):
+        iam.create_user(UserName=f'user-{i}')
+    for region in REGIONS:
+        ec2 = session.client('ec2', region_name=region)
+        for i in range(count):
+            ec2.create_security_group(GroupName=f'sg-{i}', Description='benchmark')
+
+
+async def fetch(session, repeat, max_workers):
+    set_fetch_executor(max_workers)
+    tasks = []
+    for _ in range(repeat):
+        tasks.append(AWSFacadeUtils.get_all_pages('iam', None, session, 'list_users', 'Users', MaxItems=20))
+        for region in REGIONS:
+            tasks.append(AWSFacadeUtils.get_all_pages('ec2', region, session, 'describe_security_groups',
+                                                      'SecurityGroups', MaxResults=20))
+    try:
+        return await asyncio.gather(*tasks)
+    finally:
+        await AWSFacadeUtils.close_async_clients()
+
+
+def run_benchmark(session, backend, repeat, max_workers):
+    AWSFacadeUtils.set_async_backend(backend == 'asyncio')
+    start = time.perf_counter()
+    results = asyncio.run(fetch(session, repeat, max_workers))
+    elapsed = time.perf_counter() - start
+    items = sum(len(result) for result in results)
+    print(f'{backend:<10} {len(results):>10} {items:>10} {elapsed:>12.3f}')
+    return [len(result) for result in results]
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description='Benchmark of the thread and asyncio backends of the AWS paginated '
+                                                 'calls, against a local moto server.')
+    parser.add_argument('-n', '--count',
+                        type=int,
+                        default=200,
+                        help='Number of IAM users and of security groups per region (default is 200)')
+    parser.add_argument('-r', '--repeat',
+                        type=int,
+                        default=10,
+                        help='Number of times each paginated call is made (default is 10)')
+    parser.add_argument('-w', '--max-workers',
+                        type=int,
+                        default=10,
+                        help='Number of threads of the thread backend (default is 10)')
+    parser.add_argument('-p', '--port',
+                        type=int,
+                        default=5123,
+                        help='Port of the moto server (default is 5123)')
+
+    args = parser.parse_args()
+
+    server = start_server(args.port)
+    try:
+        session = get_session()
+        populate(session, args.count)
+        print(f'{"backend":<10} {"calls":>10} {"items":>10} {"elapsed (s)":>12}')
+        threads = run_benchmark(session, 'threads', args.repeat, args.max_workers)
+        native = run_benchmark(session, 'asyncio', args.repeat, args.max_workers)
+        if threads != native:
+            raise Exception('The thread and asyncio backends fetched different items')
+    finally:
+        server.stop()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+
+import argparse
+import copy
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), '..'))
+
+from ScoutSuite.core.conditions import compile_conditions, pass_conditions  # noqa: E402
+from ScoutSuite.core.fs import read_ip_ranges  # noqa: E402
+
+ACCOUNT_ID = '123456789012'
+
+
+def get_random_account_id(rng):
+    return ACCOUNT_ID if rng.random() < 0.5 else str(rng.randint(100000000000, 999999999999))
+
+
+def get_random_principal_arn(rng):
+    account_id = get_random_account_id(rng)
+    choice = rng.randint(0, 3)
+    if choice == 0:
+        return account_id
+    elif choice == 1:
+        return f'arn:aws:iam::{account_id}:root'
+    elif choice == 2:
+        return f'arn:aws:iam::{account_id}:role/role-{rng.randint(0, 1000)}'
+    else:
+        return f'arn:aws:iam::{account_id}:user/user-{rng.randint(0, 1000)}'
+
+
+def get_policy_corpus(count, seed):
+    """
+    Generate a synthetic services dictionary with `count` policy statements
+    """
+    rng = random.Random(seed)
+    statements = {}
+    for i in range(count):
+        principal_arns = [get_random_principal_arn(rng) for _ in range(rng.randint(1, 3))]
+        statements[str(i)] = {
+            'Effect': rng.choice(['Allow', 'Deny']),
+            'Principal': [{'AWS': arn} for arn in principal_arns],
+            'PrincipalArns': principal_arns,
+            'Action': [rng.choice(['s3:GetObject', 's3:*', 'iam:PassRole', 'kms:Decrypt', '*'])
+                       for _ in range(rng.randint(1, 4))],
+            'Resource': rng.choice(['*', f'arn:aws:s3:::bucket-{i}/*', f'arn:aws:kms:us-east-1:{ACCOUNT_ID}:key/{i}'])
+        }
+    return {'iam': {'statements': statements}}
+
+
+def get_cidr_corpus(count, seed):
+    """
+    Generate a synthetic services dictionary with `count` security group CIDR grants
+    """
+    rng = random.Random(seed)
+    cidrs = {}
+    for i in range(count):
+        choice = rng.randint(0, 3)
+        if choice == 0:
+            cidr = '0.0.0.0/0'
+        elif choice == 1:
+            cidr = f'{rng.randint(1, 223)}.{rng.randint(0, 255)}.{rng.randint(0, 255)}.0/{rng.randint(16, 28)}'
+        elif choice == 2:
+            cidr = f'{rng.randint(1, 223)}.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(0, 255)}/32'
+        else:
+            cidr = f'2600:1f{rng.randint(10, 99)}:{rng.randint(0, 65535):x}::/{rng.choice([48, 56, 64, 128])}'
+        cidrs[str(i)] = {'CIDR': cidr}
+    return {'ec2': {'cidrs': cidrs}}
+
+
+def get_aws_prefixes():
+    return read_ip_ranges('aws/ip-ranges/aws.json', local_file=False, ip_only=True)
+
+
+def get_benchmarks():
+    """
+    Benchmarks, as (name, corpus generator, path, conditions)
+    """
+    return [
+        ('isCrossAccount', get_policy_corpus, 'iam.statements.id',
+         ['and', ['iam.statements.id.Principal', 'isCrossAccount', ACCOUNT_ID]]),
+        ('isSameAccount', get_policy_corpus, 'iam.statements.id',
+         ['and', ['iam.statements.id.PrincipalArns', 'isSameAccount', ACCOUNT_ID]]),
+        ('isAccountRoot', get_policy_corpus, 'iam.statements.id',
+         ['and', ['iam.statements.id.Principal', 'isAccountRoot', ACCOUNT_ID]]),
+        ('match', get_policy_corpus, 'iam.statements.id',
+         ['and', ['iam.statements.id.Resource', 'match', ['arn:aws:s3:::.*', 'arn:aws:kms:.*:key/1.*']]]),
+        ('containAtLeastOneMatching', get_policy_corpus, 'iam.statements.id',
+         ['and', ['iam.statements.id.Action', 'containAtLeastOneMatching', '.*[*].*']]),
+        ('containAction', get_policy_corpus, 'iam.statements.id',
+         ['and', ['iam.statements.id.', 'containAction', 'iam:PassRole']]),
+        ('containAtLeastOneAction', get_policy_corpus, 'iam.statements.id',
+         ['and', ['iam.statements.id.', 'containAtLeastOneAction', ['s3:GetObject', 'kms:Decrypt']]]),
+        ('inSubnets', get_cidr_corpus, 'ec2.cidrs.id',
+         ['and', ['ec2.cidrs.id.CIDR', 'inSubnets', get_aws_prefixes()]]),
+        ('notInSubnets', get_cidr_corpus, 'ec2.cidrs.id',
+         ['and', ['ec2.cidrs.id.CIDR', 'notInSubnets', get_aws_prefixes()]]),
+    ]
+
+
+def get_items(all_info, path):
+    service, resource_type, _ = path.split('.')
+    return [[service, resource_type, key] for key in all_info[service][resource_type]]
+
+
+def run_benchmark(name, corpus, path, conditions, repeat):
+    items = get_items(corpus, path)
+
+    def interpreted():
+        return [pass_conditions(corpus, current_path, copy.deepcopy(conditions)) for current_path in items]
+
+    evaluator = compile_conditions(conditions)
+
+    def compiled():
+        return [evaluator(corpus, current_path) for current_path in items]
+
+    if interpreted() != compiled():
+        raise Exception(f'Compiled and interpreted results differ for {name}')
+    interpreted_time = min(timeit.repeat(interpreted, number=1, repeat=repeat))
+    compiled_time = min(timeit.repeat(compiled, number=1, repeat=repeat))
+    print(f'{name:<30} {len(items):>8} {interpreted_time:>14.3f} {compiled_time:>12.3f} '
+          f'{interpreted_time / compiled_time:>8.1f}x')
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description='Micro-benchmark of the rule engine\'s condition tests.')
+    parser.add_argument('-n', '--count',
+                        type=int,
+                        default=50000,
+                        help='Number of items in the synthetic corpus (default is 50000)')
+    parser.add_argument('-r', '--repeat',
+                        type=int,
+                        default=3,
+                        help='Number of runs, the best one is reported (default is 3)')
+    parser.add_argument('-s', '--seed',
+                        type=int,
+                        default=0,
+                        help='Seed of the synthetic corpus')
+    parser.add_argument('-t', '--test',
+                        default=None,
+                        nargs='+',
+                        help='Name of the benchmarks to run, defaults to all')
+
+    args = parser.parse_args()
+
+    corpora = {}
+    print(f'{"test":<30} {"items":>8} {"interpreted (s)":>14} {"compiled (s)":>12} {"speedup":>9}')
+    for name, corpus_generator, path, conditions in get_benchmarks():
+        if args.test and name not in args.test:
+            continue
+        if corpus_generator not in corpora:
+            corpora[corpus_generator] = corpus_generator(args.count, args.seed)
+        run_benchmark(name, corpora[corpus_generator], path, conditions, args.repeat)